@@ -0,0 +1,59 @@
+"""portfolio_items (user_id, symbol) unique index
+
+Revision ID: 002_portfolio_user_symbol
+Revises: 001_google_oauth
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '002_portfolio_user_symbol'
+down_revision = '001_google_oauth'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Merge duplicate holdings into the oldest row (summed quantity, weighted average price)
+    op.execute("""
+        UPDATE portfolio_items AS p
+        SET quantity = m.quantity,
+            average_price = m.average_price
+        FROM (
+            SELECT user_id,
+                   upper(trim(symbol)) AS symbol,
+                   min(id) AS keep_id,
+                   sum(quantity) AS quantity,
+                   CASE WHEN sum(quantity) > 0
+                        THEN sum(quantity * average_price) / sum(quantity)
+                        ELSE max(average_price)
+                   END AS average_price
+            FROM portfolio_items
+            GROUP BY user_id, upper(trim(symbol))
+            HAVING count(*) > 1
+        ) AS m
+        WHERE p.id = m.keep_id
+    """)
+    op.execute("""
+        DELETE FROM portfolio_items AS p
+        USING portfolio_items AS k
+        WHERE p.user_id = k.user_id
+          AND upper(trim(p.symbol)) = upper(trim(k.symbol))
+          AND p.id > k.id
+    """)
+    
+    # Normalize symbols the same way the API does
+    op.execute("""
+        UPDATE portfolio_items
+        SET symbol = upper(trim(symbol))
+        WHERE symbol <> upper(trim(symbol))
+    """)
+    
+    op.create_index('uq_portfolio_items_user_symbol', 'portfolio_items', ['user_id', 'symbol'], unique=True)
+
+
+def downgrade() -> None:
+    # Merged duplicate rows are not restored
+    op.drop_index('uq_portfolio_items_user_symbol', table_name='portfolio_items')
@@ -1,6 +1,6 @@
 """
 API Routes
 """
-from app.api import auth, portfolio, company, dividend, economic, news, speech, subscription
+from app.api import auth, portfolio, company, dividend, economic, news, speech, subscription, screener
 
-__all__ = ["auth", "portfolio", "company", "dividend", "economic", "news", "speech", "subscription"]
+__all__ = ["auth", "portfolio", "company", "dividend", "economic", "news", "speech", "subscription", "screener"]
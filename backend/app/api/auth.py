@@ -3,19 +3,30 @@ Authentication API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Optional
-from app.core.database import get_db, SessionLocal
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
+from app.core.database import get_async_db, AsyncSessionLocal
+from app.core.security import create_access_token, decode_access_token, password_hasher, PasswordHasherBusy
 from app.core.config import settings
 from pydantic import BaseModel, EmailStr
 from app.models.user import User, SubscriptionTier
 from app.api.deps import oauth2_scheme, get_current_user, get_current_user_optional
+from app.core.principal import Principal, principal_cache
 
 router = APIRouter()
 
 
+def _hasher_busy() -> HTTPException:
+    """비밀번호 해싱 대기열이 가득 찼을 때의 응답"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "1"},
+    )
+
+
 class UserCreate(BaseModel):
     """User creation schema"""
     email: EmailStr
@@ -41,15 +52,15 @@ class Token(BaseModel):
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
-    if SessionLocal is None:
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
         )
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,7 +68,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -65,8 +79,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         subscription_tier=SubscriptionTier.FREE
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
@@ -74,17 +88,24 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login user and get access token"""
-    if SessionLocal is None:
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
         )
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다.",
@@ -97,6 +118,14 @@ async def login(
             detail="비활성화된 계정입니다."
         )
 
+    # BCRYPT_ROUNDS가 바뀐 뒤 첫 로그인이면 새 작업 비용으로 다시 저장
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+
+    # 로그인 시점의 계정/구독 상태로 다시 읽도록 캐시된 주체 삭제
+    await principal_cache.invalidate_user(user.id)
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.id},
@@ -107,7 +136,7 @@ async def login(
 
 
 @router.get("/me")
-async def get_current_user_info(current_user: User = Depends(get_current_user_optional)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user_optional)):
     """Get current user information"""
     if not current_user:
         return None
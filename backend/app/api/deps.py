@@ -1,30 +1,32 @@
 """
 Common dependencies for API endpoints
 """
-from fastapi import Depends, HTTPException, status
+import secrets
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-import jwt
 from typing import Optional
 
-from app.core.database import get_db, SessionLocal
 from app.core.config import settings
-from app.core.security import decode_access_token
-from app.models.user import User
+from app.core.database import AsyncSessionLocal
+from app.core.principal import Principal, principal_cache
+from app.core.security import verify_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user using Supabase JWT or local JWT"""
-    if SessionLocal is None:
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Get current authenticated user using Supabase JWT or local JWT
+
+    토큰 검증 결과와 주체(사용자/등급/권한)는 캐시되므로 캐시 적중 시 DB를 조회하지 않는다.
+    """
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스가 초기화되지 않았습니다."
         )
-    
+
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,65 +34,57 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    payload = verify_access_token(token)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
     try:
-        # JWT decoding
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-            audience="authenticated"
-        )
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-            
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found in database")
-            
-        return user
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.InvalidTokenError:
-        # Fallback to local decoder if direct decode fails (might be using different audience/secret)
-        payload = decode_access_token(token)
-        if payload:
-            user_id = payload.get("sub")
-            if user_id:
-                user = db.query(User).filter(User.id == user_id).first()
-                if user:
-                    return user
-        raise HTTPException(status_code=401, detail="Invalid token")
+        principal = await principal_cache.get(payload)
     except Exception as e:
         print(f"[Auth Error] {e}")
         raise HTTPException(status_code=401, detail="Could not validate credentials")
+    if principal is None:
+        raise HTTPException(status_code=401, detail="User not found in database")
+    return principal
 
-async def get_current_user_optional(
+async def get_current_user_stream(
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    access_token: Optional[str] = Query(None, description="EventSource용 액세스 토큰")
+) -> Principal:
+    """
+    SSE 엔드포인트용 인증 (브라우저 EventSource는 헤더를 붙일 수 없어 쿼리 토큰도 허용)
+    """
+    return await get_current_user(token or access_token)
+
+async def get_current_user_optional(
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> Optional[Principal]:
     """Get current user if authenticated, otherwise return None"""
-    if SessionLocal is None or not token:
+    if AsyncSessionLocal is None or not token:
         return None
 
     try:
-        payload = decode_access_token(token)
+        payload = verify_access_token(token)
         if payload is None:
             return None
-
-        user_id = payload.get("sub")
-        if user_id is None:
-            return None
-
-        # Convert to int for integer-based user IDs
-        try:
-            user_id = int(user_id)
-        except (ValueError, TypeError):
-            return None
-
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
+        return await principal_cache.get(payload)
     except Exception as e:
         print(f"[Optional Auth Error] {e}")
         return None
+
+async def require_metrics_token(request: Request) -> None:
+    """
+    내부 지표(/metrics) 접근 확인
+
+    METRICS_TOKEN이 없으면 엔드포인트가 없는 것처럼 404, 토큰이 틀리면 401.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    authorization = request.headers.get("authorization", "")
+    token = authorization[7:] if authorization[:7].lower() == "bearer " else ""
+    if not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
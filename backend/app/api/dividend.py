@@ -1,11 +1,17 @@
 """
 배당 분석 API
 """
-import yfinance as yf
+import time
 from fastapi import APIRouter, HTTPException
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from datetime import datetime, timedelta
+from datetime import datetime
+from app.core.cache import app_cache
+from app.core.config import settings
+from app.core.singleflight import singleflight
+from app.services.analysis.dividend_history import next_ex_dividend, summarize_dividends
+from app.services.data.market_data_gateway import market_data_gateway
+from app.services.data.quote_poller import quote_poller
 
 router = APIRouter()
 
@@ -24,6 +30,18 @@ class DividendResponse(BaseModel):
     dividends: List[DividendData]
     five_year_growth_rate: Optional[float] = None
     currency: Optional[str] = None  # 통화 정보 (KRW, USD 등)
+    trailing_12m_dividend: Optional[float] = None  # 최근 12개월 주당 배당 합계
+    dividend_cagr: Optional[float] = None  # 12개월 배당 합계의 연평균 성장률 (%, 최대 5년)
+    next_ex_dividend_date: Optional[str] = None  # 다음 배당락일 (공시 또는 지급 주기로 추정)
+
+
+def _cache_ttl(next_ex: Optional[float]) -> float:
+    """다음 배당락일까지 남은 시간 (최소 TTL ~ 'dividend' 네임스페이스 TTL 범위로 제한)"""
+    max_ttl = app_cache.ttl("dividend")
+    if next_ex is None:
+        return max_ttl
+    remaining = next_ex - time.time()
+    return min(max(remaining, settings.DIVIDEND_CACHE_MIN_TTL), max_ttl)
 
 
 @router.get("/dividend/{symbol}", response_model=DividendResponse)
@@ -32,7 +50,18 @@ async def get_dividend_history(symbol: str):
     배당 이력 조회
     
     - **symbol**: 주식 심볼 (예: 'AAPL', 'MSFT', '005930' - 한국 종목은 숫자만 입력)
+    
+    결과는 종목별로 다음 배당락일까지 공유 캐시에 둔다 (동시 요청은 한 번만 계산).
     """
+    key = symbol.strip().upper()
+    cached = await app_cache.get("dividend", key)
+    if cached is not None:
+        return cached
+    return await singleflight.do(("Dividend", "history", key), lambda: _build_dividend_response(symbol))
+
+
+async def _build_dividend_response(symbol: str) -> DividendResponse:
+    """배당 이력 조회 및 요약 후 캐시에 저장"""
     try:
         print(f"[Dividend API] 배당 이력 조회 시작: {symbol}")
         
@@ -47,12 +76,11 @@ async def get_dividend_history(symbol: str):
         else:
             ticker_symbol = symbol_clean
         
-        ticker = yf.Ticker(ticker_symbol)
-        
-        # 회사 정보 조회
+        # 회사 정보 조회 (info 스냅샷은 한 번만 조회해 통화/수익률 계산에 재사용)
         company_info = {}
+        info = {}
         try:
-            info = ticker.info
+            info = await market_data_gateway.get_info(ticker_symbol)
             if info and isinstance(info, dict):
                 # 로고 URL 생성
                 logo_url = None
@@ -81,13 +109,14 @@ async def get_dividend_history(symbol: str):
         
         # 배당 데이터 조회
         # ticker.dividends가 실패할 경우 history에서 배당 데이터 추출 시도
+        fetch_failed = False
         try:
-            dividends = ticker.dividends
+            dividends = await market_data_gateway.get_dividends(ticker_symbol)
         except Exception as div_error:
             print(f"[Dividend API] ticker.dividends 실패, history fallback 시도: {div_error}")
             # Fallback: try to get history and extract dividends
             try:
-                hist = ticker.history(period="5y")
+                hist = await market_data_gateway.get_history(ticker_symbol, period="5y")
                 if not hist.empty and 'Dividends' in hist.columns:
                     dividends = hist['Dividends'].dropna()
                     print(f"[Dividend API] history에서 배당 데이터 추출 성공: {len(dividends)}개")
@@ -96,15 +125,20 @@ async def get_dividend_history(symbol: str):
             except Exception as hist_error:
                 print(f"[Dividend API] history fallback도 실패: {hist_error}")
                 dividends = None
+                fetch_failed = True
         
         if dividends is None or (hasattr(dividends, 'empty') and dividends.empty):
             print(f"[Dividend API] {symbol}에 대한 배당 데이터 없음")
-            return DividendResponse(
+            response = DividendResponse(
                 symbol=symbol.upper(),
                 company_info=company_info,
                 dividends=[],
                 five_year_growth_rate=None
             )
+            # 조회 실패로 비어 있는 응답은 캐시하지 않음 (일시적 오류일 수 있음)
+            if not fetch_failed:
+                await app_cache.set("dividend", symbol.strip().upper(), response)
+            return response
         
         # 통화 정보 확인
         currency = 'USD'  # 기본값
@@ -112,91 +146,37 @@ async def get_dividend_history(symbol: str):
         if is_korean:
             currency = 'KRW'
             # 회사 정보에서 통화 확인
-            try:
-                info = ticker.info
-                if isinstance(info, dict):
-                    currency_from_info = info.get('currency', '')
-                    if currency_from_info:
-                        currency = currency_from_info
-            except:
-                pass
-        
-        # 배당 데이터를 리스트로 변환 (2021년 이후만)
-        result = []
-        cutoff_date = datetime(2021, 1, 1).date()
-        
-        for date, amount in dividends.items():
-            # 날짜 변환
-            if hasattr(date, 'date'):
-                date_obj = date.date()
-                date_str = date_obj.isoformat()
-            elif hasattr(date, 'to_pydatetime'):
-                date_obj = date.to_pydatetime().date()
-                date_str = date_obj.isoformat()
-            else:
-                date_str = str(date)
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                except:
-                    date_obj = datetime.now().date()
-            
-            # 2021년 이전 데이터는 제외
-            if date_obj < cutoff_date:
-                continue
-            
-            # 배당 수익률 계산 (현재 가격 기준)
-            yield_value = None
-            try:
-                info = ticker.info
-                if isinstance(info, dict):
-                    current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-                    if current_price and amount:
-                        yield_value = amount / current_price
-            except:
-                pass
-            
-            result.append({
-                'date': date_str,
-                'date_obj': date_obj,
-                'amount': float(amount) if amount else None,
-                'yield_': yield_value
-            })
-        
-        # 최신순으로 정렬
-        result.sort(key=lambda x: x['date_obj'], reverse=True)
-        
-        # 5년간 배당 상승률 계산
-        five_years_ago = datetime.now().date() - timedelta(days=5*365)
-        five_year_dividends = [d for d in result if d['date_obj'] >= five_years_ago]
+            if isinstance(info, dict):
+                currency_from_info = info.get('currency', '')
+                if currency_from_info:
+                    currency = currency_from_info
         
-        five_year_growth_rate = None
-        if len(five_year_dividends) >= 2:
-            # 최근 1년 평균
-            one_year_ago = datetime.now().date() - timedelta(days=365)
-            recent_dividends = [d['amount'] for d in five_year_dividends if d['date_obj'] >= one_year_ago and d['amount']]
-            older_dividends = [d['amount'] for d in five_year_dividends if d['date_obj'] < one_year_ago and d['amount']]
-            
-            if recent_dividends and older_dividends:
-                recent_avg = sum(recent_dividends) / len(recent_dividends)
-                older_avg = sum(older_dividends) / len(older_dividends)
-                if older_avg > 0:
-                    five_year_growth_rate = ((recent_avg - older_avg) / older_avg) * 100
+        # 배당 수익률 계산 기준 가격 (공유 시세 캐시 → info 스냅샷 순, 한 번만 조회)
+        current_price = None
+        quote = quote_poller.peek(ticker_symbol)
+        if quote:
+            current_price = quote.get('price')
+        if not current_price and isinstance(info, dict):
+            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         
-        # DividendData로 변환
-        dividend_list = [DividendData(
-            date=d['date'],
-            amount=d['amount'],
-            yield_=d['yield_']
-        ) for d in result]
+        # 배당 Series 벡터 연산 (2021년 이후 목록, 5년 상승률, 최근 12개월 합계, 연평균 성장률)
+        summary = summarize_dividends(dividends, current_price)
+        next_ex = next_ex_dividend(summary['dates'], info)
+        dividend_list = [DividendData(**d) for d in summary['dividends']]
         
         print(f"[Dividend API] 배당 이력 조회 완료: {len(dividend_list)}개, 통화: {currency}")
-        return DividendResponse(
+        response = DividendResponse(
             symbol=symbol_clean.upper(),
             company_info=company_info,
             dividends=dividend_list,
-            five_year_growth_rate=five_year_growth_rate,
-            currency=currency
+            five_year_growth_rate=summary['five_year_growth_rate'],
+            currency=currency,
+            trailing_12m_dividend=summary['trailing_12m_dividend'],
+            dividend_cagr=summary['dividend_cagr'],
+            next_ex_dividend_date=datetime.fromtimestamp(next_ex).date().isoformat() if next_ex else None
         )
+        await app_cache.set("dividend", symbol.strip().upper(), response, ttl=_cache_ttl(next_ex))
+        return response
         
     except Exception as e:
         import traceback
@@ -3,11 +3,13 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
-import httpx
+from app.core.cache import app_cache
+from app.core.http import http_clients
 
 from app.services.data.fmp_economic import FMPEconomicProvider
 from app.services.data.yahoo_economic import YahooEconomicProvider
 from app.services.data.fred_api import FREDDataProvider
+from app.services.data.market_data_gateway import market_data_gateway
 
 router = APIRouter()
 
@@ -16,23 +18,6 @@ fmp_provider = FMPEconomicProvider()
 yahoo_economic = YahooEconomicProvider()
 fred_provider = FREDDataProvider()
 
-# 간단한 메모리 캐시
-_cache = {}
-_cache_ttl = {}
-CACHE_DURATION = 900  # 15분
-
-def get_cached(key: str):
-    if key in _cache and key in _cache_ttl:
-        if datetime.now() < _cache_ttl[key]:
-            return _cache[key]
-        else:
-            del _cache[key]
-            del _cache_ttl[key]
-    return None
-
-def set_cached(key: str, value: Any):
-    _cache[key] = value
-    _cache_ttl[key] = datetime.now() + timedelta(seconds=CACHE_DURATION)
 
 class EconomicIndicatorResponse(BaseModel):
     indicator: str
@@ -54,21 +39,18 @@ async def get_economic_calendar(
         if not start_date:
             start_date = (now - timedelta(days=30)).strftime('%Y-%m-%d')
 
-        cache_key = f"economic_calendar_{start_date}_{end_date}"
-        cached = get_cached(cache_key)
-        if cached:
-            return EconomicIndicatorResponse(**{**cached, "cached": True})
+        async def load():
+            data = await fmp_provider.get_economic_calendar(start_date, end_date)
+            return {
+                "indicator": "economic_calendar",
+                "data": data if data else [],
+                "source": "FMP",
+                "updated_at": datetime.now().isoformat()
+            }
 
-        data = await fmp_provider.get_economic_calendar(start_date, end_date)
-        
-        result = EconomicIndicatorResponse(
-            indicator="economic_calendar",
-            data=data if data else [],
-            source="FMP",
-            updated_at=datetime.now().isoformat()
-        )
-        set_cached(cache_key, result.model_dump())
-        return result
+        cache_key = f"economic_calendar_{start_date}_{end_date}"
+        result, cached = await app_cache.get_or_refresh("economic", cache_key, load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         print(f"[Economic Calendar] Error: {e}")
         return EconomicIndicatorResponse(
@@ -82,20 +64,17 @@ async def get_economic_calendar(
 async def get_treasury_rates():
     """국채 수익률 조회"""
     try:
-        cache_key = "treasury_rates"
-        cached = get_cached(cache_key)
-        if cached:
-            return EconomicIndicatorResponse(**{**cached, "cached": True})
-            
-        data = await fmp_provider.get_treasury_rates()
-        result = EconomicIndicatorResponse(
-            indicator="treasury_rates",
-            data=data if data else [],
-            source="FMP",
-            updated_at=datetime.now().isoformat()
-        )
-        set_cached(cache_key, result.model_dump())
-        return result
+        async def load():
+            data = await fmp_provider.get_treasury_rates()
+            return {
+                "indicator": "treasury_rates",
+                "data": data if data else [],
+                "source": "FMP",
+                "updated_at": datetime.now().isoformat()
+            }
+
+        result, cached = await app_cache.get_or_refresh("economic", "treasury_rates", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -103,35 +82,31 @@ async def get_treasury_rates():
 async def get_market_indices():
     """주요 시장 지수 조회"""
     try:
-        cache_key = "market_indices"
-        cached = get_cached(cache_key)
-        if cached:
-            return EconomicIndicatorResponse(**{**cached, "cached": True})
-            
-        data = await fmp_provider.get_market_indices()
-        if not data:
-            # Fallback to Yahoo
-            symbols = ['^GSPC', '^DJI', '^IXIC', '^RUT', '^KS11', '^KQ11']
-            tasks = [yahoo_economic.get_economic_data(s) for s in symbols]
-            yahoo_results = await asyncio.gather(*tasks)
-            data = []
-            for s, r in zip(symbols, yahoo_results):
-                if r and 'current_value' in r:
-                    data.append({
-                        'symbol': s.replace('^', ''),
-                        'price': r['current_value'],
-                        'change': 0,
-                        'changePercent': 0
-                    })
-        
-        result = EconomicIndicatorResponse(
-            indicator="market_indices",
-            data=data,
-            source="FMP/Yahoo",
-            updated_at=datetime.now().isoformat()
-        )
-        set_cached(cache_key, result.model_dump())
-        return result
+        async def load():
+            data = await fmp_provider.get_market_indices()
+            if not data:
+                # Fallback to Yahoo
+                symbols = ['^GSPC', '^DJI', '^IXIC', '^RUT', '^KS11', '^KQ11']
+                tasks = [yahoo_economic.get_economic_data(s) for s in symbols]
+                yahoo_results = await asyncio.gather(*tasks)
+                data = []
+                for s, r in zip(symbols, yahoo_results):
+                    if r and 'current_value' in r:
+                        data.append({
+                            'symbol': s.replace('^', ''),
+                            'price': r['current_value'],
+                            'change': 0,
+                            'changePercent': 0
+                        })
+            return {
+                "indicator": "market_indices",
+                "data": data,
+                "source": "FMP/Yahoo",
+                "updated_at": datetime.now().isoformat()
+            }
+
+        result, cached = await app_cache.get_or_refresh("economic", "market_indices", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -139,21 +114,18 @@ async def get_market_indices():
 async def get_treasury_yahoo(maturity: str = "10y"):
     """Yahoo Finance를 통한 국채 수익률 조회"""
     try:
-        cache_key = f"treasury_yahoo_{maturity}"
-        cached = get_cached(cache_key)
-        if cached: return cached
-        
-        symbol_map = {"10y": "^TNX", "5y": "^FVX", "30y": "^TYX"}
-        symbol = symbol_map.get(maturity, "^TNX")
-        data = await yahoo_economic.get_economic_data(symbol)
-        
-        result = {
-            "indicator": f"treasury_{maturity}",
-            "data": data if data else [],
-            "source": "Yahoo Finance",
-            "updated_at": datetime.now().isoformat()
-        }
-        set_cached(cache_key, result)
+        async def load():
+            symbol_map = {"10y": "^TNX", "5y": "^FVX", "30y": "^TYX"}
+            symbol = symbol_map.get(maturity, "^TNX")
+            data = await yahoo_economic.get_economic_data(symbol)
+            return {
+                "indicator": f"treasury_{maturity}",
+                "data": data if data else [],
+                "source": "Yahoo Finance",
+                "updated_at": datetime.now().isoformat()
+            }
+
+        result, _ = await app_cache.get_or_refresh("economic", f"treasury_yahoo_{maturity}", load)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -161,36 +133,35 @@ async def get_treasury_yahoo(maturity: str = "10y"):
 @router.get("/economic/api-usage")
 async def get_api_usage_info():
     return {
-        "total_cached_items": len(_cache),
-        "cache_duration_seconds": CACHE_DURATION,
-        "note": "캐시를 통해 API 호출을 최소화합니다."
+        "cache": app_cache.stats()["namespaces"].get("economic", {}),
+        "cache_duration_seconds": app_cache.soft_ttl("economic"),
+        "stale_max_seconds": app_cache.ttl("economic"),
+        "note": "캐시를 통해 API 호출을 최소화합니다. 갱신 주기가 지난 값은 백그라운드 갱신 중에도 바로 제공됩니다."
     }
 
 @router.get("/economic/highlights", response_model=EconomicIndicatorResponse)
 async def get_economic_highlights():
     try:
-        cache_key = "economic_macro_highlights"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        
-        indicators = ["GDP", "CPI", "unemploymentRate", "interestRate"]
-        tasks = [fmp_provider.get_economic_indicator("economic", name=name) for name in indicators]
-        results = await asyncio.gather(*tasks)
-        
-        combined_data = []
-        for name, data in zip(indicators, results):
-            if data and isinstance(data, list) and len(data) > 0:
-                latest = data[0]
-                combined_data.append({"name": name, "value": latest.get("value"), "date": latest.get("date")})
-        
-        result = {
-            "indicator": "macro_highlights",
-            "data": combined_data,
-            "source": "FMP",
-            "updated_at": datetime.now().isoformat()
-        }
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        async def load():
+            indicators = ["GDP", "CPI", "unemploymentRate", "interestRate"]
+            tasks = [fmp_provider.get_economic_indicator("economic", name=name) for name in indicators]
+            results = await asyncio.gather(*tasks)
+            
+            combined_data = []
+            for name, data in zip(indicators, results):
+                if data and isinstance(data, list) and len(data) > 0:
+                    latest = data[0]
+                    combined_data.append({"name": name, "value": latest.get("value"), "date": latest.get("date")})
+            
+            return {
+                "indicator": "macro_highlights",
+                "data": combined_data,
+                "source": "FMP",
+                "updated_at": datetime.now().isoformat()
+            }
+
+        result, cached = await app_cache.get_or_refresh("economic", "economic_macro_highlights", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -198,29 +169,27 @@ async def get_economic_highlights():
 async def get_market_sentiment():
     """시장 심리 지수 (공포탐욕지수) 조회"""
     try:
-        cache_key = "market_sentiment"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        
-        # CNN-like logic fallback
-        final_value = 50 
-        try:
-            cnn_url = "https://production.dataviz.cnn.io/index/fearandgreed/static/history"
-            headers = {"User-Agent": "Mozilla/5.0"}
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(cnn_url, headers=headers)
-                if resp.status_code == 200:
-                    final_value = int(resp.json().get('fear_and_greed', {}).get('score', 50))
-        except: pass
-
-        result = {
-            "indicator": "market_sentiment",
-            "data": [{"value": final_value, "classification": "Neutral", "timestamp": str(int(datetime.now().timestamp()))}],
-            "source": "CNN/Manual",
-            "updated_at": datetime.now().isoformat()
-        }
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        async def load():
+            # CNN-like logic fallback
+            final_value = 50 
+            try:
+                cnn_url = "https://production.dataviz.cnn.io/index/fearandgreed/static/history"
+                headers = {"User-Agent": "Mozilla/5.0"}
+                async with http_clients.session(timeout=5.0) as client:
+                    resp = await client.get(cnn_url, headers=headers)
+                    if resp.status_code == 200:
+                        final_value = int(resp.json().get('fear_and_greed', {}).get('score', 50))
+            except: pass
+
+            return {
+                "indicator": "market_sentiment",
+                "data": [{"value": final_value, "classification": "Neutral", "timestamp": str(int(datetime.now().timestamp()))}],
+                "source": "CNN/Manual",
+                "updated_at": datetime.now().isoformat()
+            }
+
+        result, cached = await app_cache.get_or_refresh("economic", "market_sentiment", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         return EconomicIndicatorResponse(
             indicator="market_sentiment",
@@ -232,94 +201,85 @@ async def get_market_sentiment():
 @router.get("/sector-rotation", response_model=EconomicIndicatorResponse)
 async def get_sector_rotation():
     try:
-        cache_key = "sector_rotation"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        
-        import yfinance as yf
-        sector_etfs = {"XLK": "Tech", "XLV": "Health", "XLE": "Energy", "XLF": "Finance", "XLI": "Industrials", "XLY": "ConsDis", "XLP": "ConsStap", "XLU": "Utilities", "XLB": "Materials", "XLRE": "RealEstate", "XLC": "Comm"}
-        symbols = list(sector_etfs.keys())
-        df = await asyncio.to_thread(yf.download, symbols, period="1mo", interval="1d", progress=False)
-        
-        sector_data = []
-        if not df.empty and 'Close' in df:
-            for symbol in symbols:
+        async def load():
+            sector_etfs = {"XLK": "Tech", "XLV": "Health", "XLE": "Energy", "XLF": "Finance", "XLI": "Industrials", "XLY": "ConsDis", "XLP": "ConsStap", "XLU": "Utilities", "XLB": "Materials", "XLRE": "RealEstate", "XLC": "Comm"}
+            symbols = list(sector_etfs.keys())
+            # ETF별 일봉은 로컬 저장소에서 읽음 (꼬리 구간만 업스트림 조회)
+            histories = await asyncio.gather(
+                *[market_data_gateway.get_daily_history(s, period="1mo") for s in symbols],
+                return_exceptions=True
+            )
+            
+            sector_data = []
+            for symbol, hist in zip(symbols, histories):
+                if isinstance(hist, Exception) or hist.empty:
+                    continue
                 try:
-                    closes = df['Close'][symbol].dropna()
+                    closes = hist['Close'].dropna()
                     if len(closes) >= 2:
                         change = ((closes.iloc[-1] - closes.iloc[0]) / closes.iloc[0]) * 100
                         sector_data.append({"symbol": symbol, "name": sector_etfs[symbol], "change_percent": float(change)})
                 except: pass
-        
-        sector_data.sort(key=lambda x: x["change_percent"], reverse=True)
-        result = {"indicator": "sector_rotation", "data": sector_data, "source": "yfinance", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+            
+            sector_data.sort(key=lambda x: x["change_percent"], reverse=True)
+            return {"indicator": "sector_rotation", "data": sector_data, "source": "yfinance", "updated_at": datetime.now().isoformat()}
+
+        result, cached = await app_cache.get_or_refresh("economic", "sector_rotation", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _fred_series(cache_key: str, indicator: str, series_id: str) -> EconomicIndicatorResponse:
+    """FRED 시계열 하나를 캐시를 거쳐 응답으로 변환"""
+    async def load():
+        data = await fred_provider.get_numeric_data(series_id)
+        return {"indicator": indicator, "data": data, "source": "FRED", "updated_at": datetime.now().isoformat()}
+
+    result, cached = await app_cache.get_or_refresh("economic", cache_key, load)
+    return EconomicIndicatorResponse(**{**result, "cached": cached})
+
 @router.get("/economic/jobless-claims", response_model=EconomicIndicatorResponse)
 async def get_jobless_claims():
     try:
-        cache_key = "jobless_claims"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        data = await fred_provider.get_numeric_data("ICSA")
-        result = {"indicator": "jobless_claims", "data": data, "source": "FRED", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        return await _fred_series("jobless_claims", "jobless_claims", "ICSA")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/economic/consumer-confidence", response_model=EconomicIndicatorResponse)
 async def get_consumer_confidence():
     try:
-        cache_key = "consumer_confidence"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        data = await fred_provider.get_numeric_data("UMCSENT")
-        result = {"indicator": "consumer_confidence", "data": data, "source": "FRED", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        return await _fred_series("consumer_confidence", "consumer_confidence", "UMCSENT")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/economic/retail-sales", response_model=EconomicIndicatorResponse)
 async def get_retail_sales():
     try:
-        cache_key = "retail_sales"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        data = await fred_provider.get_numeric_data("RSAFS")
-        result = {"indicator": "retail_sales", "data": data, "source": "FRED", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        return await _fred_series("retail_sales", "retail_sales", "RSAFS")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/economic/oil-prices", response_model=EconomicIndicatorResponse)
 async def get_oil_prices():
     try:
-        cache_key = "oil_prices"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        data = await yahoo_economic.get_economic_data("CL=F")
-        result = {"indicator": "oil_prices", "data": data.get("data", []) if data else [], "source": "Yahoo", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        async def load():
+            data = await yahoo_economic.get_economic_data("CL=F")
+            return {"indicator": "oil_prices", "data": data.get("data", []) if data else [], "source": "Yahoo", "updated_at": datetime.now().isoformat()}
+
+        result, cached = await app_cache.get_or_refresh("economic", "oil_prices", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/economic/pmi", response_model=EconomicIndicatorResponse)
 async def get_pmi():
     try:
-        cache_key = "pmi"
-        cached = get_cached(cache_key)
-        if cached: return EconomicIndicatorResponse(**{**cached, "cached": True})
-        data = await fmp_provider.get_economic_indicator("economic", "ismManufacturingPMI")
-        result = {"indicator": "pmi", "data": data if data else [], "source": "FMP", "updated_at": datetime.now().isoformat()}
-        set_cached(cache_key, result)
-        return EconomicIndicatorResponse(**result)
+        async def load():
+            data = await fmp_provider.get_economic_indicator("economic", "ismManufacturingPMI")
+            return {"indicator": "pmi", "data": data if data else [], "source": "FMP", "updated_at": datetime.now().isoformat()}
+
+        result, cached = await app_cache.get_or_refresh("economic", "pmi", load)
+        return EconomicIndicatorResponse(**{**result, "cached": cached})
     except Exception as e:
         return EconomicIndicatorResponse(indicator="pmi", data=[], source="Error", updated_at=datetime.now().isoformat())
 
@@ -1,7 +1,7 @@
 """
 뉴스 API - 한국 및 해외 주식 뉴스 제공
 """
-import yfinance as yf
+import asyncio
 import re
 import httpx
 import feedparser
@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+from app.services.data.market_data_gateway import market_data_gateway
 
 router = APIRouter()
 
@@ -317,22 +318,25 @@ async def get_news(
             if country == "kr" or symbol_clean.isdigit():
                 # 한국 종목
                 ticker_symbol = f"{symbol_clean}.KS" if not symbol_clean.endswith('.KS') else symbol_clean
-                ticker = yf.Ticker(ticker_symbol)
             else:
-                ticker = yf.Ticker(symbol_clean)
+                ticker_symbol = symbol_clean
             
             try:
-                # 회사 정보 가져오기 (필터링용)
+                # 회사 정보(필터링용)와 뉴스를 동시에 조회
+                info, news_data = await asyncio.gather(
+                    market_data_gateway.get_info(ticker_symbol),
+                    market_data_gateway.get_news(ticker_symbol),
+                    return_exceptions=True
+                )
+                if isinstance(news_data, Exception):
+                    raise news_data
+                
                 symbol_name = None
-                try:
-                    info = ticker.info
-                    if info and isinstance(info, dict) and len(info) > 0:
-                        symbol_name = info.get('longName', '') or info.get('shortName', '') or symbol_clean.upper()
-                except:
+                if isinstance(info, Exception):
                     symbol_name = symbol_clean.upper()
+                elif info and isinstance(info, dict) and len(info) > 0:
+                    symbol_name = info.get('longName', '') or info.get('shortName', '') or symbol_clean.upper()
                 
-                # yfinance의 get_news() 메서드 사용
-                news_data = ticker.get_news()
                 print(f"[News API] {symbol_clean} 뉴스 조회: {len(news_data) if news_data else 0}개")
                 
                 if news_data and len(news_data) > 0:
@@ -375,10 +379,17 @@ async def get_news(
                     '경기', '성장', '침체', '회복', '부양', '정책', '금융정책', '통화정책'
                 ]
                 
+                # feedparser.parse는 블로킹 네트워크 호출이므로 게이트웨이 스레드 풀에서 동시에 실행
+                feeds = await asyncio.gather(
+                    *[market_data_gateway.run(feedparser.parse, rss_url) for rss_url in korean_rss_feeds],
+                    return_exceptions=True
+                )
+                
                 news_data = []
-                for rss_url in korean_rss_feeds:
+                for rss_url, feed in zip(korean_rss_feeds, feeds):
                     try:
-                        feed = feedparser.parse(rss_url)
+                        if isinstance(feed, Exception):
+                            raise feed
                         if feed.entries:
                             for entry in feed.entries:
                                 title = entry.get('title', '')
@@ -422,8 +433,7 @@ async def get_news(
                 print(f"[News API] 한국 시장 뉴스 조회: 총 {len(news_data)}개 (RSS 피드)")
             else:
                 # 해외 시장 뉴스는 S&P 500 사용
-                ticker = yf.Ticker("^GSPC")
-                news_data = ticker.get_news()
+                news_data = await market_data_gateway.get_news("^GSPC")
             
             try:
                 if news_data and len(news_data) > 0:
@@ -482,18 +492,20 @@ async def get_company_news(
             country = "us"
             ticker_symbol = symbol_clean
         
-        ticker = yf.Ticker(ticker_symbol)
+        # 회사 정보(필터링용)와 뉴스를 동시에 조회
+        info, news_data = await asyncio.gather(
+            market_data_gateway.get_info(ticker_symbol),
+            market_data_gateway.get_news(ticker_symbol),
+            return_exceptions=True
+        )
+        if isinstance(news_data, Exception):
+            raise news_data
         
-        # 회사 정보 가져오기 (필터링용)
         symbol_name = None
-        try:
-            info = ticker.info
-            if info and isinstance(info, dict) and len(info) > 0:
-                symbol_name = info.get('longName', '') or info.get('shortName', '') or symbol_clean.upper()
-        except:
+        if isinstance(info, Exception):
             symbol_name = symbol_clean.upper()
-        
-        news_data = ticker.get_news()
+        elif info and isinstance(info, dict) and len(info) > 0:
+            symbol_name = info.get('longName', '') or info.get('shortName', '') or symbol_clean.upper()
         
         print(f"[News API] 기업 뉴스 조회 ({ticker_symbol}): {len(news_data) if news_data else 0}개")
         
@@ -1,26 +1,53 @@
 """
 Portfolio API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.core.database import get_db, SessionLocal
-from app.api.deps import get_current_user, get_current_user_optional
-from app.models.user import User
+import asyncio
+import csv
+import io
+import json
+import math
+import re
+import secrets
+import time
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from app.core.cache import app_cache
+from app.core.config import settings
+from app.core.database import get_async_db, AsyncSessionLocal
+from app.core.executors import cpu_pool
+from app.core.singleflight import singleflight
+from app.api.company import resolve_ticker_symbol
+from app.api.deps import get_current_user, get_current_user_optional, get_current_user_stream
+from app.core.principal import Principal
 from app.models.portfolio import PortfolioItem
-from app.models.subscription import Subscription
-from pydantic import BaseModel
+from app.services.analysis.dividend_history import project_income
+from app.services.analysis.monte_carlo import chunk_seeds, simulate_chunk, split_paths, summarize
+from app.services.analysis.portfolio_risk import compute_risk, risk_engine
+from app.services.data.market_data_gateway import market_data_gateway
+from app.services.data.quote_poller import QuotePollerFull, quote_poller
+from pydantic import BaseModel, Field
 
-FREE_PORTFOLIO_LIMIT = 10
+FREE_PORTFOLIO_LIMIT = settings.FREE_PORTFOLIO_LIMIT
 
 router = APIRouter()
 
 
+async def invalidate_portfolio_caches(user_id: int) -> None:
+    """보유 종목이 바뀌었을 때 사용자별 계산 결과 캐시 무효화"""
+    await app_cache.delete("portfolio_dividends", user_id)
+
+
 class PortfolioItemCreate(BaseModel):
     """Portfolio item creation schema"""
     symbol: str
-    quantity: float
-    average_price: float
+    quantity: float = Field(..., allow_inf_nan=False)
+    average_price: float = Field(..., allow_inf_nan=False)
     notes: Optional[str] = None
 
 
@@ -36,75 +63,312 @@ class PortfolioItemResponse(BaseModel):
         from_attributes = True
 
 
+async def _user_items(db: AsyncSession, user_id: int) -> List[PortfolioItem]:
+    """사용자 보유 종목 전체"""
+    result = await db.execute(select(PortfolioItem).where(PortfolioItem.user_id == user_id))
+    return list(result.scalars().all())
+
+
+# 종목 심볼 형식 (AAPL, BRK.B, 005930.KS, ^GSPC, BTC-USD 등)
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9^][A-Z0-9.\-=^]{0,19}$")
+
+# 일괄 가져오기 열 이름 별칭 (증권사 내보내기 파일의 흔한 열 이름)
+# price/현재가 열은 대부분 현재 시세이므로 매입 단가로 받지 않는다.
+# cost_basis/매입금액은 총 매입금액이므로 수량으로 나눠 평균단가로 쓴다.
+BULK_FIELD_ALIASES = {
+    "symbol": "symbol", "ticker": "symbol", "code": "symbol", "종목코드": "symbol", "종목": "symbol",
+    "quantity": "quantity", "qty": "quantity", "shares": "quantity", "수량": "quantity", "보유수량": "quantity",
+    "average_price": "average_price", "avg_price": "average_price", "average_cost": "average_price",
+    "평균단가": "average_price", "매입단가": "average_price",
+    "cost_basis": "total_cost", "total_cost": "total_cost", "매입금액": "total_cost",
+    "notes": "notes", "note": "notes", "메모": "notes",
+}
+
+
+def _parse_number(value: Any) -> Optional[float]:
+    """
+    숫자 또는 "1,234.5", "$12.30" 형태의 문자열
+
+    nan/inf는 None으로 본다 (저장되면 그 행을 포함한 JSON 응답이 모두 실패하므로).
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    elif isinstance(value, str):
+        cleaned = value.strip().replace(",", "").lstrip("$₩")
+        try:
+            number = float(cleaned)
+        except ValueError:
+            return None
+    else:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _normalize_holdings(rows: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    행 목록을 한 번 순회하며 검증/정규화
+    
+    같은 종목이 여러 행에 있으면 수량을 합치고 평균단가를 가중평균한다
+    (한 INSERT ... ON CONFLICT 문이 같은 행을 두 번 갱신할 수 없으므로).
+    
+    Returns:
+        (심볼 → 보유 정보, 오류 목록)
+    """
+    holdings: Dict[str, Dict[str, Any]] = {}
+    errors: List[Dict[str, Any]] = []
+    for line, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            errors.append({"row": line, "error": "행은 객체여야 합니다."})
+            continue
+        row = {}
+        for key, value in raw.items():
+            field = BULK_FIELD_ALIASES.get(str(key).strip().lower())
+            if field and field not in row:
+                row[field] = value
+        
+        symbol = str(row.get("symbol") or "").strip().upper()
+        quantity = _parse_number(row.get("quantity"))
+        average_price = _parse_number(row.get("average_price"))
+        if average_price is None and quantity and quantity > 0:
+            total_cost = _parse_number(row.get("total_cost"))
+            if total_cost is not None:
+                average_price = total_cost / quantity
+        if not SYMBOL_PATTERN.match(symbol):
+            errors.append({"row": line, "symbol": symbol, "error": "잘못된 종목 심볼입니다."})
+            continue
+        if quantity is None:
+            errors.append({"row": line, "symbol": symbol, "error": "수량이 없거나 유한한 숫자가 아닙니다."})
+            continue
+        if quantity <= 0:
+            errors.append({"row": line, "symbol": symbol, "error": "수량은 0보다 커야 합니다."})
+            continue
+        # 총 매입금액 ÷ 아주 작은 수량은 inf가 될 수 있으므로 다시 확인
+        if average_price is None or not math.isfinite(average_price) or average_price < 0:
+            errors.append({
+                "row": line,
+                "symbol": symbol,
+                "error": "평균단가가 없거나 올바르지 않습니다 (average_price/avg_price/평균단가 또는 cost_basis/매입금액 열)."
+            })
+            continue
+        notes = row.get("notes")
+        notes = (str(notes).strip() or None) if notes is not None else None
+        
+        holding = holdings.get(symbol)
+        if holding is None:
+            holdings[symbol] = {"symbol": symbol, "quantity": quantity, "average_price": average_price, "notes": notes}
+        else:
+            total = holding["quantity"] + quantity
+            holding["average_price"] = (holding["quantity"] * holding["average_price"] + quantity * average_price) / total
+            holding["quantity"] = total
+            holding["notes"] = notes or holding["notes"]
+    return holdings, errors
+
+
+async def _holding_counts(db: AsyncSession, user_id: int, symbols: List[str]) -> Tuple[int, int]:
+    """(현재 보유 종목 수, 그중 symbols에 이미 있는 종목 수) - 쿼리 한 번"""
+    total, matched = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(PortfolioItem.symbol.in_(symbols))
+        ).where(PortfolioItem.user_id == user_id)
+    )).one()
+    return total, matched
+
+
+def _check_holding_limit(current_user: Principal, total: int, new_symbols: int) -> None:
+    """무료 사용자 보유 종목 수 제한 (등급은 인증 주체 캐시에서)"""
+    limit = current_user.entitlements["max_portfolio_items"]
+    if limit is not None and total + new_symbols > limit:
+        raise HTTPException(
+            status_code=403,
+            detail=f"무료 사용자는 최대 {limit}개까지만 포트폴리오에 추가할 수 있습니다. 프리미엄으로 업그레이드하세요."
+        )
+
+
+async def _upsert_holdings(
+    db: AsyncSession,
+    user_id: int,
+    holdings: List[Dict[str, Any]],
+    mode: str
+) -> List[PortfolioItem]:
+    """
+    여러 종목을 INSERT ... ON CONFLICT (user_id, symbol) 한 문장으로 저장
+    
+    mode:
+        replace: 이미 있는 종목은 수량/평균단가를 덮어씀 (증권사 잔고 내보내기)
+        merge: 이미 있는 종목에 수량을 더하고 평균단가를 가중평균 (추가 매수)
+    """
+    stmt = pg_insert(PortfolioItem).values([{"user_id": user_id, **holding} for holding in holdings])
+    excluded = stmt.excluded
+    if mode == "merge":
+        total = PortfolioItem.quantity + excluded.quantity
+        values = {
+            "quantity": total,
+            "average_price": (
+                PortfolioItem.quantity * PortfolioItem.average_price + excluded.quantity * excluded.average_price
+            ) / total,
+        }
+    else:
+        values = {"quantity": excluded.quantity, "average_price": excluded.average_price}
+    values["notes"] = func.coalesce(excluded.notes, PortfolioItem.notes)
+    values["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(index_elements=["user_id", "symbol"], set_=values)
+    result = await db.scalars(
+        stmt.returning(PortfolioItem),
+        execution_options={"populate_existing": True}
+    )
+    items = list(result.all())
+    await db.commit()
+    return items
+
+
+async def _read_bulk_rows(request: Request) -> List[Dict[str, Any]]:
+    """요청 본문 → 행 목록 (JSON 배열/{"items": [...]}, CSV 본문, CSV 파일 업로드)"""
+    content_type = request.headers.get("content-type", "").lower()
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise HTTPException(status_code=400, detail="file 필드에 CSV 파일을 첨부하세요.")
+        body = await upload.read()
+        content_type = "text/csv"
+    else:
+        body = await request.body()
+    
+    if "json" in content_type:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSON 형식이 올바르지 않습니다.")
+        rows = data.get("items") if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="JSON 배열 또는 {\"items\": [...]} 형식이어야 합니다.")
+        return rows
+    
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # 국내 증권사 내보내기 파일은 CP949인 경우가 많음
+        text = body.decode("cp949", errors="replace")
+    return list(csv.DictReader(io.StringIO(text)))
+
+
 @router.get("/", response_model=List[PortfolioItemResponse])
 async def get_portfolio(
-    current_user: User = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's portfolio"""
-    if SessionLocal is None:
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=503,
             detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
         )
     if not current_user:
         return []
-    items = db.query(PortfolioItem).filter(PortfolioItem.user_id == current_user.id).all()
-    return items
+    return await _user_items(db, current_user.id)
 
 
 @router.post("/", response_model=PortfolioItemResponse, status_code=201)
 async def add_portfolio_item(
     item: PortfolioItemCreate,
-    current_user: User = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Add item to portfolio"""
+    """
+    Add item to portfolio
+
+    새 종목이면 201, 이미 보유한 종목이면 추가 매수로 합친 결과를 200으로 반환한다.
+    """
     if not current_user:
         raise HTTPException(
             status_code=401,
             detail="포트폴리오에 종목을 추가하려면 로그인하세요."
         )
 
-    if SessionLocal is None:
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=503,
             detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
         )
 
-    # 구독 상태 확인
-    subscription = db.query(Subscription).filter(Subscription.user_id == current_user.id).first()
-    is_premium = subscription and subscription.is_active and subscription.tier == "premium"
+    holdings, errors = _normalize_holdings([item.model_dump()])
+    if errors:
+        raise HTTPException(status_code=422, detail=errors[0]["error"])
+    symbol = next(iter(holdings))
     
-    # 무료 사용자 포트폴리오 제한 체크
-    if not is_premium:
-        existing_count = db.query(PortfolioItem).filter(PortfolioItem.user_id == current_user.id).count()
-        if existing_count >= FREE_PORTFOLIO_LIMIT:
-            raise HTTPException(
-                status_code=403,
-                detail=f"무료 사용자는 최대 {FREE_PORTFOLIO_LIMIT}개까지만 포트폴리오에 추가할 수 있습니다. 프리미엄으로 업그레이드하세요."
-            )
+    # 이미 보유한 종목이면 추가 매수로 합치므로 종목 수가 늘지 않음
+    total, matched = await _holding_counts(db, current_user.id, [symbol])
+    _check_holding_limit(current_user, total, 1 - matched)
     
-    new_item = PortfolioItem(
-        user_id=current_user.id,
-        symbol=item.symbol.upper(),
-        quantity=item.quantity,
-        average_price=item.average_price,
-        notes=item.notes
-    )
+    items = await _upsert_holdings(db, current_user.id, list(holdings.values()), mode="merge")
+    await invalidate_portfolio_caches(current_user.id)
+    
+    if matched:
+        response.status_code = 200
+    return items[0]
+
+
+@router.post("/bulk")
+async def bulk_import_portfolio(
+    request: Request,
+    mode: Literal["replace", "merge"] = Query("replace", description="이미 있는 종목 처리: replace(덮어쓰기) | merge(수량 합산)"),
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    보유 종목 일괄 가져오기 (CSV 또는 JSON)
+    
+    - JSON: [{"symbol", "quantity", "average_price", "notes"?}, ...] 또는 {"items": [...]}
+    - CSV: 헤더가 있는 본문(text/csv) 또는 multipart 파일(file). 증권사 내보내기의 흔한 열 이름
+      (ticker, shares, avg_price, 종목코드, 수량, 평균단가 등)도 인식한다.
+    
+    전체 행을 한 번에 검증해 오류가 있으면 아무것도 저장하지 않고 행별 오류를 돌려준다.
+    종목 수 제한은 쿼리 한 번으로 확인하고, 저장은 INSERT ... ON CONFLICT 한 문장으로 한다.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="포트폴리오를 가져오려면 로그인하세요.")
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
+        )
     
-    db.add(new_item)
-    db.commit()
-    db.refresh(new_item)
+    rows = await _read_bulk_rows(request)
+    if not rows:
+        raise HTTPException(status_code=400, detail="가져올 종목이 없습니다.")
+    if len(rows) > settings.PORTFOLIO_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {settings.PORTFOLIO_BULK_MAX_ROWS}개 행까지 가져올 수 있습니다."
+        )
+    
+    holdings, errors = _normalize_holdings(rows)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "잘못된 행이 있습니다.", "errors": errors})
+    
+    symbols = list(holdings)
+    total, matched = await _holding_counts(db, current_user.id, symbols)
+    _check_holding_limit(current_user, total, len(symbols) - matched)
+    
+    items = await _upsert_holdings(db, current_user.id, list(holdings.values()), mode)
+    await invalidate_portfolio_caches(current_user.id)
     
-    return new_item
+    return {
+        "mode": mode,
+        "rows": len(rows),
+        "created": len(symbols) - matched,
+        "updated": matched,
+        "items": [PortfolioItemResponse.model_validate(item) for item in items],
+    }
 
 
 @router.delete("/{item_id}", status_code=204)
 async def delete_portfolio_item(
     item_id: int,
-    current_user: User = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete item from portfolio"""
     if not current_user:
@@ -113,22 +377,24 @@ async def delete_portfolio_item(
             detail="포트폴리오에서 종목을 삭제하려면 로그인하세요."
         )
 
-    if SessionLocal is None:
+    if AsyncSessionLocal is None:
         raise HTTPException(
             status_code=503,
             detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
         )
-    item = db.query(PortfolioItem).filter(
-        PortfolioItem.id == item_id
-    ).filter(
-        PortfolioItem.user_id == current_user.id
-    ).first()
+    item = await db.scalar(
+        select(PortfolioItem).where(
+            PortfolioItem.id == item_id,
+            PortfolioItem.user_id == current_user.id
+        )
+    )
     
     if not item:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
     
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
+    await invalidate_portfolio_caches(current_user.id)
     
     return None
     
@@ -136,17 +402,19 @@ async def delete_portfolio_item(
 @router.get("/prices")
 async def get_portfolio_prices(
     symbols: str = Query(..., description="쉼표로 구분된 종목 심볼"),
-    current_user: User = Depends(get_current_user_optional)
+    current_user: Principal = Depends(get_current_user_optional)
 ):
-    """포트폴리오 종목들의 현재가 대량 조회"""
-    from app.services.data.yahoo_finance import YahooFinanceDataProvider
-    
-    symbol_list = [s.strip().upper() for s in symbols.split(",")]
+    """포트폴리오 종목들의 현재가 대량 조회 (중앙 시세 폴러의 공유 캐시 사용)"""
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
     if not symbol_list:
         return {}
+    if len(symbol_list) > settings.QUOTE_PRICES_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.QUOTE_PRICES_MAX_SYMBOLS}개 종목까지 조회할 수 있습니다."
+        )
         
-    provider = YahooFinanceDataProvider()
-    quotes = provider.get_current_prices_batch(symbol_list)
+    quotes = await quote_poller.get_quotes(symbol_list)
     
     # 응답 형식 정리
     result = {}
@@ -167,3 +435,490 @@ async def get_portfolio_prices(
         
     return result
 
+
+async def _resolve_currencies(tickers: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    종목 통화 (info 스냅샷의 currency)
+    
+    캐시에 없는 종목은 게이트웨이로 조회한다 (같은 종목 동시 조회는 합쳐지고 결과는 캐시됨).
+    조회에 실패하거나 currency가 없으면 거래소 접미사로 추측하지 않고 None을 돌려준다.
+    """
+    unique = list(dict.fromkeys(tickers))
+    infos = await asyncio.gather(*(market_data_gateway.get_info(ticker) for ticker in unique), return_exceptions=True)
+    currencies: Dict[str, Optional[str]] = {}
+    for ticker, info in zip(unique, infos):
+        if isinstance(info, BaseException):
+            print(f"[Portfolio API] 통화 조회 실패 ({ticker}): {info!r}")
+            currencies[ticker] = None
+        else:
+            currencies[ticker] = (info or {}).get("currency") or None
+    return currencies
+
+
+# 보조 통화 단위 (yfinance info의 currency) → (주 통화, 배수). 런던 GBp는 펜스 단위
+MINOR_CURRENCY_UNITS = {"GBp": ("GBP", 0.01), "GBX": ("GBP", 0.01), "ZAc": ("ZAR", 0.01), "ILA": ("ILS", 0.01)}
+
+
+def _fx_plan(currencies: List[Optional[str]]) -> Tuple[str, Dict[str, Tuple[str, float]]]:
+    """
+    기준 통화와 환산 계획
+    
+    통화가 하나면 그 통화가 기준이고 환산하지 않는다. 섞여 있으면 USD 기준이며,
+    USD가 아닌 통화마다 {통화}USD=X 시세(1 단위당 USD)에 보조 단위 배수를 곱해 환산한다.
+    통화를 모르는 종목(None)은 계획에서 빠진다.
+    
+    Returns:
+        (기준 통화, {통화: (환율 심볼, 배수)})
+    """
+    known = [currency for currency in currencies if currency]
+    distinct = set(known)
+    if len(distinct) <= 1:
+        return (known[0] if known else "USD"), {}
+    plan = {}
+    for currency in distinct:
+        if currency == "USD":
+            continue
+        major, scale = MINOR_CURRENCY_UNITS.get(currency, (currency.upper(), 1.0))
+        plan[currency] = (f"{major}USD=X", scale)
+    return "USD", plan
+
+
+def _quote_state(quote: Optional[Dict], now: float) -> Tuple[Optional[float], str, Optional[float]]:
+    """공유 시세 캐시 항목 → (가격, fresh/stale/missing, 나이 초). 가격이 없거나 0 이하면 missing"""
+    price = quote.get("price") if quote else None
+    if not price or price <= 0:
+        return None, "missing", None
+    age = max(0.0, now - quote.get("updated_at", 0))
+    return price, "fresh" if age <= settings.QUOTE_CACHE_MAX_AGE else "stale", round(age, 1)
+
+
+def _value_positions(
+    quantities: List[float],
+    average_prices: List[float],
+    prices: List[Optional[float]],
+    fx_rates: List[Optional[float]]
+) -> Dict[str, Any]:
+    """
+    평가금액/평가손익/비중 벡터 계산
+    
+    가격이나 환율이 없는 종목은 NaN으로 두어 해당 값만 비고(None), 합계와 비중에서는 빠진다.
+    
+    Args:
+        prices: 종목 통화 기준 현재가 (없으면 None)
+        fx_rates: 종목 통화 → 기준 통화 환율 (없으면 None)
+    """
+    quantity = np.asarray(quantities, dtype=float)
+    average_price = np.asarray(average_prices, dtype=float)
+    price = np.array([np.nan if p is None else p for p in prices], dtype=float)
+    fx = np.array([np.nan if r is None else r for r in fx_rates], dtype=float)
+    
+    cost = quantity * average_price
+    market_value = quantity * price
+    pnl = market_value - cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pnl_percent = np.where(cost > 0, pnl / cost * 100, np.nan)
+    
+    # 기준 통화 합계는 가격과 환율이 모두 있는 종목만
+    value_base = market_value * fx
+    valued = ~np.isnan(value_base)
+    total_value = float(value_base[valued].sum())
+    total_cost = float((cost * fx)[valued].sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = value_base / total_value if total_value > 0 else np.full(len(quantity), np.nan)
+    
+    def column(values) -> List[Optional[float]]:
+        return [None if np.isnan(v) else round(float(v), 6) for v in values]
+    
+    return {
+        "market_value": column(market_value),
+        "cost_basis": column(cost),
+        "unrealized_pnl": column(pnl),
+        "unrealized_pnl_percent": column(pnl_percent),
+        "weight": column(weight),
+        "total_market_value": round(total_value, 6),
+        "total_cost_basis": round(total_cost, 6),
+        "total_unrealized_pnl": round(total_value - total_cost, 6),
+        "total_unrealized_pnl_percent": (
+            round((total_value - total_cost) / total_cost * 100, 6) if total_cost > 0 else None
+        ),
+        "valued_positions": int(valued.sum()),
+    }
+
+
+@router.get("/valuation")
+async def get_portfolio_valuation(
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    보유 종목 평가 (보유 목록 + 시세 + 손익을 한 번에)
+    
+    보유 종목을 읽고 공유 시세 캐시(quote_poller)에서 현재가를 가져온다. 캐시에 없거나
+    QUOTE_CACHE_MAX_AGE보다 오래된 종목만 한 번에 업스트림 조회한다. 종목별 평가금액,
+    평가손익, 비중과 합계를 계산하며, 통화가 섞여 있으면 합계와 비중은 USD 기준이다
+    (통화별 {통화}USD=X 환율을 종목 시세와 같은 배치로 조회).
+    
+    시세를 0으로 채우지 않는다. 종목마다 quote_status/fx_status를 붙인다:
+    fresh(최신), stale(갱신 실패로 이전 시세 사용), missing(없음, 값은 null이고 합계에서 제외).
+    통화를 확인하지 못한 종목은 fx_status가 unknown_currency다. 시세가 없는 종목은
+    missing_symbols, 환율이나 통화가 없는 종목은 fx_missing_symbols에 나열한다.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="포트폴리오 평가를 보려면 로그인하세요.")
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
+        )
+    
+    items = await _user_items(db, current_user.id)
+    tickers = [resolve_ticker_symbol(item.symbol)[1].upper() for item in items]
+    currency_of = await _resolve_currencies(tickers)
+    currencies = [currency_of[ticker] for ticker in tickers]
+    base_currency, fx_plan = _fx_plan(currencies)
+    fx_symbols = sorted({symbol for symbol, _ in fx_plan.values()})
+    
+    # 환율도 같은 배치로 조회
+    quotes = await quote_poller.get_quotes(tickers + fx_symbols) if tickers else {}
+    now = time.time()
+    
+    fx_states = {symbol: _quote_state(quotes.get(symbol), now) for symbol in fx_symbols}
+    
+    def fx_for(currency: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+        """(기준 통화 환산 배수, 환율 상태). 기준 통화면 (1.0, None)"""
+        if currency is None:
+            return None, "unknown_currency"
+        if currency not in fx_plan:
+            return 1.0, None
+        symbol, scale = fx_plan[currency]
+        rate, status, _ = fx_states[symbol]
+        return (rate * scale if rate else None), status
+    
+    states = [_quote_state(quotes.get(ticker), now) for ticker in tickers]
+    fx = [fx_for(currency) for currency in currencies]
+    valuation = _value_positions(
+        [item.quantity for item in items],
+        [item.average_price for item in items],
+        [state[0] for state in states],
+        [rate for rate, _ in fx]
+    )
+    
+    positions = []
+    for i, item in enumerate(items):
+        quote = quotes.get(tickers[i]) or {}
+        price, status, age = states[i]
+        positions.append({
+            "id": item.id,
+            "symbol": item.symbol,
+            "ticker": tickers[i],
+            "currency": currencies[i],
+            "quantity": item.quantity,
+            "average_price": item.average_price,
+            "price": price,
+            "change_percent": quote.get("changePercent") if price is not None else None,
+            "quote_status": status,
+            "quote_age_seconds": age,
+            "fx_rate": fx[i][0],
+            "fx_status": fx[i][1],
+            "market_value": valuation["market_value"][i],
+            "cost_basis": valuation["cost_basis"][i],
+            "unrealized_pnl": valuation["unrealized_pnl"][i],
+            "unrealized_pnl_percent": valuation["unrealized_pnl_percent"][i],
+            "weight": valuation["weight"][i],
+        })
+    
+    statuses = [state[1] for state in states]
+    fx_statuses = [status for _, status in fx]
+    return {
+        "currency": base_currency,
+        "positions": positions,
+        "totals": {
+            "market_value": valuation["total_market_value"],
+            "cost_basis": valuation["total_cost_basis"],
+            "unrealized_pnl": valuation["total_unrealized_pnl"],
+            "unrealized_pnl_percent": valuation["total_unrealized_pnl_percent"],
+            "positions": len(items),
+            "valued_positions": valuation["valued_positions"],
+        },
+        "fx": {
+            symbol: {"rate": rate, "status": status, "age_seconds": age}
+            for symbol, (rate, status, age) in fx_states.items()
+        },
+        "stale": "stale" in statuses or "stale" in fx_statuses,
+        "complete": valuation["valued_positions"] == len(items),
+        "missing_symbols": [tickers[i] for i, status in enumerate(statuses) if status == "missing"],
+        # 시세는 있지만 환율이나 통화를 몰라 합계/비중에서 빠진 종목
+        "fx_missing_symbols": [
+            tickers[i] for i, status in enumerate(fx_statuses) if status in ("missing", "unknown_currency")
+        ],
+        "generated_at": now,
+    }
+
+
+@router.get("/dividends")
+async def get_portfolio_dividends(
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    보유 종목 향후 12개월 배당 수입 달력
+    
+    모든 보유 종목의 배당 이력을 일괄 조회 한 번으로 받아 월별/종목별 예상 수입(주당 배당 × 수량)을
+    계산한다. 결과는 사용자별로 캐시하며 보유 종목이 바뀌면 무효화된다.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="배당 달력을 보려면 로그인하세요.")
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
+        )
+    
+    items = await _user_items(db, current_user.id)
+    quantities: Dict[str, float] = {}
+    for item in items:
+        quantities[item.symbol] = quantities.get(item.symbol, 0.0) + item.quantity
+    
+    # 월이 바뀌면 달력 구간이 달라지므로 지문에 이번 달 포함 (캐시 JSON 왕복 후에도 비교되도록 리스트)
+    fingerprint = [time.strftime("%Y-%m"), [[symbol, quantity] for symbol, quantity in sorted(quantities.items())]]
+    cached = await app_cache.get("portfolio_dividends", current_user.id)
+    if cached is not None and cached["fingerprint"] == fingerprint:
+        return cached["result"]
+    
+    tickers = {symbol: resolve_ticker_symbol(symbol)[1] for symbol in quantities}
+    try:
+        histories = await market_data_gateway.get_dividends_batch(list(tickers.values()))
+    except Exception as e:
+        print(f"[Portfolio API] 배당 이력 일괄 조회 실패: {e}")
+        raise HTTPException(status_code=502, detail="배당 데이터를 가져오지 못했습니다. 잠시 후 다시 시도해주세요.")
+    
+    # 통화를 모르는 종목은 다른 통화 합계에 섞이지 않도록 UNKNOWN으로 따로 집계
+    currency_of = await _resolve_currencies(tickers.values())
+    projection = project_income(
+        {symbol: histories.get(ticker.upper()) for symbol, ticker in tickers.items()},
+        quantities,
+        {symbol: currency_of[ticker] or "UNKNOWN" for symbol, ticker in tickers.items()}
+    )
+    projection["generated_at"] = time.time()
+    await app_cache.set("portfolio_dividends", current_user.id, {"fingerprint": fingerprint, "result": projection})
+    return projection
+
+
+async def _load_risk_inputs(current_user: Optional[Principal], db: AsyncSession) -> dict:
+    """
+    리스크/시뮬레이션 공통 입력: 보유 종목 수익률 행렬(캐시) + 평가금액 비중
+    
+    Returns:
+        {"matrix", "weights", "total", "currency", "quantities"}
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="포트폴리오 분석을 보려면 로그인하세요.")
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요."
+        )
+    
+    items = await _user_items(db, current_user.id)
+    quantities: Dict[str, float] = {}
+    for item in items:
+        ticker = resolve_ticker_symbol(item.symbol)[1].upper()
+        quantities[ticker] = quantities.get(ticker, 0.0) + item.quantity
+    if not quantities:
+        raise HTTPException(status_code=400, detail="포트폴리오에 종목이 없습니다.")
+    
+    key = risk_engine.key(list(quantities))
+    matrix = risk_engine.peek(key)
+    if matrix is None:
+        matrix = await singleflight.do(
+            ("PortfolioRisk", "matrix", key),
+            lambda: market_data_gateway.run(risk_engine.build, key, timeout=120)
+        )
+    if not matrix.symbols or len(matrix) < settings.RISK_MIN_OBSERVATIONS:
+        raise HTTPException(status_code=400, detail="리스크를 계산할 가격 이력이 부족합니다.")
+    
+    # 평가금액 비중 (통화가 섞여 있으면 통화별 환율로 USD 환산, 하나라도 없으면 비중을 믿을 수 없으므로 503)
+    currency_of = await _resolve_currencies(matrix.symbols)
+    unknown = [symbol for symbol in matrix.symbols if currency_of[symbol] is None]
+    if unknown:
+        raise HTTPException(
+            status_code=503,
+            detail=f"종목 통화를 확인하지 못했습니다 ({', '.join(unknown)}). 잠시 후 다시 시도해주세요."
+        )
+    currencies = [currency_of[symbol] for symbol in matrix.symbols]
+    base_currency, fx_plan = _fx_plan(currencies)
+    fx = np.ones(len(currencies))
+    if fx_plan:
+        quotes = await quote_poller.get_quotes(sorted({symbol for symbol, _ in fx_plan.values()}))
+        rates = {}
+        for currency, (symbol, scale) in fx_plan.items():
+            rate = _quote_state(quotes.get(symbol), time.time())[0]
+            if rate is not None:
+                rates[currency] = rate * scale
+        missing = sorted(set(fx_plan) - set(rates))
+        if missing:
+            raise HTTPException(
+                status_code=503,
+                detail=f"환율 정보를 가져오지 못했습니다 ({', '.join(missing)}). 잠시 후 다시 시도해주세요."
+            )
+        fx = np.array([rates.get(currency, 1.0) for currency in currencies])
+    values = np.array([quantities[symbol] for symbol in matrix.symbols]) * matrix.last_close * fx
+    total = float(values.sum())
+    if not total > 0:
+        raise HTTPException(status_code=400, detail="평가금액을 계산할 수 없습니다.")
+    
+    return {
+        "matrix": matrix,
+        "weights": values / total,
+        "total": total,
+        "currency": base_currency,
+        "quantities": quantities,
+    }
+
+
+@router.get("/risk")
+async def get_portfolio_risk(
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    보유 종목 포트폴리오 리스크
+    
+    최근 RISK_LOOKBACK_DAYS 거래일 일간 수익률로 변동성(연율화), 종목별/포트폴리오 베타
+    (미국 종목 ^GSPC, 한국 종목 ^KS11 기준), 1일 VaR/CVaR(역사적/모수적), 상관계수 행렬을 계산한다.
+    수익률 행렬은 종목 조합별로 캐시하므로 수량만 바뀐 요청은 다시 조회하지 않는다.
+    """
+    started = time.perf_counter()
+    inputs = await _load_risk_inputs(current_user, db)
+    matrix = inputs["matrix"]
+    
+    result = compute_risk(matrix, inputs["weights"], inputs["total"])
+    result["currency"] = inputs["currency"]
+    result["missing"] = [symbol for symbol in matrix.missing if symbol in inputs["quantities"]]
+    result["matrix_built_at"] = matrix.built_at
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+class SimulationRequest(BaseModel):
+    """몬테카를로 시뮬레이션 요청"""
+    paths: int = Field(5000, ge=100, description="시뮬레이션 경로 수")
+    horizon_days: int = Field(252, ge=1, description="시뮬레이션 기간 (거래일)")
+    method: Literal["bootstrap", "normal"] = "bootstrap"
+    seed: Optional[int] = Field(None, ge=0, description="같은 값이면 같은 결과 (미지정 시 무작위)")
+
+
+@router.post("/simulate")
+async def simulate_portfolio(
+    request: SimulationRequest,
+    current_user: Principal = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    보유 종목 포트폴리오 몬테카를로 시뮬레이션
+    
+    캐시된 수익률 행렬의 포트폴리오 일간 수익률을 복원추출(bootstrap)하거나 정규분포(normal)에서
+    뽑아 경로 × 기간을 한 번에 계산한다. 계산은 항상 프로세스 풀에서 하며, SIMULATION_CHUNK_PATHS보다
+    많은 경로는 청크로 나눠 동시에 실행한다. 백분위 밴드, 최종 수익률 분포, 최대 낙폭 분포를 반환한다.
+    """
+    if request.paths > settings.SIMULATION_MAX_PATHS:
+        raise HTTPException(status_code=400, detail=f"경로 수는 최대 {settings.SIMULATION_MAX_PATHS}개입니다.")
+    if request.horizon_days > settings.SIMULATION_MAX_HORIZON:
+        raise HTTPException(status_code=400, detail=f"시뮬레이션 기간은 최대 {settings.SIMULATION_MAX_HORIZON}거래일입니다.")
+    
+    started = time.perf_counter()
+    inputs = await _load_risk_inputs(current_user, db)
+    portfolio_returns = inputs["matrix"].returns @ inputs["weights"]
+    
+    seed = request.seed if request.seed is not None else secrets.randbits(32)
+    chunks = split_paths(request.paths, settings.SIMULATION_CHUNK_PATHS)
+    seeds = chunk_seeds(seed, len(chunks))
+    # 청크가 하나여도 수십 ms가 걸리므로 항상 프로세스 풀에서 실행 (이벤트 루프를 막지 않음)
+    try:
+        results = await asyncio.gather(*(
+            cpu_pool.run(simulate_chunk, portfolio_returns, paths, request.horizon_days, request.method, chunk_seed)
+            for paths, chunk_seed in zip(chunks, seeds)
+        ))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="시뮬레이션 시간이 초과되었습니다. 경로 수나 기간을 줄여주세요.")
+    
+    result = summarize(results, request.horizon_days)
+    result["method"] = request.method
+    result["seed"] = seed
+    result["chunks"] = len(chunks)
+    result["portfolio_value"] = round(inputs["total"], 2)
+    result["currency"] = inputs["currency"]
+    result["observations"] = len(portfolio_returns)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_quote(quote: dict) -> dict:
+    return {
+        "price": quote.get("price", 0),
+        "change": quote.get("change", 0),
+        "changePercent": quote.get("changePercent", 0)
+    }
+
+
+@router.get("/stream")
+async def stream_portfolio_prices(
+    request: Request,
+    symbols: str = Query(..., description="쉼표로 구분된 종목 심볼"),
+    current_user: Principal = Depends(get_current_user_stream)
+):
+    """
+    포트폴리오 시세 실시간 스트림 (Server-Sent Events)
+
+    연결 직후 현재 시세 전체를 `snapshot` 이벤트로 보내고, 이후에는 중앙 시세 폴러가
+    가격 변화를 감지한 종목만 `quotes` 이벤트로 보낸다. 업스트림 조회는 폴러가
+    고유 종목 단위로 한 번만 수행하므로 열린 탭 수와 무관하다.
+    구독은 로그인 사용자만 가능하며, 폴링 대상 종목 수가 상한에 도달하면 503을 반환한다.
+    """
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="조회할 종목을 입력하세요.")
+    if len(symbol_list) > settings.QUOTE_STREAM_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.QUOTE_STREAM_MAX_SYMBOLS}개 종목까지 구독할 수 있습니다."
+        )
+    invalid = [symbol for symbol in symbol_list if not SYMBOL_PATTERN.match(symbol)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"잘못된 종목 심볼: {', '.join(invalid[:10])}")
+    # 상한 초과는 스트림 시작 전에 거절해야 503으로 응답할 수 있음
+    try:
+        subscription = quote_poller.subscribe(symbol_list)
+    except QuotePollerFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def event_stream():
+        try:
+            quotes = await quote_poller.get_quotes(symbol_list, max_age=quote_poller.interval)
+            yield f"retry: {int(quote_poller.interval * 1000)}\n\n"
+            yield _sse_event("snapshot", {symbol: _stream_quote(quote) for symbol, quote in quotes.items()})
+            while not await request.is_disconnected():
+                updates = await subscription.next_update(timeout=settings.QUOTE_STREAM_HEARTBEAT)
+                if updates:
+                    yield _sse_event("quotes", {symbol: _stream_quote(quote) for symbol, quote in updates.items()})
+                else:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 라인 전송
+                    yield ": keep-alive\n\n"
+        finally:
+            quote_poller.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # 스트림이 시작되기 전에 연결이 끊겨도 구독이 남지 않도록 (unsubscribe는 중복 호출 무해)
+        background=BackgroundTask(quote_poller.unsubscribe, subscription),
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,58 @@
+"""
+스크리너 API - 서비스 대상 종목을 펀더멘털/기술적 조건으로 필터링
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel
+from app.services.analysis.fundamentals_index import fundamentals_index, NUMERIC_COLUMNS, TEXT_COLUMNS
+
+router = APIRouter()
+
+
+class ScreenerResponse(BaseModel):
+    """스크리너 응답"""
+    total: int
+    page: int
+    page_size: int
+    results: List[Dict[str, Any]]
+    built_at: Optional[float] = None
+    query_ms: float
+
+
+@router.get("/screener", response_model=ScreenerResponse)
+async def screen_stocks(
+    filter: List[str] = Query([], description="조건 (예: roe>15, per<20, sector=Technology) - 여러 개면 모두 만족"),
+    sort: Optional[str] = Query(None, description="정렬 컬럼 (예: -roe는 ROE 내림차순)"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    page_size: int = Query(50, ge=1, le=200, description="페이지당 종목 수")
+):
+    """
+    종목 스크리너
+    
+    매일 밤 구성되는 펀더멘털 인덱스에서 조건에 맞는 종목을 찾는다.
+    사용 가능한 컬럼은 /screener/fields 참고.
+    """
+    if not fundamentals_index.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="스크리너 인덱스를 준비 중입니다. 잠시 후 다시 시도해주세요."
+        )
+    try:
+        return fundamentals_index.query(filters=filter, sort=sort, page=page, page_size=page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/screener/fields")
+async def get_screener_fields():
+    """스크리너에서 사용할 수 있는 컬럼 목록"""
+    return {
+        "numeric": NUMERIC_COLUMNS,
+        "text": TEXT_COLUMNS,
+        "operators": {
+            "numeric": [">", ">=", "<", "<=", "=", "!="],
+            "text": ["=", "!="]
+        },
+        "symbols": len(fundamentals_index),
+        "built_at": fundamentals_index.built_at
+    }
@@ -3,8 +3,9 @@
 """
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from pydantic import BaseModel
+from app.core.cache import app_cache
 from app.services.scraper.fomc_scraper import FOMCScraper
 from app.services.scraper.fed_speech_scraper import FedSpeechScraper
 from app.services.ai.summarizer import AISummarizer
@@ -16,28 +17,6 @@ fomc_scraper = FOMCScraper()
 fed_speech_scraper = FedSpeechScraper()
 ai_summarizer = AISummarizer()
 
-# 간단한 메모리 캐시
-_cache = {}
-_cache_ttl = {}
-CACHE_DURATION = 3600 * 6  # 6시간 캐시 (더 자주 업데이트)
-
-
-def get_cached(key: str):
-    """캐시에서 데이터 조회"""
-    if key in _cache and key in _cache_ttl:
-        if datetime.now() < _cache_ttl[key]:
-            return _cache[key]
-        else:
-            del _cache[key]
-            del _cache_ttl[key]
-    return None
-
-
-def set_cached(key: str, value: Any):
-    """캐시에 데이터 저장"""
-    _cache[key] = value
-    _cache_ttl[key] = datetime.now() + timedelta(seconds=CACHE_DURATION)
-
 
 class SpeechItem(BaseModel):
     """연설/회의록 항목"""
@@ -90,7 +69,7 @@ async def get_fomc_meetings(
     try:
         cache_key = f"fomc_meetings_{limit}"
         if not force_refresh:
-            cached_data = get_cached(cache_key)
+            cached_data = await app_cache.get("speech", cache_key)
             if cached_data:
                 return SpeechListResponse(**cached_data)
         
@@ -130,7 +109,7 @@ async def get_fomc_meetings(
             updated_at=datetime.now().isoformat()
         )
         
-        set_cached(cache_key, result.model_dump())
+        await app_cache.set("speech", cache_key, result.model_dump())
         print(f"[Speech API] FOMC 회의록 {len(items)}개 조회 완료")
         return result
         
@@ -155,7 +134,7 @@ async def get_recent_speeches(
     try:
         cache_key = f"recent_speeches_{limit}"
         if not force_refresh:
-            cached_data = get_cached(cache_key)
+            cached_data = await app_cache.get("speech", cache_key)
             if cached_data:
                 return SpeechListResponse(**cached_data)
         
@@ -193,7 +172,7 @@ async def get_recent_speeches(
             updated_at=datetime.now().isoformat()
         )
         
-        set_cached(cache_key, result.model_dump())
+        await app_cache.set("speech", cache_key, result.model_dump())
         print(f"[Speech API] 연설문 {len(items)}개 조회 완료")
         return result
         
@@ -220,10 +199,9 @@ async def get_speech_summary(
     """
     try:
         cache_key = f"speech_summary_{speech_id}_{use_openai}"
-        cached_data = get_cached(cache_key)
+        cached_data = await app_cache.get("speech", cache_key)
         if cached_data:
-            cached_data['cached'] = True
-            return SpeechSummaryResponse(**cached_data)
+            return SpeechSummaryResponse(**{**cached_data, 'cached': True})
         
         print(f"[Speech API] 요약 요청: {speech_id}")
         
@@ -362,7 +340,7 @@ async def get_speech_summary(
             updated_at=datetime.now().isoformat()
         )
         
-        set_cached(cache_key, result.model_dump())
+        await app_cache.set("speech", cache_key, result.model_dump())
         print(f"[Speech API] 요약 완료: {title}")
         return result
         
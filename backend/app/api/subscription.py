@@ -2,14 +2,15 @@
 구독제 API - Polar.sh 연동
 """
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 from pydantic import BaseModel
-import httpx
-from app.core.database import get_db, SessionLocal
+from app.core.http import http_clients
+from app.core.database import AsyncSessionLocal
 from app.core.config import settings
 from app.api.deps import get_current_user, get_current_user_optional
+from app.core.principal import Principal, principal_cache
 from app.models.user import User
 from app.models.subscription import Subscription
 
@@ -58,41 +59,30 @@ class SubscriptionStatus(BaseModel):
 
 @router.get("/subscription/status", response_model=SubscriptionStatus)
 async def get_subscription_status(
-    current_user: User = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user_optional)
 ):
     """현재 구독 상태 조회"""
     if not current_user:
         return SubscriptionStatus(tier="free", is_active=False)
 
-    try:
-        subscription = db.query(Subscription).filter(
-            Subscription.user_id == current_user.id
-        ).first()
-
-        if not subscription:
-            return SubscriptionStatus(tier="free", is_active=False)
-
-        return SubscriptionStatus(
-            tier=subscription.tier,
-            is_active=subscription.is_active,
-            current_period_end=subscription.current_period_end.isoformat() if subscription.current_period_end else None,
-            polar_subscription_id=subscription.toss_payment_id # Reusing field for simplicity
-        )
-    except Exception as e:
-        print(f"[Subscription Status Error] {e}")
-        return SubscriptionStatus(tier="free", is_active=False)
+    # 구독 상태는 인증 주체 캐시에 함께 담겨 있음 (웹훅 처리 시 무효화)
+    return SubscriptionStatus(
+        tier=current_user.tier,
+        is_active=current_user.subscription_active,
+        current_period_end=current_user.current_period_end,
+        polar_subscription_id=current_user.polar_subscription_id # Reusing field for simplicity
+    )
 
 @router.post("/subscription/checkout")
 async def create_checkout_session(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Polar.sh 체크아웃 세션 URL 생성"""
     if not settings.POLAR_API_KEY or not settings.POLAR_PRODUCT_ID:
         raise HTTPException(status_code=503, detail="Polar settings missing")
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_clients.session() as client:
             # Polar Custom Checkout API
             response = await client.post(
                 f"{POLAR_API_URL}/checkouts/custom",
@@ -144,33 +134,43 @@ async def handle_polar_subscription(sub_data: Dict[str, Any]):
     user_id_str = sub_data.get("metadata", {}).get("user_id")
     if not user_id_str:
         return
-
-    db = SessionLocal()
     try:
-        # User lookup and update
-        subscription = db.query(Subscription).filter(Subscription.user_id == user_id_str).first()
-        is_active = sub_data.get("status") == "active"
-        
-        if subscription:
-            subscription.tier = "premium" if is_active else "free"
-            subscription.is_active = is_active
-            subscription.toss_payment_id = sub_data.get("id")
-        else:
-            subscription = Subscription(
-                user_id=user_id_str,
-                tier="premium" if is_active else "free",
-                is_active=is_active,
-                toss_payment_id=sub_data.get("id")
-            )
-            db.add(subscription)
-            
-        user = db.query(User).filter(User.id == user_id_str).first()
-        if user:
-            user.subscription_tier = "premium" if is_active else "free"
+        # asyncpg는 문자열을 정수 컬럼과 비교하지 않으므로 미리 변환
+        user_id = int(user_id_str)
+    except (TypeError, ValueError):
+        print(f"[Sync Error] invalid user_id: {user_id_str}")
+        return
+    if AsyncSessionLocal is None:
+        print("[Sync Error] 데이터베이스가 초기화되지 않았습니다.")
+        return
+
+    async with AsyncSessionLocal() as db:
+        try:
+            # User lookup and update
+            subscription = await db.scalar(select(Subscription).where(Subscription.user_id == user_id))
+            is_active = sub_data.get("status") == "active"
             
-        db.commit()
-    except Exception as e:
-        print(f"[Sync Error] {e}")
-        db.rollback()
-    finally:
-        db.close()
+            if subscription:
+                subscription.tier = "premium" if is_active else "free"
+                subscription.is_active = is_active
+                subscription.toss_payment_id = sub_data.get("id")
+            else:
+                subscription = Subscription(
+                    user_id=user_id,
+                    tier="premium" if is_active else "free",
+                    is_active=is_active,
+                    toss_payment_id=sub_data.get("id")
+                )
+                db.add(subscription)
+                
+            user = await db.scalar(select(User).where(User.id == user_id))
+            if user:
+                user.subscription_tier = "premium" if is_active else "free"
+                
+            await db.commit()
+        except Exception as e:
+            print(f"[Sync Error] {e}")
+            await db.rollback()
+            return
+    # 등급/권한이 바뀌었으므로 캐시된 인증 주체를 지움
+    await principal_cache.invalidate_user(user_id)
@@ -1,107 +1,357 @@
 """
 Caching utilities
 """
-import json
-import redis
-from typing import Optional, Any
+import asyncio
+import time
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Optional, Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.core.codecs import CacheCodec, CodecError
 from app.core.config import settings
+from app.core.redis_backend import RedisBackend, RedisUnavailable, redis_backend
 from functools import wraps
 import hashlib
 
 
-class CacheManager:
-    """캐시 관리자"""
+class TTLCache:
+    """
+    크기 제한(LRU) + TTL 인메모리 캐시 (스레드 안전)
     
-    def __init__(self):
+    스레드 풀(yfinance 게이트웨이)과 이벤트 루프 양쪽에서 접근하므로 Lock으로 보호한다.
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시에서 값 가져오기 (만료된 항목은 제거 후 miss 처리)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """캐시에 값 저장 (ttl 미지정 시 기본 TTL 사용)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key: Hashable) -> bool:
+        """캐시에서 값 삭제"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+    
+    def clear(self) -> None:
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        """hit/miss 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredCache:
+    """
+    2단계 캐시: 프로세스 내 L1(LRU + TTL) → Redis L2
+
+    - 키는 "{CACHE_KEY_PREFIX}:{namespace}:{key}" 형태로 네임스페이스를 나눈다.
+    - TTL은 네임스페이스별 설정(CACHE_NAMESPACE_TTLS)을 따르고, set()에서 항목별로 줄일 수 있다.
+    - L1은 워커마다 따로 있으므로 CACHE_L1_MAX_TTL 이상 머무르지 않게 해 다른 워커의
+      갱신/무효화가 늦어도 그 안에 반영되게 한다. L2(Redis)는 워커 간에 공유되고 재시작 후에도 남는다.
+    - 값은 CacheCodec(설치된 orjson/msgpack + 큰 값은 zstd/lz4 압축)으로 인코딩해 저장한다.
+      L2에서 읽은 값은 dict/list 등 JSON 호환 타입이다.
+    - L2는 서킷 브레이커가 있는 RedisBackend(redis.asyncio)를 거친다. 서킷이 열려 있으면
+      네트워크 대기 없이 L1만 사용하고, 이때 L1에는 항목 TTL 전체를 보관한다
+      (L1은 CACHE_L1_MAX_SIZE로 크기가 제한된 LRU).
+    - get_or_refresh()는 soft/hard TTL로 stale-while-revalidate를 제공한다.
+    """
+    
+    def __init__(self, backend: Optional[RedisBackend] = None, codec: Optional[CacheCodec] = None):
+        self.prefix = settings.CACHE_KEY_PREFIX
+        self.codec = codec or CacheCodec()
+        self.l1 = TTLCache(maxsize=settings.CACHE_L1_MAX_SIZE, ttl=settings.CACHE_L1_MAX_TTL)
+        self.l2 = backend or redis_backend
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"l1_hits": 0, "l2_hits": 0, "misses": 0, "sets": 0, "deletes": 0}
+        )
+        self.l2_errors = 0
+        self.codec_errors = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._swr: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"stale_served": 0, "refreshes": 0, "refresh_failures": 0, "refresh_skipped": 0}
+        )
+    
+    def ttl(self, namespace: str) -> int:
+        """네임스페이스 TTL (초)"""
+        return settings.CACHE_NAMESPACE_TTLS.get(namespace, settings.CACHE_DEFAULT_TTL)
+    
+    def _key(self, namespace: str, key: Any) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+    
+    async def _l2(self, command: Callable[[Any], Awaitable[Any]]) -> Tuple[bool, Any]:
+        """L2 명령 실행 → (성공 여부, 결과). 실패는 서킷 브레이커가 기록하고 여기서는 삼킨다"""
         try:
-            self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-            self.redis_available = True
-        except Exception as e:
-            print(f"[Cache] Redis not available: {e}")
-            self.redis_client = None
-            self.redis_available = False
-            # 인메모리 캐시로 폴백
-            self.memory_cache = {}
-    
-    def get(self, key: str) -> Optional[Any]:
-        """캐시에서 값 가져오기"""
-        if self.redis_available and self.redis_client:
+            return True, await self.l2.execute(command)
+        except RedisUnavailable:
+            return False, None
+        except Exception:
+            self.l2_errors += 1
+            return False, None
+    
+    async def get(self, namespace: str, key: Any) -> Optional[Any]:
+        """L1 → L2 순으로 조회 (L2 적중 시 L1에 채움)"""
+        full_key = self._key(namespace, key)
+        counters = self._counters[namespace]
+        value = self.l1.get(full_key)
+        if value is not None:
+            counters["l1_hits"] += 1
+            return value
+        
+        ok, result = await self._l2(lambda client: self._l2_get(client, full_key))
+        if ok and result[0] is not None:
+            raw, remaining = result
             try:
-                value = self.redis_client.get(key)
-                if value:
-                    return json.loads(value)
-            except Exception as e:
-                print(f"[Cache] Error getting key {key}: {e}")
-        else:
-            # 인메모리 캐시
-            return self.memory_cache.get(key)
+                value = self.codec.decode(raw)
+            except CodecError as e:
+                # 다른 워커가 이 워커에 없는 코덱으로 저장한 값 등은 미스로 처리
+                self.codec_errors += 1
+                print(f"[Cache] {full_key} 디코딩 실패: {e}")
+            else:
+                counters["l2_hits"] += 1
+                self.l1.set(full_key, value, ttl=min(remaining, settings.CACHE_L1_MAX_TTL))
+                return value
+        counters["misses"] += 1
         return None
     
-    def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """캐시에 값 저장"""
-        try:
-            serialized = json.dumps(value)
-            if self.redis_available and self.redis_client:
-                self.redis_client.setex(key, ttl, serialized)
-            else:
-                # 인메모리 캐시 (TTL은 간단하게 구현)
-                self.memory_cache[key] = value
-            return True
-        except Exception as e:
-            print(f"[Cache] Error setting key {key}: {e}")
-            return False
-    
-    def delete(self, key: str) -> bool:
-        """캐시에서 값 삭제"""
+    @staticmethod
+    async def _l2_get(client, full_key: str) -> Tuple[Optional[bytes], float]:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.get(full_key)
+            pipe.pttl(full_key)
+            raw, pttl = await pipe.execute()
+        return raw, (pttl / 1000 if pttl and pttl > 0 else settings.CACHE_L1_MAX_TTL)
+    
+    async def set(self, namespace: str, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """L1과 L2에 저장 (ttl 미지정 시 네임스페이스 TTL)"""
+        if value is None:
+            return
+        full_key = self._key(namespace, key)
+        ttl = self.ttl(namespace) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._counters[namespace]["sets"] += 1
+        payload = self.codec.encode(value)
+        stored, _ = await self._l2(lambda client: client.set(full_key, payload, ex=max(1, int(ttl))))
+        # L2에서 다시 읽은 값과 같은 형태가 되도록 인코딩 왕복한 값을 L1에 저장.
+        # L2에 저장했으면 L1은 워커 간 일관성을 위해 짧게, 못 했으면 L1이 TTL 전체를 맡음
+        self.l1.set(full_key, self.codec.decode(payload), ttl=min(ttl, settings.CACHE_L1_MAX_TTL) if stored else ttl)
+    
+    async def delete(self, namespace: str, key: Any) -> None:
+        """L1과 L2에서 삭제"""
+        full_key = self._key(namespace, key)
+        self._counters[namespace]["deletes"] += 1
+        self.l1.delete(full_key)
+        await self._l2(lambda client: client.delete(full_key))
+    
+    def soft_ttl(self, namespace: str) -> int:
+        """네임스페이스 soft TTL (초, 이후엔 stale 값을 주고 백그라운드 갱신)"""
+        return settings.CACHE_NAMESPACE_SOFT_TTLS.get(namespace, self.ttl(namespace))
+    
+    async def get_or_refresh(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], Awaitable[Any]],
+        soft_ttl: Optional[float] = None,
+        hard_ttl: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        stale-while-revalidate 조회
+        
+        항목은 {"value", "fresh_until"} 형태로 hard TTL 동안 저장된다.
+        - soft TTL 이내: 캐시 값을 그대로 반환
+        - soft TTL 경과 ~ hard TTL 이내: stale 값을 바로 반환하고 백그라운드 갱신을 한 번만 예약
+        - hard TTL 경과(캐시 없음): 같은 키의 갱신 하나를 모든 호출자가 함께 기다림
+        
+        갱신은 키별로 프로세스 안에서 하나만 실행되고, Redis가 있으면 백그라운드 갱신은
+        SET NX 잠금으로 워커 간에도 하나만 실행된다. loader가 예외를 내거나 None을 반환하면
+        저장하지 않는다 (백그라운드 갱신 실패 시 stale 값을 hard TTL까지 계속 제공).
+        
+        Returns:
+            (값, 캐시에서 제공했는지 여부)
+        """
+        soft = self.soft_ttl(namespace) if soft_ttl is None else soft_ttl
+        hard = self.ttl(namespace) if hard_ttl is None else hard_ttl
+        entry = await self.get(namespace, key)
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            if time.time() >= entry["fresh_until"]:
+                self._swr[namespace]["stale_served"] += 1
+                self._refresh(namespace, key, loader, soft, hard, background=True)
+            return entry["value"], True
+        
+        value = await asyncio.shield(self._refresh(namespace, key, loader, soft, hard, background=False))
+        if value is None:
+            # 합류한 백그라운드 갱신이 다른 워커의 잠금으로 건너뛴 경우 그 워커가 저장한 값을 사용
+            entry = await self.get(namespace, key)
+            if isinstance(entry, dict) and "fresh_until" in entry:
+                return entry["value"], True
+        return value, False
+    
+    def _refresh(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], Awaitable[Any]],
+        soft: float,
+        hard: float,
+        background: bool
+    ) -> "asyncio.Task":
+        """키별 갱신 작업 (이미 실행 중이면 그 작업을 반환)"""
+        full_key = self._key(namespace, key)
+        task = self._refreshing.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_and_store(namespace, key, loader, soft, hard, background))
+            self._refreshing[full_key] = task
+            task.add_done_callback(lambda done: self._refresh_done(full_key, done))
+        return task
+    
+    def _refresh_done(self, full_key: str, task: "asyncio.Task") -> None:
+        self._refreshing.pop(full_key, None)
+        # 기다리는 호출자가 없는 백그라운드 갱신의 예외도 여기서 회수해 경고가 남지 않게 함
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[Cache] {full_key} 갱신 실패: {task.exception()}")
+    
+    async def _load_and_store(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], Awaitable[Any]],
+        soft: float,
+        hard: float,
+        background: bool
+    ) -> Any:
+        counters = self._swr[namespace]
+        lock_key = self._key("lock", self._key(namespace, key))
+        locked = False
+        if background:
+            ok, locked = await self._l2(
+                lambda client: client.set(lock_key, "1", nx=True, ex=settings.CACHE_REFRESH_LOCK_TTL)
+            )
+            if ok and not locked:
+                # 다른 워커가 갱신 중 - stale 값을 계속 제공
+                counters["refresh_skipped"] += 1
+                return None
+        
+        counters["refreshes"] += 1
         try:
-            if self.redis_available and self.redis_client:
-                self.redis_client.delete(key)
-            else:
-                self.memory_cache.pop(key, None)
-            return True
-        except Exception as e:
-            print(f"[Cache] Error deleting key {key}: {e}")
-            return False
-    
-    def generate_key(self, prefix: str, *args, **kwargs) -> str:
-        """캐시 키 생성"""
-        key_parts = [prefix]
-        key_parts.extend(str(arg) for arg in args)
+            value = await loader()
+        except Exception:
+            counters["refresh_failures"] += 1
+            raise
+        finally:
+            if locked:
+                await self._l2(lambda client: client.delete(lock_key))
+        
+        if value is not None:
+            await self.set(namespace, key, {"value": value, "fresh_until": time.time() + soft}, ttl=hard)
+        return value
+    
+    def generate_key(self, *args, **kwargs) -> str:
+        """인자 조합으로 캐시 키 생성"""
+        key_parts = [str(arg) for arg in args]
         key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
         key_string = ":".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
+    
+    def stats(self) -> Dict[str, Any]:
+        """L1 통계 + 네임스페이스별 적중/미스"""
+        namespaces = {}
+        for namespace, counters in self._counters.items():
+            lookups = counters["l1_hits"] + counters["l2_hits"] + counters["misses"]
+            hits = counters["l1_hits"] + counters["l2_hits"]
+            namespaces[namespace] = {
+                **counters,
+                **(self._swr[namespace] if namespace in self._swr else {}),
+                "ttl_seconds": self.ttl(namespace),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+        return {
+            "l1": self.l1.stats(),
+            "codec": self.codec.stats(),
+            "l2": {
+                "enabled": self.l2.enabled,
+                "available": self.l2.available,
+                "circuit": self.l2.breaker.state,
+                "errors": self.l2_errors,
+                "codec_errors": self.codec_errors,
+            },
+            "refreshing": len(self._refreshing),
+            "namespaces": namespaces,
+        }
 
 
 # 전역 캐시 인스턴스
-cache_manager = CacheManager()
+app_cache = TieredCache()
 
 
-def cached(ttl: int = 3600, prefix: str = "cache"):
-    """함수 결과 캐싱 데코레이터"""
+def cached(namespace: str, ttl: Optional[float] = None, key: Optional[Callable[..., Any]] = None):
+    """
+    async 함수 결과 캐싱 데코레이터
+    
+    Args:
+        namespace: 캐시 네임스페이스
+        ttl: 항목 TTL (미지정 시 네임스페이스 TTL)
+        key: 인자 → 캐시 키 함수 (미지정 시 함수 이름과 인자로 생성)
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # 캐시 키 생성
-            cache_key = cache_manager.generate_key(
-                prefix,
-                func.__name__,
-                *args,
-                **kwargs
-            )
+            cache_key = key(*args, **kwargs) if key else app_cache.generate_key(func.__qualname__, *args, **kwargs)
             
-            # 캐시에서 확인
-            cached_value = cache_manager.get(cache_key)
+            cached_value = await app_cache.get(namespace, cache_key)
             if cached_value is not None:
                 return cached_value
             
-            # 함수 실행
             result = await func(*args, **kwargs)
-            
-            # 결과 캐싱
             if result is not None:
-                cache_manager.set(cache_key, result, ttl)
+                await app_cache.set(namespace, cache_key, result, ttl)
             
             return result
         return wrapper
     return decorator
-
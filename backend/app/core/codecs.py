@@ -0,0 +1,217 @@
+"""
+캐시 값 코덱 - 직렬화(json/orjson/msgpack) + 크기 기준 압축(zstd/lz4/zlib)
+
+L2에 저장하는 바이트는 5바이트 헤더로 시작한다:
+
+    b"SN" + 헤더 버전(1) + 직렬화 ID(1) + 압축 ID(1) + 본문
+
+헤더로 형식을 판별하므로 설정을 바꿔도 이전 형식의 값을 그대로 읽을 수 있고
+(여러 워커가 서로 다른 코덱으로 써도 공존), 헤더가 없는 값은 이전 버전이 저장한
+평문 JSON으로 읽는다.
+"""
+import json
+import time
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+MAGIC = b"SN"
+HEADER_VERSION = 1
+HEADER_SIZE = 5
+
+
+class CodecError(Exception):
+    """값을 해석할 수 없음 (알 수 없는 헤더, 이 워커에 없는 코덱 등)"""
+
+
+def _json_default(value: Any) -> Any:
+    """직렬화기가 모르는 값 변환 (datetime → ISO 문자열, NumPy 배열/스칼라 → 파이썬 값)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # tolist를 먼저 본다: 배열의 item()은 원소가 하나가 아니면 ValueError (스칼라의 tolist는 파이썬 값)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_json_default, use_bin_type=True, datetime=False)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+# ID → (이름, 인코더, 디코더, 사용 가능 여부). ID는 저장된 값의 헤더에 남으므로 바꾸지 않는다.
+SERIALIZERS: Dict[int, Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any], bool]] = {
+    1: ("json", _json_dumps, json.loads, True),
+    2: ("orjson", _orjson_dumps, lambda data: orjson.loads(data), orjson is not None),
+    3: ("msgpack", _msgpack_dumps, _msgpack_loads, msgpack is not None),
+}
+
+COMPRESSORS: Dict[int, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes], bool]] = {
+    0: ("none", lambda data: data, lambda data: data, True),
+    1: (
+        "zstd",
+        lambda data: zstandard.ZstdCompressor(level=settings.CACHE_COMPRESSION_LEVEL).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+        zstandard is not None,
+    ),
+    2: (
+        "lz4",
+        lambda data: lz4_frame.compress(data),
+        lambda data: lz4_frame.decompress(data),
+        lz4_frame is not None,
+    ),
+    3: (
+        "zlib",
+        lambda data: zlib.compress(data, min(max(settings.CACHE_COMPRESSION_LEVEL, 1), 9)),
+        zlib.decompress,
+        True,
+    ),
+}
+
+# "auto"일 때 설치된 것 중 앞쪽부터 사용
+_SERIALIZER_PREFERENCE = ("orjson", "msgpack", "json")
+_COMPRESSOR_PREFERENCE = ("zstd", "lz4", "none")
+
+
+def _resolve(table: Dict[int, Tuple], name: str, preference: Tuple[str, ...]) -> int:
+    by_name = {entry[0]: (codec_id, entry[3]) for codec_id, entry in table.items()}
+    if name != "auto":
+        codec_id, available = by_name.get(name, (None, False))
+        if codec_id is not None and available:
+            return codec_id
+        print(f"[Cache] 코덱 {name} 사용 불가, 자동 선택으로 대체")
+    for candidate in preference:
+        codec_id, available = by_name[candidate]
+        if available:
+            return codec_id
+    return next(iter(table))
+
+
+class CacheCodec:
+    """
+    캐시 값 인코더/디코더
+
+    인코딩은 설정된 직렬화기 하나로 하고, 결과가 compress_threshold 바이트 이상이면
+    압축한다 (압축 후 오히려 커지면 원본 유지). 디코딩은 헤더에 적힌 형식을 따른다.
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_threshold: Optional[int] = None
+    ):
+        self.serializer_id = _resolve(SERIALIZERS, serializer or settings.CACHE_SERIALIZER, _SERIALIZER_PREFERENCE)
+        self.compressor_id = _resolve(COMPRESSORS, compression or settings.CACHE_COMPRESSION, _COMPRESSOR_PREFERENCE)
+        self.compress_threshold = (
+            settings.CACHE_COMPRESSION_THRESHOLD if compress_threshold is None else compress_threshold
+        )
+        self.encoded = 0
+        self.decoded = 0
+        self.compressed = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.encode_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.legacy_reads = 0
+
+    @property
+    def name(self) -> str:
+        return f"{SERIALIZERS[self.serializer_id][0]}+{COMPRESSORS[self.compressor_id][0]}"
+
+    def encode(self, value: Any) -> bytes:
+        started = time.perf_counter()
+        body = SERIALIZERS[self.serializer_id][1](value)
+        raw_size = len(body)
+        compressor_id = 0
+        if self.compressor_id and raw_size >= self.compress_threshold:
+            packed = COMPRESSORS[self.compressor_id][1](body)
+            if len(packed) < raw_size:
+                body, compressor_id = packed, self.compressor_id
+                self.compressed += 1
+        payload = MAGIC + bytes((HEADER_VERSION, self.serializer_id, compressor_id)) + body
+        self.encoded += 1
+        self.raw_bytes += raw_size
+        self.stored_bytes += len(payload)
+        self.encode_seconds += time.perf_counter() - started
+        return payload
+
+    def decode(self, payload: Any) -> Any:
+        """
+        저장된 값 해석
+
+        Raises:
+            CodecError: 헤더 버전이나 코덱을 모르거나 이 워커에 설치되지 않음, 본문 손상
+        """
+        started = time.perf_counter()
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        try:
+            if not payload.startswith(MAGIC):
+                # 헤더 도입 전 평문 JSON
+                self.legacy_reads += 1
+                return json.loads(payload)
+            version, serializer_id, compressor_id = payload[2], payload[3], payload[4]
+            if version != HEADER_VERSION or serializer_id not in SERIALIZERS or compressor_id not in COMPRESSORS:
+                raise CodecError(f"unknown header {payload[:HEADER_SIZE]!r}")
+            serializer = SERIALIZERS[serializer_id]
+            compressor = COMPRESSORS[compressor_id]
+            if not serializer[3] or not compressor[3]:
+                raise CodecError(f"codec not installed: {serializer[0]}+{compressor[0]}")
+            return serializer[2](compressor[2](payload[HEADER_SIZE:]))
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"{type(e).__name__}: {e}") from e
+        finally:
+            self.decoded += 1
+            self.decode_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "codec": self.name,
+            "compress_threshold": self.compress_threshold,
+            "encoded": self.encoded,
+            "decoded": self.decoded,
+            "compressed": self.compressed,
+            "legacy_reads": self.legacy_reads,
+            "compression_ratio": round(self.stored_bytes / self.raw_bytes, 4) if self.raw_bytes else None,
+            "avg_encode_ms": round(self.encode_seconds / self.encoded * 1000, 3) if self.encoded else None,
+            "avg_decode_ms": round(self.decode_seconds / self.decoded * 1000, 3) if self.decoded else None,
+        }
@@ -1,7 +1,10 @@
 """
 Database Configuration
 """
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
@@ -16,6 +19,10 @@ try:
     engine = create_engine(
         settings.DATABASE_URL,
         pool_pre_ping=True,  # 연결이 끊어졌는지 확인
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
         echo=False
     )
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -26,6 +33,43 @@ except Exception as e:
     engine = None
     SessionLocal = None
 
+
+def async_database_url(url: str):
+    """동기 DATABASE_URL → asyncpg 드라이버 URL (준비된 문장 캐시 크기 포함)"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2", "postgres"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    if parsed.drivername == "postgresql+asyncpg":
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    return parsed
+
+
+# 요청 처리용 비동기 엔진 (쿼리 대기 중에도 이벤트 루프가 다른 요청을 처리)
+# 동기 엔진은 Alembic, 관리 스크립트, 아직 옮기지 않은 코드에서 사용
+try:
+    _async_url = async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        _async_url,
+        # asyncpg 자체 문장 캐시도 같은 크기로 (0이면 PgBouncer transaction 모드 호환)
+        connect_args=(
+            {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+            if _async_url.drivername == "postgresql+asyncpg" else {}
+        ),
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=False
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except Exception as e:
+    logger.warning(f"⚠️ 비동기 데이터베이스 엔진 초기화 실패 (asyncpg 설치 여부 확인): {e}")
+    async_engine = None
+    AsyncSessionLocal = None
+
 Base = declarative_base()
 
 
@@ -50,3 +94,34 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting async database session"""
+    if AsyncSessionLocal is None:
+        raise Exception("데이터베이스가 초기화되지 않았습니다. PostgreSQL 서버가 실행 중인지 확인하세요.")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """커넥션 풀 종료 (lifespan 종료 시 호출)"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
+def pool_stats() -> dict:
+    """커넥션 풀 상태"""
+    stats = {}
+    for name, target in (("async", async_engine and async_engine.sync_engine), ("sync", engine)):
+        if target is None:
+            continue
+        pool = target.pool
+        stats[name] = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        }
+    return stats
@@ -0,0 +1,77 @@
+"""
+CPU 작업용 프로세스 풀 - 점수/리스크/시뮬레이션 계산을 이벤트 루프와 GIL 밖에서 실행
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+
+class CPUPool:
+    """
+    지연 생성되는 ProcessPoolExecutor 래퍼
+
+    워커는 spawn 방식으로 띄운다. fork는 게이트웨이 스레드와 이벤트 루프 상태까지
+    복제하므로 안전하지 않고, Windows 개발 환경과 동작도 같아진다.
+    넘기는 함수는 모듈 최상위 함수여야 하고 인자/반환값은 pickle 가능해야 한다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_workers = max_workers or settings.CPU_POOL_WORKERS or min(4, os.cpu_count() or 1)
+        self.timeout = timeout or settings.CPU_POOL_TIMEOUT
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.tasks = 0
+        self.failures = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (최초 사용 시 생성)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        함수를 워커 프로세스에서 실행
+
+        Raises:
+            asyncio.TimeoutError: 데드라인 초과 시
+        """
+        loop = asyncio.get_running_loop()
+        self.tasks += 1
+        try:
+            future = loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+            return await asyncio.wait_for(future, timeout=timeout or self.timeout)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되면 풀을 버리고 다음 호출에서 새로 만든다
+            self.failures += 1
+            self._executor = None
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+
+    def shutdown(self):
+        """프로세스 풀 종료 (lifespan 종료 시 호출)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "tasks": self.tasks,
+            "failures": self.failures,
+        }
+
+
+# 전역 CPU 풀 인스턴스
+cpu_pool = CPUPool()
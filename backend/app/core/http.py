@@ -0,0 +1,163 @@
+"""
+업스트림 HTTP 클라이언트 레지스트리 - 호스트별 커넥션 풀을 애플리케이션 전체가 공유
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401 - httpx[http2] 설치 여부 확인용
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 같은 요청을 다시 보내도 안전한 메서드만 재시도
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+_RETRY_STATUS = {502, 503, 504}
+
+
+class HTTPSession:
+    """
+    레지스트리 위의 가벼운 요청 뷰
+
+    `async with http_clients.session(timeout=30.0) as client:` 형태로 쓰며, 기존
+    `httpx.AsyncClient` 블록과 같은 get/post/request 인터페이스를 제공한다.
+    블록을 벗어나도 커넥션은 닫지 않고 호스트별 풀에 남겨 다음 요청이 재사용한다.
+    """
+
+    def __init__(self, registry: "HTTPClientRegistry", timeout: Optional[float], follow_redirects: bool):
+        self._registry = registry
+        self._timeout = timeout
+        self._follow_redirects = follow_redirects
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        kwargs.setdefault("follow_redirects", self._follow_redirects)
+        return await self._registry.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+
+class HTTPClientRegistry:
+    """
+    호스트(scheme + host + port)별 httpx.AsyncClient 레지스트리
+
+    - 호스트마다 커넥션 수 제한과 keep-alive 풀을 따로 두어 한 업스트림이 느려져도
+      다른 업스트림의 커넥션을 잠식하지 않는다.
+    - h2 패키지가 있으면 HTTP/2로 연결해 한 커넥션에서 요청을 다중화한다.
+    - 연결 실패는 transport 수준에서 HTTP_CONNECT_RETRIES번 재시도하고, 멱등 메서드는
+      끊긴 keep-alive 커넥션(RemoteProtocolError)이나 502/503/504 응답도 HTTP_RETRIES번까지
+      지수 백오프로 재시도한다. 타임아웃은 재시도하지 않는다 (호출자 대기 시간이 배로 늘어나므로).
+
+    lifespan 시작 시 start(), 종료 시 aclose()를 호출한다. 클라이언트는 호스트를 처음
+    요청할 때 만든다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._started = False
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._by_host: Dict[str, int] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def _create(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=limits,
+            retries=settings.HTTP_CONNECT_RETRIES
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+        )
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """URL 호스트의 공유 클라이언트 (없으면 생성)"""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._create()
+            self._clients[origin] = client
+        return client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """호스트 클라이언트로 요청 (멱등 메서드는 재시도 정책 적용)"""
+        method = method.upper()
+        origin = self._origin(url)
+        client = self.client(url)
+        attempts = 1 + (settings.HTTP_RETRIES if method in _IDEMPOTENT_METHODS else 0)
+        self.requests += 1
+        self._by_host[origin] = self._by_host.get(origin, 0) + 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.RemoteProtocolError:
+                if last:
+                    self.failures += 1
+                    raise
+            except httpx.HTTPError:
+                self.failures += 1
+                raise
+            else:
+                if response.status_code not in _RETRY_STATUS or last:
+                    return response
+                await response.aclose()
+            self.retries += 1
+            await asyncio.sleep(settings.HTTP_RETRY_BACKOFF * (2 ** attempt))
+
+    @asynccontextmanager
+    async def session(
+        self,
+        timeout: Optional[float] = None,
+        follow_redirects: bool = False
+    ) -> AsyncIterator[HTTPSession]:
+        """요청 뷰 (인자는 httpx.AsyncClient와 같은 의미, timeout 미지정 시 HTTP_TIMEOUT)"""
+        yield HTTPSession(self, timeout, follow_redirects)
+
+    def start(self) -> None:
+        """lifespan 시작 시 호출"""
+        self._started = True
+        print(f"[HTTP] 공유 클라이언트 레지스트리 시작 (HTTP/2: {'사용' if HTTP2_AVAILABLE else '미사용'})")
+
+    async def aclose(self) -> None:
+        """모든 호스트 커넥션 종료 (lifespan 종료 시 호출)"""
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._started = False
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self._started,
+            "http2": HTTP2_AVAILABLE,
+            "hosts": len(self._clients),
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "by_host": dict(self._by_host),
+        }
+
+
+# 전역 HTTP 클라이언트 레지스트리
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,197 @@
+"""
+인증 주체 캐시 - 요청마다 users/subscriptions를 조회하지 않도록 사용자/등급/권한을 캐시
+"""
+from typing import Any, Dict, Optional
+from app.core.cache import app_cache
+from app.core.config import settings
+from app.core.singleflight import singleflight
+
+NAMESPACE = "principal"
+# 사용자별로 기억해 둘 최근 토큰 iat 수 (무효화 시 함께 지움)
+INDEX_SIZE = 20
+
+
+def entitlements_for(tier: str) -> Dict[str, Any]:
+    """등급별 권한"""
+    premium = tier == "premium"
+    return {
+        "max_portfolio_items": None if premium else settings.FREE_PORTFOLIO_LIMIT,
+    }
+
+
+class Principal:
+    """
+    인증된 요청의 주체 (엔드포인트에서 User 대신 사용)
+
+    엔드포인트가 쓰는 User 속성(id, email, full_name, is_active, subscription_tier)을
+    그대로 제공하고, 구독 상태와 권한을 함께 담아 추가 조회가 필요 없게 한다.
+    """
+
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        full_name: Optional[str],
+        is_active: bool,
+        subscription_tier: str,
+        tier: str,
+        subscription_active: bool,
+        current_period_end: Optional[str] = None,
+        polar_subscription_id: Optional[str] = None
+    ):
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.is_active = is_active
+        self.subscription_tier = subscription_tier
+        self.tier = tier
+        self.subscription_active = subscription_active
+        self.current_period_end = current_period_end
+        self.polar_subscription_id = polar_subscription_id
+        self.entitlements = entitlements_for(tier)
+
+    @property
+    def is_premium(self) -> bool:
+        return self.tier == "premium"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "full_name": self.full_name,
+            "is_active": self.is_active,
+            "subscription_tier": self.subscription_tier,
+            "tier": self.tier,
+            "subscription_active": self.subscription_active,
+            "current_period_end": self.current_period_end,
+            "polar_subscription_id": self.polar_subscription_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Principal":
+        return cls(**data)
+
+
+async def _load_principal(user_id: int) -> Optional[Dict[str, Any]]:
+    """users + subscriptions 한 번의 조인 조회 (캐시 미스 시에만)"""
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal
+    from app.models.subscription import Subscription
+    from app.models.user import User
+
+    if AsyncSessionLocal is None:
+        return None
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User, Subscription)
+            .outerjoin(Subscription, Subscription.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        row = result.first()
+    if row is None:
+        return None
+    user, subscription = row
+    subscription_active = bool(subscription and subscription.is_active)
+    tier = "premium" if subscription_active and subscription.tier == "premium" else "free"
+    user_tier = user.subscription_tier
+    return Principal(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=bool(user.is_active),
+        subscription_tier=getattr(user_tier, "value", user_tier) or "free",
+        tier=tier,
+        subscription_active=subscription_active,
+        current_period_end=(
+            subscription.current_period_end.isoformat()
+            if subscription and subscription.current_period_end else None
+        ),
+        polar_subscription_id=subscription.toss_payment_id if subscription else None,
+    ).to_dict()
+
+
+class PrincipalCache:
+    """
+    토큰 (sub, iat) → Principal 캐시
+
+    같은 토큰의 요청은 TieredCache 조회 한 번으로 끝나고, 캐시 미스일 때만 조인 조회
+    한 번을 한다 (같은 사용자의 동시 미스는 singleflight로 합침). 구독 웹훅과 로그인에서
+    invalidate_user()로 사용자의 모든 토큰 항목을 지운다. 다른 워커의 L1에는 최대
+    CACHE_L1_MAX_TTL 동안 이전 값이 남을 수 있다.
+    """
+
+    def __init__(self):
+        self.loads = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _subject(payload: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(payload.get("sub"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _key(user_id: int, payload: Dict[str, Any]) -> str:
+        return f"{user_id}:{payload.get('iat', 0)}"
+
+    async def get(self, payload: Dict[str, Any], load: bool = True) -> Optional[Principal]:
+        """
+        검증된 토큰 페이로드의 주체
+
+        Args:
+            load: False면 캐시만 조회 (DB를 건드리면 안 되는 rate limiter 등)
+        """
+        user_id = self._subject(payload)
+        if user_id is None:
+            return None
+        key = self._key(user_id, payload)
+        cached = await app_cache.get(NAMESPACE, key)
+        if cached is not None:
+            return Principal.from_dict(cached)
+        if not load:
+            return None
+
+        data = await singleflight.do(("Principal", "load", user_id), lambda: self._load(user_id))
+        if data is None:
+            return None
+        await app_cache.set(NAMESPACE, key, data)
+        await self._remember(user_id, payload.get("iat", 0))
+        return Principal.from_dict(data)
+
+    async def _load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        self.loads += 1
+        return await _load_principal(user_id)
+
+    async def _remember(self, user_id: int, iat: Any) -> None:
+        index = await app_cache.get(NAMESPACE, f"index:{user_id}") or []
+        if iat not in index:
+            index = (index + [iat])[-INDEX_SIZE:]
+        await app_cache.set(NAMESPACE, f"index:{user_id}", index)
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        """사용자의 모든 토큰 항목 삭제 (구독/계정 변경 시)"""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return
+        self.invalidations += 1
+        index = await app_cache.get(NAMESPACE, f"index:{user_id}") or []
+        for iat in index:
+            await app_cache.delete(NAMESPACE, f"{user_id}:{iat}")
+        await app_cache.delete(NAMESPACE, f"index:{user_id}")
+
+    async def tier_for(self, payload: Dict[str, Any]) -> Optional[str]:
+        """rate limiter용 등급 조회 (캐시에 있을 때만)"""
+        principal = await self.get(payload, load=False)
+        return principal.tier if principal else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+        }
+
+
+# 전역 인증 주체 캐시
+principal_cache = PrincipalCache()
@@ -1,73 +1,231 @@
 """
-Rate Limiting 미들웨어
+Rate Limiting - 토큰 버킷 (Redis Lua 원자 연산, 장애 시 프로세스 내 버킷)
 """
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from fastapi import Request, HTTPException
-from typing import Dict
-from datetime import datetime, timedelta
-from collections import defaultdict
-
-# 간단한 메모리 기반 rate limiter (프로덕션에서는 Redis 사용 권장)
-_rate_limit_store: Dict[str, list] = defaultdict(list)
+from app.core.config import settings
+from app.core.redis_backend import RedisUnavailable, redis_backend
+from app.core.security import verify_access_token
+
+ANONYMOUS = "anonymous"
+DEFAULT_TIER = "free"
+# 라우트 정보가 없는 요청 (정상적으로는 의존성이 라우팅 후에 실행되므로 생기지 않음)
+UNMATCHED = "<unmatched>"
+
+# KEYS[1]: 버킷 키, ARGV: 용량, 초당 충전량, 키 만료(ms)
+# 반환: {허용 여부, 남은 토큰, 재시도까지 초}. Lua 숫자는 정수로 잘려 반환되므로 문자열로 돌려줌
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return {allowed, tostring(tokens), tostring(retry)}
+"""
 
 
-async def rate_limit_middleware(request: Request, limit: int = 100, window: int = 60):
+class LocalTokenBuckets:
     """
-    Rate limiting 미들웨어
-    
-    Args:
-        limit: 시간당 허용 요청 수
-        window: 시간 윈도우 (초)
-    """
-    client_ip = request.client.host if request.client else "unknown"
-    
-    # API 경로별로 다른 제한 적용
-    path = request.url.path
-    
-    # 엄격한 제한이 필요한 엔드포인트
-    if "/api/company/" in path:
-        limit = 20  # 기업 분석은 더 엄격한 제한
-    elif "/api/subscription/" in path:
-        limit = 10  # 구독 관련은 더 엄격한 제한
-    
-    now = datetime.now()
-    key = f"{client_ip}:{path}"
-    
-    # 오래된 요청 제거
-    _rate_limit_store[key] = [
-        timestamp for timestamp in _rate_limit_store[key]
-        if now - timestamp < timedelta(seconds=window)
-    ]
-    
-    # 제한 초과 확인
-    if len(_rate_limit_store[key]) >= limit:
-        raise HTTPException(
-            status_code=429,
-            detail=f"너무 많은 요청입니다. {window}초 후 다시 시도해주세요."
-        )
-    
-    # 현재 요청 기록
-    _rate_limit_store[key].append(now)
-    
-    return True
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    프로세스 내 토큰 버킷 (Redis를 쓸 수 없을 때의 대체 백엔드)
 
+    키마다 (토큰, 갱신 시각, 가득 찰 때까지 걸리는 시간)만 두고, 접근 순서(OrderedDict)로 정렬해 두었다가
+    가득 찰 때까지 쉰 키를 앞에서부터 제거한다. 가득 찬 버킷은 새로 만든 버킷과
+    같으므로 지워도 결과가 달라지지 않는다. 검사 한 번은 상수 시간이다 (제거는 분할 상환).
+    """
 
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.evictions = 0
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            key, (_, updated, full_after) = next(iter(self._buckets.items()))
+            if now - updated < full_after and len(self._buckets) <= self.maxsize:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+
+    def take(self, key: str, capacity: int, window: float) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        rate = capacity / window
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= 1
+        retry = 0.0
+        if allowed:
+            tokens -= 1
+        else:
+            retry = (1 - tokens) / rate
+        # 세 번째 값: 다시 가득 찰 때까지 걸리는 시간 (이후엔 제거 가능)
+        self._buckets[key] = [tokens, now, (capacity - tokens) / rate]
+        self._evict(now)
+        return allowed, tokens, retry
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """
+    라우트 템플릿 × 클라이언트 × 등급별 토큰 버킷
+
+    - 키: "{prefix}:rl:{라우트 템플릿}:{u:사용자 | ip:주소}" (예: /api/company/{symbol})
+      템플릿을 쓰므로 종목마다 키가 생기지 않는다.
+    - 한도: RATE_LIMITS에서 템플릿과 가장 길게 일치하는 접두사 규칙의 등급별 값
+      (RATE_LIMIT_WINDOW초당 요청 수). 버킷 용량이 한도이고 창 길이 동안 가득 다시 찬다.
+    - 등급: 토큰이 없으면 anonymous, 있으면 tier_resolver 결과 (없으면 free)
+    - Redis: Lua 스크립트 한 번(EVALSHA)으로 읽기/차감/만료 설정을 원자적으로 처리하고,
+      가득 찰 시간 뒤에 키가 만료되어 쉬는 클라이언트의 상태가 남지 않는다.
+    - Redis 서킷이 열려 있거나 실패하면 프로세스 내 버킷으로 판단한다 (워커별 한도).
+    - 라우팅이 끝난 뒤 앱 전역 의존성(enforce_rate_limit)으로 실행된다. 어떤 라우트에도
+      맞지 않는 요청(404)은 엔드포인트가 실행되지 않으므로 검사하지 않는다.
+    """
 
+    def __init__(self):
+        self.window = settings.RATE_LIMIT_WINDOW
+        self.local = LocalTokenBuckets(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+        self._rules: Dict[str, Dict[str, int]] = {}
+        self._script = None
+        # 인증된 사용자의 등급 조회 (토큰 페이로드 → 등급, 모르면 None)
+        self.tier_resolver: Optional[Callable[[Dict[str, Any]], Awaitable[Optional[str]]]] = None
+        self.checks = 0
+        self.rejected = 0
+        self.redis_checks = 0
+        self.local_checks = 0
+
+    @staticmethod
+    def route_template(request: Request) -> str:
+        """
+        라우팅된 요청의 라우트 템플릿 (prefix 포함, 예: /api/company/{symbol})
+
+        라우터가 매칭 시 scope["route"]에 넣어 둔 라우트를 쓰므로 include_router 중첩
+        구조나 FastAPI 버전별 라우터 내부 표현과 무관하다.
+        """
+        route = request.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED
+
+    def limits_for(self, template: str) -> Dict[str, int]:
+        """템플릿의 등급별 한도 (가장 긴 접두사 규칙, 템플릿별로 캐시)"""
+        limits = self._rules.get(template)
+        if limits is None:
+            prefix = max(
+                (prefix for prefix in settings.RATE_LIMITS if prefix != "default" and template.startswith(prefix)),
+                key=len,
+                default="default"
+            )
+            limits = settings.RATE_LIMITS[prefix]
+            self._rules[template] = limits
+        return limits
+
+    async def identify(self, request: Request) -> Tuple[str, str]:
+        """(클라이언트 식별자, 등급)"""
+        authorization = request.headers.get("authorization", "")
+        if authorization[:7].lower() == "bearer ":
+            payload = verify_access_token(authorization[7:])
+            if payload:
+                tier = None
+                if self.tier_resolver is not None:
+                    tier = await self.tier_resolver(payload)
+                return f"u:{payload['sub']}", tier or DEFAULT_TIER
+        client_ip = request.client.host if request.client else "unknown"
+        return f"ip:{client_ip}", ANONYMOUS
+
+    async def _take_redis(self, key: str, capacity: int) -> Tuple[bool, float, float]:
+        if self._script is None:
+            self._script = redis_backend.client.register_script(TOKEN_BUCKET_LUA)
+        script = self._script
+        refill_ms = int(self.window * 1000) + 1000
+        allowed, tokens, retry = await redis_backend.execute(
+            lambda client: script(keys=[key], args=[capacity, capacity / self.window, refill_ms], client=client)
+        )
+        return bool(int(allowed)), float(tokens), float(retry)
+
+    async def check(self, request: Request) -> Dict[str, Any]:
+        """
+        요청 한 건 검사
+
+        Raises:
+            HTTPException: 429 (Retry-After, X-RateLimit-* 헤더 포함)
+        """
+        template = self.route_template(request)
+        identity, tier = await self.identify(request)
+        limits = self.limits_for(template)
+        capacity = limits.get(tier, limits.get(DEFAULT_TIER, 100))
+        key = f"{settings.CACHE_KEY_PREFIX}:rl:{template}:{identity}"
+
+        self.checks += 1
+        try:
+            allowed, tokens, retry = await self._take_redis(key, capacity)
+            self.redis_checks += 1
+        except RedisUnavailable:
+            allowed, tokens, retry = self.local.take(key, capacity, self.window)
+            self.local_checks += 1
+        except Exception as e:
+            print(f"[RateLimit] Redis 검사 실패, 프로세스 내 버킷 사용: {e}")
+            allowed, tokens, retry = self.local.take(key, capacity, self.window)
+            self.local_checks += 1
+
+        headers = {
+            "X-RateLimit-Limit": str(capacity),
+            "X-RateLimit-Remaining": str(int(tokens)),
+        }
+        if not allowed:
+            self.rejected += 1
+            retry_after = max(1, int(retry + 0.999))
+            raise HTTPException(
+                status_code=429,
+                detail=f"너무 많은 요청입니다. {retry_after}초 후 다시 시도해주세요.",
+                headers={**headers, "Retry-After": str(retry_after)}
+            )
+        return headers
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_seconds": self.window,
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "redis_checks": self.redis_checks,
+            "local_checks": self.local_checks,
+            "local_keys": len(self.local),
+            "local_evictions": self.local.evictions,
+        }
+
+
+# 전역 rate limiter 인스턴스
+rate_limiter = RateLimiter()
+
+
+async def enforce_rate_limit(request: Request) -> None:
+    """
+    Rate limiting 의존성 (앱 전역 dependencies에 등록, 라우팅 후 엔드포인트보다 먼저 실행)
 
+    응답에 붙일 X-RateLimit-* 헤더는 request.state.rate_limit_headers에 남기고,
+    main의 미들웨어가 응답(StreamingResponse 포함)에 옮겨 붙인다.
 
+    Raises:
+        HTTPException: 한도 초과 (429)
+    """
+    request.state.rate_limit_headers = await rate_limiter.check(request)
@@ -0,0 +1,222 @@
+"""
+Redis 백엔드 - redis.asyncio 커넥션 풀 + 서킷 브레이커
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class RedisUnavailable(Exception):
+    """서킷이 열려 있어 Redis 호출을 건너뜀"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커
+
+    - closed: 정상. 연속 failure_threshold번 실패하면 open
+    - open: 호출을 바로 거절한다. 복구 대기 시간이 지나면 half_open
+    - half_open: 프로브 하나만 통과시키고, 성공하면 closed, 실패하면 대기 시간을
+      두 배로 늘려(최대 max_recovery) 다시 open
+    """
+
+    def __init__(self, failure_threshold: int, recovery: float, max_recovery: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_recovery = recovery
+        self.max_recovery = max(recovery, max_recovery)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._recovery = recovery
+        self._opened_at = 0.0
+        self.transitions: Dict[str, int] = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        self.last_error: Optional[str] = None
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            print(f"[Redis] 서킷 {self.state} → {state}")
+            self.state = state
+            self.transitions[state] += 1
+
+    @property
+    def probe_due(self) -> bool:
+        """open 상태에서 복구 대기 시간이 지났는지"""
+        return self.state == OPEN and time.monotonic() - self._opened_at >= self._recovery
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._recovery = self.base_recovery
+        self._transition(CLOSED)
+
+    def begin_probe(self) -> None:
+        self._transition(HALF_OPEN)
+
+    def trip(self, error: BaseException) -> None:
+        """임계값과 관계없이 바로 open"""
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def record_failure(self, error: BaseException) -> None:
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self.state == HALF_OPEN:
+            self._recovery = min(self._recovery * 2, self.max_recovery)
+        elif self.consecutive_failures < self.failure_threshold:
+            return
+        self._opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "recovery_seconds": self._recovery,
+            "open_for_seconds": round(time.monotonic() - self._opened_at, 1) if self.state != CLOSED else 0.0,
+            "transitions": dict(self.transitions),
+            "last_error": self.last_error,
+        }
+
+
+class RedisBackend:
+    """
+    공유 redis.asyncio 클라이언트
+
+    커넥션은 BlockingConnectionPool 하나를 모든 호출이 공유한다 (풀이 가득 차면
+    CACHE_REDIS_TIMEOUT 동안 빈 커넥션을 기다린 뒤 실패). 모든 명령은 execute()로
+    보내며, 연속 실패로 서킷이 열리면 RedisUnavailable을 즉시 던져 호출자가 네트워크
+    대기 없이 프로세스 내 계층으로 넘어가게 한다. 복구 대기 시간이 지나면 첫 호출이
+    PING 프로브를 보내 서킷을 닫을지 결정한다.
+
+    redis.from_url()은 연결하지 않으므로 lifespan 시작 시 start()가 PING으로 실제
+    상태를 확인한다.
+    """
+
+    def __init__(self, url: Optional[str] = None, enabled: Optional[bool] = None):
+        self.url = url or settings.REDIS_URL
+        self.enabled = settings.CACHE_REDIS_ENABLED if enabled is None else enabled
+        self.breaker = CircuitBreaker(
+            settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+            settings.REDIS_BREAKER_RECOVERY_SECONDS,
+            settings.REDIS_BREAKER_MAX_RECOVERY_SECONDS
+        )
+        self._pool: Optional[aioredis.BlockingConnectionPool] = None
+        self._client: Optional[aioredis.Redis] = None
+        self._probe_lock = asyncio.Lock()
+        self.commands = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.probes = 0
+
+    @property
+    def client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._pool = aioredis.BlockingConnectionPool.from_url(
+                self.url,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.CACHE_REDIS_TIMEOUT,
+                socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                # 캐시 값은 CacheCodec 바이트이므로 응답을 문자열로 디코딩하지 않음
+                decode_responses=False
+            )
+            self._client = aioredis.Redis(connection_pool=self._pool)
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        """지금 명령을 보낼 수 있는지 (open이어도 프로브 시점이면 True)"""
+        return self.enabled and (self.breaker.state != OPEN or self.breaker.probe_due)
+
+    async def _probe(self) -> bool:
+        """복구 확인용 PING (동시에 하나만)"""
+        async with self._probe_lock:
+            if not self.breaker.probe_due:
+                return self.breaker.state != OPEN
+            self.probes += 1
+            self.breaker.begin_probe()
+            try:
+                await self.client.ping()
+            except Exception as e:
+                self.breaker.record_failure(e)
+                return False
+            self.breaker.record_success()
+            return True
+
+    async def execute(self, command: Callable[[aioredis.Redis], Awaitable[Any]]) -> Any:
+        """
+        명령 실행 (command는 클라이언트를 받아 코루틴을 반환하는 함수)
+
+        Raises:
+            RedisUnavailable: 비활성화됐거나 서킷이 열려 있음
+            redis.RedisError 등: 명령 실패 (실패는 서킷에 기록된다)
+        """
+        if not self.enabled:
+            raise RedisUnavailable("Redis disabled")
+        if self.breaker.state != CLOSED:
+            if not await self._probe():
+                self.short_circuited += 1
+                raise RedisUnavailable(f"circuit {self.breaker.state}")
+        self.commands += 1
+        try:
+            result = await command(self.client)
+        except Exception as e:
+            self.failures += 1
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def start(self) -> None:
+        """lifespan 시작 시 PING으로 연결 확인 (실패하면 서킷을 열고 프로브로 복구)"""
+        if not self.enabled:
+            print("[Redis] 비활성화 (프로세스 내 캐시만 사용)")
+            return
+        try:
+            await self.client.ping()
+        except Exception as e:
+            # 연속 실패 임계값과 관계없이 바로 열어 첫 요청들이 타임아웃을 기다리지 않게 함
+            self.breaker.trip(e)
+            print(f"[Redis] 연결 실패, 프로세스 내 캐시로 동작: {e}")
+        else:
+            self.breaker.record_success()
+            print(f"[Redis] 연결됨 (최대 커넥션 {settings.REDIS_MAX_CONNECTIONS})")
+
+    async def aclose(self) -> None:
+        """커넥션 풀 종료 (lifespan 종료 시 호출)"""
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except AttributeError:
+                # redis-py 5.0.1 미만
+                await client.close()
+            await self._pool.disconnect()
+        self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        return {
+            "enabled": self.enabled,
+            "available": self.available,
+            "circuit": self.breaker.stats(),
+            "commands": self.commands,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "probes": self.probes,
+            "pool": {
+                "max_connections": settings.REDIS_MAX_CONNECTIONS,
+                "created": len(getattr(pool, "_connections", ())) if pool is not None else 0,
+            },
+        }
+
+
+# 전역 Redis 백엔드 인스턴스
+redis_backend = RedisBackend()
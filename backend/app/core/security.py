@@ -1,13 +1,26 @@
 """
 Security utilities for authentication
 """
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+import jwt as pyjwt
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max를 기본값과 같게 두어 작업 비용이 바뀌면 기존 해시가 needs_update 대상이 됨 (로그인 시 재해싱)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +33,120 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """해싱 대기열이 가득 참 (503으로 응답)"""
+
+
+class PasswordHasher:
+    """
+    bcrypt 해싱/검증 전용 스레드 풀
+
+    bcrypt 한 번은 작업 비용에 따라 100~300ms의 CPU를 쓰므로 이벤트 루프에서 돌리면
+    로그인이 몰릴 때 시세/분석 요청이 함께 멈춘다. bcrypt 확장은 해싱 중 GIL을 놓으므로
+    프로세스 풀(cpu_pool) 대신 작은 스레드 풀로 충분하다. 풀 크기로 해싱에 쓰는 코어 수를,
+    대기 건수 상한으로 대기열 길이를 제한하고 초과분은 바로 거절한다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.tasks = 0
+        self.rejected = 0
+        self.rehashes = 0
+        # 최근 작업의 (대기 ms, 실행 ms)
+        self._latencies: deque = deque(maxlen=512)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """스레드 풀 (최초 사용 시 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """
+        해싱 작업을 풀에서 실행
+
+        Raises:
+            PasswordHasherBusy: 대기 건수가 상한에 도달한 경우
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        submitted = time.perf_counter()
+        started = []
+
+        def job():
+            started.append(time.perf_counter())
+            return func(*args)
+
+        self.pending += 1
+        self.tasks += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+        finally:
+            self.pending -= 1
+            if started:
+                finished = time.perf_counter()
+                self._latencies.append(((started[0] - submitted) * 1000, (finished - started[0]) * 1000))
+
+    async def hash(self, password: str) -> str:
+        """비밀번호 해시 (현재 BCRYPT_ROUNDS)"""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        비밀번호 검증
+
+        Returns:
+            (일치 여부, 새 해시). 작업 비용이 바뀐 해시면 새 해시를 돌려주므로 저장하면 된다.
+        """
+        try:
+            verified, new_hash = await self._run(pwd_context.verify_and_update, password, hashed_password)
+        except ValueError:
+            # bcrypt 형식이 아닌 해시 (OAuth 전용 계정 등)
+            return False, None
+        if new_hash is not None:
+            self.rehashes += 1
+        return verified, new_hash
+
+    def shutdown(self):
+        """스레드 풀 종료 (lifespan 종료 시 호출)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(sample[0] for sample in self._latencies)
+        runs = sorted(sample[1] for sample in self._latencies)
+
+        def percentile(values, q):
+            return round(values[min(len(values) - 1, int(len(values) * q))], 1) if values else None
+
+        return {
+            "rounds": settings.BCRYPT_ROUNDS,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "tasks": self.tasks,
+            "rejected": self.rejected,
+            "rehashes": self.rehashes,
+            "wait_ms_p50": percentile(waits, 0.5),
+            "wait_ms_p95": percentile(waits, 0.95),
+            "run_ms_p50": percentile(runs, 0.5),
+            "run_ms_p95": percentile(runs, 0.95),
+        }
+
+
+# 전역 비밀번호 해셔 인스턴스
+password_hasher = PasswordHasher()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -31,7 +158,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # iat: 주체 캐시 키(sub + iat)에 사용
+    to_encode.update({"exp": expire, "iat": int(time.time())})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -44,3 +172,41 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
+
+# 검증을 통과한 토큰 → 페이로드 (토큰 만료 시각까지 보관, 실패한 토큰은 캐시하지 않음)
+_verified_tokens = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def verify_access_token(token: str) -> Optional[dict]:
+    """
+    액세스 토큰 검증 (서명 + 만료, 결과는 만료 시각까지 캐시)
+
+    로컬 토큰(aud 없음)과 Supabase 토큰(aud="authenticated")을 한 번의 디코딩으로 처리한다.
+    """
+    payload = _verified_tokens.get(token)
+    if payload is not None:
+        return payload
+    try:
+        payload = pyjwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"verify_aud": False}
+        )
+    except pyjwt.InvalidTokenError:
+        return None
+    audience = payload.get("aud")
+    if audience is not None:
+        audiences = [audience] if isinstance(audience, str) else audience
+        if "authenticated" not in audiences:
+            return None
+    if not payload.get("sub"):
+        return None
+    expires_in = payload["exp"] - time.time() if isinstance(payload.get("exp"), (int, float)) else None
+    if expires_in is None or expires_in > 0:
+        _verified_tokens.set(token, payload, ttl=expires_in)
+    return payload
+
+
+def verified_token_stats() -> dict:
+    return _verified_tokens.stats()
@@ -0,0 +1,112 @@
+"""
+Singleflight - 동일한 업스트림 요청의 동시 실행을 하나로 합침
+"""
+import asyncio
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+def freeze(value: Any) -> Hashable:
+    """인자를 해시 가능한 키로 변환"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(freeze(v) for v in value))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _detach(result: Any) -> Any:
+    """공유 결과의 최상위 컨테이너를 호출자별로 복사 (정렬 등 제자리 변경 대비)"""
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+
+class SingleFlight:
+    """
+    진행 중인 호출 중복 제거기
+
+    같은 키의 호출이 이미 진행 중이면 새로 실행하지 않고 그 결과를 함께 기다린다.
+    공유 작업은 asyncio.shield로 감싸므로 한 호출자가 취소돼도 나머지는 영향받지 않는다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._by_provider: Dict[str, Dict[str, int]] = defaultdict(lambda: {"executions": 0, "coalesced": 0})
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 해당하는 호출을 실행하거나 진행 중인 호출에 합류
+
+        Args:
+            key: (provider, method, args...) 형태의 키 (첫 요소가 지표 집계 단위)
+            factory: 실제 호출 코루틴을 만드는 함수
+        """
+        provider = str(key[0]) if isinstance(key, tuple) and key else "default"
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._release(k, t))
+            self.executions += 1
+            self._by_provider[provider]["executions"] += 1
+        else:
+            self.coalesced += 1
+            self._by_provider[provider]["coalesced"] += 1
+        return _detach(await asyncio.shield(task))
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 예외가 아무도 기다리지 않는 상태로 남아 경고가 찍히는 것 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """합쳐진 호출 수 등 지표"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "saved_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "inflight": len(self._inflight),
+            "by_provider": {name: dict(counts) for name, counts in self._by_provider.items()},
+        }
+
+
+# 전역 singleflight 인스턴스
+singleflight = SingleFlight()
+
+
+def coalesce(provider: Optional[str] = None):
+    """
+    async 메서드의 동시 호출을 (provider, method, args) 단위로 합치는 데코레이터
+
+    provider를 생략하면 인스턴스의 클래스 이름을 사용한다. 인스턴스가 달라도
+    같은 클래스의 같은 인자 호출은 같은 업스트림 요청이므로 함께 합쳐진다.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (
+                provider or type(self).__name__,
+                func.__name__,
+                freeze(args),
+                freeze(kwargs),
+            )
+            return await singleflight.do(key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
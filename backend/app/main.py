@@ -4,12 +4,30 @@ Main FastAPI Application
 import sys
 import traceback
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings
-from app.core.rate_limit import rate_limit_middleware
-from app.api import auth, portfolio, company, dividend, economic, news, speech, subscription
+from app.core.rate_limit import enforce_rate_limit, rate_limiter
+from app.api.deps import require_metrics_token
+from app.api import auth, portfolio, company, dividend, economic, news, speech, subscription, screener
+from app.services.data.market_data_gateway import market_data_gateway
+from app.services.data.info_cache import info_cache
+from app.services.data.price_store import price_store
+from app.services.data.quote_poller import quote_poller
+from app.core.cache import app_cache
+from app.core.singleflight import singleflight
+from app.core.executors import cpu_pool
+from app.core.http import http_clients
+from app.core.database import dispose_engines, pool_stats
+from app.core.redis_backend import redis_backend
+from app.core.principal import principal_cache
+from app.core.security import password_hasher, verified_token_stats
+from app.tasks.prefetch import prefetch_scheduler
+from app.services.analysis.indicator_engine import indicator_engine
+from app.services.analysis.indicator_state import indicator_states
+from app.services.analysis.fundamentals_index import fundamentals_index
+from app.services.analysis.portfolio_risk import risk_engine
 
 
 @asynccontextmanager
@@ -18,9 +36,23 @@ async def lifespan(app: FastAPI):
     # 시작 시
     print("[INFO] 서버 시작 중...")
     print(f"[INFO] Python 버전: {sys.version}")
+    http_clients.start()
+    # rate limiter가 DB 조회 없이 캐시된 주체로 등급별 한도를 적용
+    rate_limiter.tier_resolver = principal_cache.tier_for
+    await redis_backend.start()
+    if settings.PREFETCH_ENABLED:
+        prefetch_scheduler.start()
     yield
     # 종료 시
     print("[INFO] 서버 종료 중...")
+    await prefetch_scheduler.stop()
+    await quote_poller.stop()
+    market_data_gateway.shutdown()
+    cpu_pool.shutdown()
+    password_hasher.shutdown()
+    await http_clients.aclose()
+    await redis_backend.aclose()
+    await dispose_engines()
     print("[INFO] 서버 종료 완료")
 
 
@@ -28,7 +60,9 @@ app = FastAPI(
     title="Stock Portfolio API",
     description="Stock portfolio management and analysis platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Rate limiting: 라우팅 후 실행되어 scope의 라우트 템플릿으로 한도를 고름
+    dependencies=[Depends(enforce_rate_limit)]
 )
 
 # CORS middleware
@@ -56,17 +90,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate limiting 미들웨어
+# Rate limit 헤더 (검사는 enforce_rate_limit 의존성에서, 429는 HTTPException 헤더로 응답)
 @app.middleware("http")
-async def rate_limit(request: Request, call_next):
-    try:
-        await rate_limit_middleware(request)
-    except HTTPException as e:
-        return JSONResponse(
-            status_code=e.status_code,
-            content={"detail": e.detail}
-        )
+async def rate_limit_headers(request: Request, call_next):
     response = await call_next(request)
+    headers = getattr(request.state, "rate_limit_headers", None)
+    if headers:
+        response.headers.update(headers)
     return response
 
 # Include routers
@@ -78,6 +108,7 @@ app.include_router(economic.router, prefix="/api", tags=["economic"])
 app.include_router(news.router, prefix="/api", tags=["news"])
 app.include_router(speech.router, prefix="/api", tags=["speech"])
 app.include_router(subscription.router, prefix="/api", tags=["subscription"])
+app.include_router(screener.router, prefix="/api", tags=["screener"])
 
 
 @app.get("/")
@@ -92,6 +123,33 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """캐시 등 내부 상태 지표 (METRICS_TOKEN 필요)"""
+    return {
+        "info_cache": info_cache.stats(),
+        "price_store": price_store.stats(),
+        "singleflight": singleflight.stats(),
+        "quote_poller": quote_poller.stats(),
+        "prefetch": prefetch_scheduler.stats(),
+        "indicator_engine": indicator_engine.stats(),
+        "indicator_states": indicator_states.stats(),
+        "cpu_pool": cpu_pool.stats(),
+        "fundamentals_index": fundamentals_index.stats(),
+        "cache": app_cache.stats(),
+        "redis": redis_backend.stats(),
+        "database": pool_stats(),
+        "rate_limit": rate_limiter.stats(),
+        "auth": {
+            "verified_tokens": verified_token_stats(),
+            "principals": principal_cache.stats(),
+            "password_hashing": password_hasher.stats(),
+        },
+        "risk_engine": risk_engine.stats(),
+        "http_clients": http_clients.stats()
+    }
+
+
 # 글로벌 예외 핸들러 - 서버 크래시 방지
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
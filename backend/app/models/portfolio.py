@@ -1,7 +1,7 @@
 """
 Portfolio Model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -10,6 +10,10 @@ from app.core.database import Base
 class PortfolioItem(Base):
     """Portfolio item model"""
     __tablename__ = "portfolio_items"
+    __table_args__ = (
+        # 사용자당 종목 하나 (일괄 가져오기의 ON CONFLICT 대상)
+        Index("uq_portfolio_items_user_symbol", "user_id", "symbol", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,15 +1,16 @@
 """
 AI 요약 서비스 - Groq (무료), OpenAI, Ollama 지원
 """
-import httpx
 from typing import Optional, Dict
 from app.core.config import settings
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class AISummarizer:
     """AI 기반 텍스트 요약 서비스"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.groq_api_key = settings.GROQ_API_KEY
         self.openai_api_key = settings.OPENAI_API_KEY
         self.ollama_url = settings.OLLAMA_BASE_URL
@@ -38,7 +39,7 @@ class AISummarizer:
 
 한국어 요약:"""
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self.http.session(timeout=30.0) as client:
                 response = await client.post(
                     "https://api.groq.com/openai/v1/chat/completions",
                     headers={
@@ -100,7 +101,7 @@ class AISummarizer:
 
 한국어 요약:"""
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self.http.session(timeout=60.0) as client:
                 response = await client.post(
                     "https://api.openai.com/v1/chat/completions",
                     headers={
@@ -157,7 +158,7 @@ class AISummarizer:
 
 요약:"""
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self.http.session(timeout=60.0) as client:
                 response = await client.post(
                     f"{self.ollama_url}/api/generate",
                     json={
@@ -0,0 +1,21 @@
+"""
+Analysis Services
+"""
+from app.services.analysis.indicator_engine import IndicatorEngine, IndicatorMatrix, indicator_engine
+from app.services.analysis.indicator_state import IndicatorState, IndicatorStateStore, indicator_states
+from app.services.analysis.fundamentals_index import FundamentalsIndex, fundamentals_index
+from app.services.analysis.portfolio_risk import ReturnsMatrix, RiskEngine, risk_engine
+
+__all__ = [
+    "IndicatorEngine",
+    "IndicatorMatrix",
+    "indicator_engine",
+    "IndicatorState",
+    "IndicatorStateStore",
+    "indicator_states",
+    "FundamentalsIndex",
+    "fundamentals_index",
+    "ReturnsMatrix",
+    "RiskEngine",
+    "risk_engine",
+]
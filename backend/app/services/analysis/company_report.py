@@ -0,0 +1,681 @@
+"""
+기업 분석 리포트 생성 - 기술적 분석 판정, 뉴스 감정, 투자 의견, 종합 응답 조립
+
+fetch_company_data(I/O 단계)가 모은 데이터로 응답을 만드는 CPU 단계다. 모두 순수 함수이므로
+배치 분석에서는 프로세스 풀 워커에서 실행된다.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from app.services.analysis.financial_scoring import (
+    CATEGORY_DEFINITIONS,
+    CategoryAnalysis,
+    FinancialMetric,
+    RiskAnalysis,
+    analyze_category,
+    analyze_risk,
+    calculate_financial_metrics,
+    validate_financial_data,
+)
+from app.services.analysis.indicator_engine import IndicatorMatrix
+
+
+class TechnicalIndicatorValue(BaseModel):
+    """기술적 지표 값"""
+    name: str
+    value: float
+    signal: str  # "buy", "sell", "neutral", "strong_buy", "strong_sell"
+    interpretation: str
+    level: Optional[str] = None  # "overbought", "oversold", "neutral"
+
+
+class TechnicalAnalysis(BaseModel):
+    """기술적 분석 결과"""
+    overall_signal: str  # "strong_buy", "buy", "neutral", "sell", "strong_sell"
+    overall_score: float  # 0-100
+    indicators: List[TechnicalIndicatorValue]
+    moving_averages: Dict[str, Any]
+    key_levels: Dict[str, Any]  # support, resistance
+    trend_strength: str  # "strong", "moderate", "weak"
+    summary: str
+
+
+class InvestmentOpinion(BaseModel):
+    """투자 의견"""
+    rating: str  # "Strong Buy", "Buy", "Hold", "Sell", "Strong Sell"
+    score: float  # 0-100
+    thesis: str
+    key_points: List[str] = []
+    risks: List[str] = []
+
+
+class NewsItem(BaseModel):
+    """뉴스 아이템 모델"""
+    title: str
+    publisher: str
+    link: str
+    published_at: str
+    thumbnail: Optional[str] = None
+    summary: Optional[str] = None
+    sentiment: Optional[str] = None
+
+
+class CompanyAnalysisResponse(BaseModel):
+    """기업 분석 응답"""
+    symbol: str
+    company_info: Dict[str, Any]
+    financial_metrics: List[FinancialMetric]
+    category_analyses: List[CategoryAnalysis]
+    risk_analysis: RiskAnalysis
+    technical_analysis: Optional[TechnicalAnalysis] = None
+    investment_opinion: InvestmentOpinion
+    news: Optional[List[NewsItem]] = None  # 최근 뉴스
+    data_quality: Dict[str, Any]  # 데이터 품질 정보
+    updated_at: str
+
+
+def build_technical_analysis(row: Dict[str, Any]) -> Optional[TechnicalAnalysis]:
+    """
+    지표 엔진의 한 종목 최신 값(IndicatorMatrix.row)으로 기술적 분석 결과 생성
+
+    지표 계산은 indicator_engine이 전 종목 행렬로 미리 해 두므로 여기서는 신호/점수만 판정한다.
+    """
+    if not row or row.get('close') is None or row.get('bars', 0) < 20:
+        return None
+    
+    try:
+        indicators = []
+        signals = []
+        scores = []
+        
+        # RSI (14일 평균 상승/하락폭)
+        rsi_value = row.get('rsi14')
+        if rsi_value is None:
+            rsi_value = 50.0
+        
+        if rsi_value >= 70:
+            rsi_signal = "sell"
+            rsi_level = "overbought"
+            rsi_score = 20
+        elif rsi_value <= 30:
+            rsi_signal = "buy"
+            rsi_level = "oversold"
+            rsi_score = 80
+        else:
+            rsi_signal = "neutral"
+            rsi_level = "neutral"
+            rsi_score = 50
+        
+        indicators.append(TechnicalIndicatorValue(
+            name="RSI (14)",
+            value=rsi_value,
+            signal=rsi_signal,
+            interpretation=f"RSI {rsi_value:.1f} - {'과매수' if rsi_value >= 70 else '과매도' if rsi_value <= 30 else '중립'}",
+            level=rsi_level
+        ))
+        signals.append(rsi_signal)
+        scores.append(rsi_score)
+        
+        # MACD (12/26/9)
+        macd_value = row.get('macd')
+        if macd_value is None:
+            macd_value = 0.0
+        hist_value = row.get('macd_hist')
+        if hist_value is None:
+            hist_value = 0.0
+        
+        if macd_value > 0 and hist_value > 0:
+            macd_signal = "buy"
+            macd_score = 70
+        elif macd_value < 0 and hist_value < 0:
+            macd_signal = "sell"
+            macd_score = 30
+        else:
+            macd_signal = "neutral"
+            macd_score = 50
+        
+        indicators.append(TechnicalIndicatorValue(
+            name="MACD",
+            value=macd_value,
+            signal=macd_signal,
+            interpretation=f"MACD {macd_value:.2f} - {'상승 추세' if macd_signal == 'buy' else '하락 추세' if macd_signal == 'sell' else '중립'}"
+        ))
+        signals.append(macd_signal)
+        scores.append(macd_score)
+        
+        # 이동평균 (데이터가 부족한 단기 이평은 현재가로 대체)
+        current_price = row['close']
+        ma5 = row.get('sma5') if row.get('sma5') is not None else current_price
+        ma10 = row.get('sma10') if row.get('sma10') is not None else current_price
+        ma20 = row.get('sma20') if row.get('sma20') is not None else current_price
+        ma50 = row.get('sma50')
+        ma200 = row.get('sma200')
+        
+        moving_averages = {
+            "MA5": ma5,
+            "MA10": ma10,
+            "MA20": ma20,
+            "MA50": ma50,
+            "MA200": ma200,
+            "current_price": current_price
+        }
+        
+        # 이동평균 신호
+        ma_signals = []
+        if current_price > ma5 > ma10 > ma20:
+            ma_signals.append("strong_buy")
+            ma_score = 80
+        elif current_price > ma5 > ma10:
+            ma_signals.append("buy")
+            ma_score = 65
+        elif current_price < ma5 < ma10 < ma20:
+            ma_signals.append("strong_sell")
+            ma_score = 20
+        elif current_price < ma5 < ma10:
+            ma_signals.append("sell")
+            ma_score = 35
+        else:
+            ma_signals.append("neutral")
+            ma_score = 50
+        
+        if ma50 and current_price > ma50:
+            ma_score += 5
+        if ma200 and current_price > ma200:
+            ma_score += 5
+        
+        signals.extend(ma_signals)
+        scores.append(ma_score)
+        
+        # 종합 신호 및 점수
+        buy_count = signals.count("buy") + signals.count("strong_buy") * 2
+        sell_count = signals.count("sell") + signals.count("strong_sell") * 2
+        overall_score = sum(scores) / len(scores) if scores else 50.0
+        
+        if buy_count > sell_count + 2:
+            overall_signal = "strong_buy"
+        elif buy_count > sell_count:
+            overall_signal = "buy"
+        elif sell_count > buy_count + 2:
+            overall_signal = "strong_sell"
+        elif sell_count > buy_count:
+            overall_signal = "sell"
+        else:
+            overall_signal = "neutral"
+        
+        # 지지선/저항선 (최근 20일 고가/저가 기준)
+        recent_highs = row.get('high20') if row.get('high20') is not None else current_price
+        recent_lows = row.get('low20') if row.get('low20') is not None else current_price
+        support = recent_lows * 0.98
+        resistance = recent_highs * 1.02
+        
+        key_levels = {
+            "support": float(support),
+            "resistance": float(resistance),
+            "current_price": current_price,
+            "bollinger_upper": row.get('bb_upper'),
+            "bollinger_lower": row.get('bb_lower'),
+            "atr": row.get('atr14'),
+            "stochastic_k": row.get('stoch_k'),
+            "stochastic_d": row.get('stoch_d')
+        }
+        
+        # 추세 강도
+        close_20_ago = row.get('close_20_ago')
+        price_change_20 = (current_price - close_20_ago) / close_20_ago * 100 if close_20_ago else 0
+        if abs(price_change_20) > 10:
+            trend_strength = "strong"
+        elif abs(price_change_20) > 5:
+            trend_strength = "moderate"
+        else:
+            trend_strength = "weak"
+        
+        # 요약 생성
+        summary = f"기술적 지표 종합: {overall_signal.upper()} 신호 (점수: {overall_score:.1f}/100). "
+        summary += f"RSI는 {rsi_value:.1f}로 {'과매수' if rsi_value >= 70 else '과매도' if rsi_value <= 30 else '중립'} 상태, "
+        summary += f"MACD는 {macd_signal} 신호, "
+        summary += f"이동평균선은 {'상승 추세' if ma_signals[0] in ['buy', 'strong_buy'] else '하락 추세' if ma_signals[0] in ['sell', 'strong_sell'] else '횡보'}입니다."
+        
+        return TechnicalAnalysis(
+            overall_signal=overall_signal,
+            overall_score=overall_score,
+            indicators=indicators,
+            moving_averages=moving_averages,
+            key_levels=key_levels,
+            trend_strength=trend_strength,
+            summary=summary
+        )
+    except Exception as e:
+        print(f"[Company Analysis] 기술적 지표 판정 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def calculate_technical_indicators_simple(history_data: pd.DataFrame) -> Optional[TechnicalAnalysis]:
+    """기술적 지표 계산 (간단한 버전 - 한 종목 히스토리로 지표 엔진을 돌려 판정)"""
+    if history_data is None or history_data.empty or len(history_data) < 20:
+        return None
+    
+    try:
+        df = history_data
+        if 'Close' not in df.columns:
+            return None
+        
+        closes = df['Close'].to_numpy(dtype=np.float64)
+        highs = df['High'].to_numpy(dtype=np.float64) if 'High' in df.columns else closes
+        lows = df['Low'].to_numpy(dtype=np.float64) if 'Low' in df.columns else closes
+        matrix = IndicatorMatrix.from_arrays(["_"], [closes], [highs], [lows], length=len(closes))
+        return build_technical_analysis(matrix.row("_"))
+    except Exception as e:
+        print(f"[Company Analysis] 기술적 지표 계산 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def analyze_news_sentiment(news_items: Optional[List]) -> Dict[str, Any]:
+    """뉴스 감정 분석"""
+    if not news_items or len(news_items) == 0:
+        return {'score': 50.0, 'sentiment': 'neutral', 'positive_count': 0, 'negative_count': 0, 'neutral_count': 0}
+    
+    positive_count = sum(1 for item in news_items if item.sentiment == 'positive')
+    negative_count = sum(1 for item in news_items if item.sentiment == 'negative')
+    neutral_count = sum(1 for item in news_items if item.sentiment == 'neutral' or not item.sentiment)
+    
+    total = len(news_items)
+    if total == 0:
+        return {'score': 50.0, 'sentiment': 'neutral', 'positive_count': 0, 'negative_count': 0, 'neutral_count': 0}
+    
+    # 중립 비율을 줄이기 위해 가중치 적용
+    positive_ratio = positive_count / total
+    negative_ratio = negative_count / total
+    
+    # 점수 계산 (0-100, 50이 중립)
+    if positive_ratio > negative_ratio:
+        score = 50 + (positive_ratio * 40)  # 최대 90점
+        sentiment = 'positive'
+    elif negative_ratio > positive_ratio:
+        score = 50 - (negative_ratio * 40)  # 최소 10점
+        sentiment = 'negative'
+    else:
+        # 중립이 많으면 약간 부정적으로 처리 (중립 감소)
+        if neutral_count / total > 0.7:
+            score = 45  # 중립이 많으면 약간 낮은 점수
+        else:
+            score = 50
+        sentiment = 'neutral'
+    
+    return {
+        'score': score,
+        'sentiment': sentiment,
+        'positive_count': positive_count,
+        'negative_count': negative_count,
+        'neutral_count': neutral_count
+    }
+
+
+def generate_investment_opinion(
+    category_analyses: List[CategoryAnalysis],
+    risk_analysis: RiskAnalysis,
+    technical_analysis: Optional[TechnicalAnalysis],
+    metrics: List[FinancialMetric],
+    news_items: Optional[List] = None
+) -> InvestmentOpinion:
+    """투자 의견 생성 (뉴스 분석 포함)"""
+    # 종합 점수 계산
+    category_score = sum(ca.score for ca in category_analyses) / len(category_analyses) if category_analyses else 50.0
+    risk_score = 100 - risk_analysis.overall_risk
+    technical_score = technical_analysis.overall_score if technical_analysis else 50.0
+    
+    # 뉴스 감정 분석
+    news_analysis = analyze_news_sentiment(news_items)
+    news_score = news_analysis['score']
+    
+    # 가중 평균 (재무 40%, 리스크 25%, 기술적 20%, 뉴스 15%)
+    overall_score = category_score * 0.4 + risk_score * 0.25 + technical_score * 0.2 + news_score * 0.15
+    
+    # 점수 범위 확장 (더 극적인 평가)
+    # 점수를 더 넓게 분산시키기 위해 조정
+    if overall_score > 75:
+        # 75 이상은 더 높게
+        adjusted_score = 75 + (overall_score - 75) * 1.2
+        adjusted_score = min(adjusted_score, 95)
+    elif overall_score < 25:
+        # 25 이하는 더 낮게
+        adjusted_score = 25 - (25 - overall_score) * 1.2
+        adjusted_score = max(adjusted_score, 5)
+    else:
+        # 중간 범위는 약간 확장
+        if overall_score > 50:
+            adjusted_score = 50 + (overall_score - 50) * 1.1
+        else:
+            adjusted_score = 50 - (50 - overall_score) * 1.1
+    
+    overall_score = adjusted_score
+    
+    # 등급 결정 (더 엄격한 기준)
+    if overall_score >= 85:
+        rating = "Strong Buy"
+    elif overall_score >= 70:
+        rating = "Buy"
+    elif overall_score >= 55:
+        rating = "Hold"
+    elif overall_score >= 40:
+        rating = "Sell"
+    else:
+        rating = "Strong Sell"
+    
+    # 투자 논리 생성
+    thesis_parts = []
+    
+    # 재무 강점/약점 (더 명확하게)
+    strong_categories = [ca for ca in category_analyses if ca.score >= 75]
+    weak_categories = [ca for ca in category_analyses if ca.score < 40]
+    
+    if strong_categories:
+        thesis_parts.append(f"{', '.join([ca.category for ca in strong_categories])} 영역에서 탁월한 성과를 보이고 있습니다.")
+    if weak_categories:
+        thesis_parts.append(f"{', '.join([ca.category for ca in weak_categories])} 영역에서 개선이 필요합니다.")
+    
+    # 리스크 평가 (더 구체적으로)
+    if risk_analysis.overall_risk < 25:
+        thesis_parts.append("매우 낮은 리스크로 안정적인 투자처입니다.")
+    elif risk_analysis.overall_risk < 40:
+        thesis_parts.append("낮은 리스크 수준으로 안정적입니다.")
+    elif risk_analysis.overall_risk > 75:
+        thesis_parts.append("매우 높은 리스크로 신중한 접근이 필수입니다.")
+    elif risk_analysis.overall_risk > 60:
+        thesis_parts.append("높은 리스크가 존재하므로 주의가 필요합니다.")
+    
+    # 기술적 분석 (더 구체적으로)
+    if technical_analysis:
+        if technical_analysis.overall_signal == "strong_buy":
+            thesis_parts.append("기술적 지표가 강한 매수 신호를 보이고 있습니다.")
+        elif technical_analysis.overall_signal == "buy":
+            thesis_parts.append("기술적 지표가 매수 신호를 보이고 있습니다.")
+        elif technical_analysis.overall_signal == "strong_sell":
+            thesis_parts.append("기술적 지표가 강한 매도 신호를 보이고 있습니다.")
+        elif technical_analysis.overall_signal == "sell":
+            thesis_parts.append("기술적 지표가 매도 신호를 보이고 있습니다.")
+    
+    # 뉴스 분석 포함
+    if news_analysis['positive_count'] > news_analysis['negative_count'] * 1.5:
+        thesis_parts.append("최근 뉴스가 긍정적인 흐름을 보이고 있습니다.")
+    elif news_analysis['negative_count'] > news_analysis['positive_count'] * 1.5:
+        thesis_parts.append("최근 뉴스가 부정적인 흐름을 보이고 있습니다.")
+    elif news_analysis['positive_count'] > 0:
+        thesis_parts.append("최근 뉴스는 혼재된 반응을 보이고 있습니다.")
+    
+    thesis = " ".join(thesis_parts) if thesis_parts else "종합 분석 결과입니다."
+    
+    # 주요 포인트 (더 구체적으로)
+    key_points = []
+    for ca in category_analyses:
+        if ca.score >= 70 and ca.strengths:
+            key_points.extend([f"{ca.category}: {s}" for s in ca.strengths[:2]])
+        elif ca.score < 40 and ca.weaknesses:
+            key_points.extend([f"{ca.category}: {w}" for w in ca.weaknesses[:2]])
+    
+    # 뉴스 포인트 추가
+    if news_analysis['positive_count'] > 2:
+        key_points.append(f"긍정적 뉴스 {news_analysis['positive_count']}건")
+    if news_analysis['negative_count'] > 2:
+        key_points.append(f"부정적 뉴스 {news_analysis['negative_count']}건")
+    
+    # 리스크
+    risks = risk_analysis.risk_factors.copy()
+    if technical_analysis and technical_analysis.overall_signal in ["strong_sell", "sell"]:
+        risks.append("기술적 하락 신호")
+    if news_analysis['negative_count'] > news_analysis['positive_count']:
+        risks.append("부정적 뉴스 우세")
+    
+    return InvestmentOpinion(
+        rating=rating,
+        score=round(overall_score, 1),
+        thesis=thesis,
+        key_points=key_points[:5],
+        risks=risks[:5]
+    )
+
+
+def parse_company_news(news_data: Optional[List], company_name: str, symbol_clean: str) -> Optional[List[NewsItem]]:
+    """yfinance 뉴스 중 회사 관련 기사만 골라 감정 분석 후 NewsItem 목록으로 변환"""
+    if not news_data or len(news_data) == 0:
+        return None
+    
+    news_items_for_analysis = []
+    
+    # 회사명 가져오기 (필터링용)
+    company_name = company_name or symbol_clean.upper()
+    
+    # 관련 뉴스 필터링
+    filtered_news = []
+    for item in news_data[:20]:  # 더 많이 가져와서 필터링
+        content = item.get('content', {}) if isinstance(item.get('content'), dict) else item
+        title = content.get('title', '') or item.get('title', '') or content.get('headline', '')
+        summary = content.get('summary', '') or content.get('description', '') or item.get('summary', '')
+        
+        search_text = (title + " " + summary).upper()
+        symbol_upper = symbol_clean.upper()
+        company_name_upper = company_name.upper()
+        
+        # 심볼이나 회사명이 포함되어 있는지 확인
+        is_relevant = False
+        if symbol_upper in search_text or company_name_upper in search_text:
+            is_relevant = True
+        elif company_name_upper:
+            name_words = [w for w in company_name_upper.split() if len(w) > 3]
+            if len(name_words) >= 2:
+                matched_words = sum(1 for word in name_words if word in search_text)
+                if matched_words >= 2:
+                    is_relevant = True
+        
+        if is_relevant:
+            filtered_news.append(item)
+            if len(filtered_news) >= 10:
+                break
+    
+    # 관련 뉴스 파싱
+    for item in filtered_news:
+        try:
+            content = item.get('content', {}) if isinstance(item.get('content'), dict) else item
+            title = content.get('title', '') or item.get('title', '') or content.get('headline', '')
+            summary = content.get('summary', '') or content.get('description', '') or item.get('summary', '')
+            
+            # 감정 분석 (중립 감소)
+            text = (title + " " + summary).lower()
+            positive_keywords = ['up', 'rise', 'gain', 'profit', 'growth', 'positive', 'beat', '상승', '증가', '성장', '호재', 'surge', 'rally', 'boost', 'strong']
+            negative_keywords = ['down', 'fall', 'loss', 'decline', 'negative', 'miss', '하락', '감소', '손실', '악재', 'plunge', 'crash', 'drop', 'warn', 'weak']
+            positive_count = sum(1 for kw in positive_keywords if kw in text)
+            negative_count = sum(1 for kw in negative_keywords if kw in text)
+            
+            # 중립 판별 기준 강화 (차이가 2 이상이어야 명확한 감정)
+            if positive_count > negative_count + 1:
+                sentiment = 'positive'
+            elif negative_count > positive_count + 1:
+                sentiment = 'negative'
+            elif positive_count > 0 or negative_count > 0:
+                # 약한 감정은 더 강한 쪽으로
+                sentiment = 'positive' if positive_count > negative_count else 'negative'
+            else:
+                sentiment = 'neutral'
+            
+            # link 처리
+            link = content.get('link', '') or item.get('link', '') or content.get('url', '')
+            if not link:
+                canonical_url = content.get('canonicalUrl', {}) or item.get('canonicalUrl', {})
+                if isinstance(canonical_url, dict):
+                    link = canonical_url.get('url', '')
+                if not link:
+                    click_through = content.get('clickThroughUrl', {}) or item.get('clickThroughUrl', {})
+                    if isinstance(click_through, dict):
+                        link = click_through.get('url', '')
+            if not link and 'id' in item:
+                link = f"https://finance.yahoo.com/news/{item['id']}"
+            
+            # 발행 시간 처리
+            published_time = None
+            if 'pubDate' in content:
+                pub_date = content['pubDate']
+                if isinstance(pub_date, str):
+                    try:
+                        pub_date = pub_date.replace('Z', '+00:00')
+                        published_time = datetime.fromisoformat(pub_date)
+                    except:
+                        published_time = datetime.now()
+                elif isinstance(pub_date, (int, float)):
+                    published_time = datetime.fromtimestamp(pub_date)
+                else:
+                    published_time = datetime.now()
+            elif 'displayTime' in content:
+                display_time = content['displayTime']
+                if isinstance(display_time, str):
+                    try:
+                        display_time = display_time.replace('Z', '+00:00')
+                        published_time = datetime.fromisoformat(display_time)
+                    except:
+                        published_time = datetime.now()
+                else:
+                    published_time = datetime.now()
+            else:
+                published_time = datetime.now()
+            
+            # 썸네일 처리
+            thumbnail = None
+            if 'thumbnail' in content and content['thumbnail']:
+                thumb_data = content['thumbnail']
+                if isinstance(thumb_data, dict):
+                    resolutions = thumb_data.get('resolutions', [])
+                    if resolutions and len(resolutions) > 0:
+                        thumbnail = resolutions[-1].get('url') if resolutions else None
+                        if not thumbnail:
+                            thumbnail = resolutions[0].get('url')
+                elif isinstance(thumb_data, str):
+                    thumbnail = thumb_data
+            
+            # summary 처리 (HTML 태그 제거)
+            if summary:
+                import re
+                summary = re.sub(r'<[^>]+>', '', summary)
+                summary = summary.strip()
+            
+            # publisher 처리
+            publisher = content.get('publisher', '') or item.get('publisher', '') or 'Yahoo Finance'
+            provider = content.get('provider', {}) or item.get('provider', {})
+            if isinstance(provider, dict):
+                publisher = provider.get('displayName', publisher)
+            
+            news_items_for_analysis.append(NewsItem(
+                title=title,
+                publisher=publisher,
+                link=link,
+                published_at=published_time.isoformat(),
+                thumbnail=thumbnail,
+                summary=summary,
+                sentiment=sentiment
+            ))
+        except:
+            continue
+    
+    return news_items_for_analysis
+
+
+def build_company_analysis(data: Dict[str, Any]) -> CompanyAnalysisResponse:
+    """
+    fetch_company_data 결과로 종합 분석 생성 (CPU 단계)
+
+    순수 함수이므로 배치 분석에서는 프로세스 풀에서 실행된다.
+    """
+    symbol = data["symbol"]
+    symbol_clean = data["symbol_clean"]
+    info = data["info"]
+    
+    # 회사 정보
+    company_info = {
+        'name': info.get('longName', info.get('shortName', symbol)),
+        'sector': info.get('sector', 'N/A'),
+        'industry': info.get('industry', 'N/A'),
+        'marketCap': validate_financial_data(info.get('marketCap'), 'marketCap'),
+        'currentPrice': validate_financial_data(
+            info.get('currentPrice') or info.get('regularMarketPrice'),
+            'currentPrice'
+        ),
+        'website': info.get('website', 'N/A'),
+        'description': info.get('longBusinessSummary', 'N/A')
+    }
+    
+    # 재무 지표 계산
+    print(f"[Company Analysis] 재무 지표 계산 중...")
+    financial_metrics = calculate_financial_metrics(info)
+    print(f"[Company Analysis] 재무 지표 계산 완료: {len(financial_metrics)}개")
+    
+    # 카테고리별 분석
+    category_analyses = [
+        analyze_category(financial_metrics, category, metric_names)
+        for category, metric_names in CATEGORY_DEFINITIONS
+    ]
+    
+    # 리스크 분석
+    print(f"[Company Analysis] 리스크 분석 중...")
+    risk_analysis = analyze_risk(financial_metrics, info)
+    
+    # 기술적 분석
+    technical_analysis = None
+    if data["include_technical"]:
+        print(f"[Company Analysis] 기술적 분석 중...")
+        try:
+            technical_row = data["technical_row"]
+            history = data["history"]
+            if technical_row is not None:
+                technical_analysis = build_technical_analysis(technical_row)
+                print(f"[Company Analysis] 기술적 분석 완료 (지표 상태)")
+            elif history is not None and not history.empty and len(history) >= 20:
+                technical_analysis = calculate_technical_indicators_simple(history)
+                print(f"[Company Analysis] 기술적 분석 완료")
+            else:
+                print(f"[Company Analysis] 기술적 분석 건너뜀 (데이터 부족)")
+        except Exception as te:
+            print(f"[Company Analysis] 기술적 분석 오류 (계속 진행): {te}")
+    
+    # 최근 뉴스 분석 (투자 의견 생성 전에 먼저 처리)
+    news_items_for_analysis = None
+    try:
+        print(f"[Company Analysis] 뉴스 분석 중...")
+        news_items_for_analysis = parse_company_news(data["news"], company_info.get('name', ''), symbol_clean)
+    except Exception as ne:
+        print(f"[Company Analysis] 뉴스 분석 오류 (계속 진행): {ne}")
+    
+    # 투자 의견 생성 (뉴스 포함)
+    print(f"[Company Analysis] 투자 의견 생성 중...")
+    investment_opinion = generate_investment_opinion(
+        category_analyses,
+        risk_analysis,
+        technical_analysis,
+        financial_metrics,
+        news_items_for_analysis
+    )
+    
+    # 최근 뉴스 (표시용 - 이미 분석에 사용한 뉴스 재사용)
+    news_items = news_items_for_analysis[:5] if news_items_for_analysis else None
+    
+    # 데이터 품질 평가
+    data_quality = {
+        'financial_metrics_count': len(financial_metrics),
+        'has_technical': technical_analysis is not None,
+        'completeness': len(financial_metrics) / 10 * 100  # 10개 지표 기준
+    }
+    
+    return CompanyAnalysisResponse(
+        symbol=symbol.upper(),
+        company_info=company_info,
+        financial_metrics=financial_metrics,
+        category_analyses=category_analyses,
+        risk_analysis=risk_analysis,
+        technical_analysis=technical_analysis,
+        investment_opinion=investment_opinion,
+        news=news_items,
+        data_quality=data_quality,
+        updated_at=datetime.now().isoformat()
+    )
@@ -0,0 +1,257 @@
+"""
+배당 이력 벡터 연산 - ticker.dividends Series를 행 단위 루프 없이 처리
+"""
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# 배당 이력 응답에 포함할 시작일 (기존 배당 페이지 기준)
+HISTORY_START = np.datetime64("2021-01-01", "D")
+# 성장률 계산 기간 (년)
+GROWTH_YEARS = 5
+# 다음 배당락일 추정에 쓸 최근 지급 간격 개수
+CADENCE_SAMPLES = 8
+
+_DAY = np.timedelta64(1, "D")
+_YEAR = np.timedelta64(365, "D")
+
+
+def dividend_arrays(dividends: Optional[pd.Series]):
+    """
+    배당 Series를 (날짜 datetime64[D], 금액 float64) 배열로 변환
+
+    인덱스의 타임존은 떼고 현지 날짜를 그대로 쓴다. 날짜로 해석되지 않거나
+    금액이 없는 행은 제외하고, 날짜 오름차순으로 정렬해 반환한다.
+    """
+    if dividends is None or len(dividends) == 0:
+        return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
+    index = dividends.index
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(pd.to_datetime(index, errors="coerce"))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    dates = index.values.astype("datetime64[D]")
+    amounts = pd.to_numeric(dividends, errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnat(dates) & np.isfinite(amounts)
+    dates, amounts = dates[valid], amounts[valid]
+    order = np.argsort(dates, kind="stable")
+    return dates[order], amounts[order]
+
+
+def trailing_sum(dates: np.ndarray, amounts: np.ndarray, end: np.datetime64) -> float:
+    """end를 포함한 최근 365일 동안 지급된 배당 합계"""
+    lo, hi = np.searchsorted(dates, [end - _YEAR, end], side="right")
+    return float(amounts[lo:hi].sum())
+
+
+def dividend_cagr(dates: np.ndarray, amounts: np.ndarray, today: np.datetime64) -> Optional[float]:
+    """
+    최근 12개월 배당 합계의 연평균 성장률 (%)
+
+    최대 GROWTH_YEARS년 전의 12개월 합계와 비교한다. 이력이 짧으면 가능한 최대 연수를 쓰고,
+    비교 구간 전체를 덮는 이력이 1년도 안 되면 None.
+    """
+    if len(dates) < 2:
+        return None
+    covered = (today - dates[0]) // _DAY - 365
+    years = min(GROWTH_YEARS, int(covered // 365))
+    if years < 1:
+        return None
+    current = trailing_sum(dates, amounts, today)
+    past = trailing_sum(dates, amounts, today - years * _YEAR)
+    if current <= 0 or past <= 0:
+        return None
+    return float(((current / past) ** (1.0 / years) - 1.0) * 100.0)
+
+
+def recent_growth_rate(dates: np.ndarray, amounts: np.ndarray, today: np.datetime64) -> Optional[float]:
+    """
+    최근 5년 중 최근 1년 평균 배당과 그 이전 평균 배당의 차이 (%) - 배당 페이지의 5년 상승률
+
+    응답 목록(HISTORY_START 이후)과 같은 구간에서 계산한다.
+    """
+    in_window = dates >= max(HISTORY_START, today - GROWTH_YEARS * _YEAR)
+    if np.count_nonzero(in_window) < 2:
+        return None
+    one_year_ago = today - _YEAR
+    paid = in_window & (amounts != 0)
+    recent = amounts[paid & (dates >= one_year_ago)]
+    older = amounts[paid & (dates < one_year_ago)]
+    if not len(recent) or not len(older):
+        return None
+    older_avg = older.mean()
+    if older_avg <= 0:
+        return None
+    return float((recent.mean() - older_avg) / older_avg * 100.0)
+
+
+def next_ex_dividend(dates: np.ndarray, info: Optional[Dict], now: Optional[float] = None) -> Optional[float]:
+    """
+    다음 배당락일 추정 (epoch 초, 추정 불가면 None)
+
+    info의 exDividendDate가 미래면 그대로 쓰고, 아니면 최근 지급 간격의 중앙값을
+    마지막 배당일에 더해 현재 이후가 될 때까지 진행한다.
+    """
+    now = time.time() if now is None else now
+    if isinstance(info, dict):
+        announced = info.get("exDividendDate")
+        if isinstance(announced, (int, float)) and announced > now:
+            return float(announced)
+    if len(dates) < 2:
+        return None
+    gaps = np.diff(dates[-(CADENCE_SAMPLES + 1):]) // _DAY
+    gaps = gaps[gaps > 0]
+    if not len(gaps):
+        return None
+    cadence = int(np.median(gaps))
+    last = int(dates[-1].astype("datetime64[s]").astype(np.int64))
+    step = cadence * 86400
+    if last + step > now:
+        return float(last + step)
+    # 예정일이 지났는데 새 배당이 없으면 다음 예정일까지 건너뜀 (지급 중단 종목 포함)
+    skipped = int((now - last) // step) + 1
+    return float(last + skipped * step)
+
+
+def summarize_dividends(
+    dividends: Optional[pd.Series],
+    current_price: Optional[float],
+    today: Optional[np.datetime64] = None
+) -> Dict[str, Any]:
+    """
+    배당 Series 요약
+
+    Returns:
+        {
+            "dividends": [{"date", "amount", "yield_"}] (HISTORY_START 이후, 최신순),
+            "five_year_growth_rate", "trailing_12m_dividend", "dividend_cagr",
+            "dates", "amounts" (전체 이력 배열, 오름차순)
+        }
+    """
+    today = np.datetime64("today", "D") if today is None else today
+    dates, amounts = dividend_arrays(dividends)
+
+    start = np.searchsorted(dates, HISTORY_START, side="left")
+    recent_dates = dates[start:][::-1]
+    recent_amounts = amounts[start:][::-1]
+    if current_price:
+        yields = recent_amounts / float(current_price)
+    else:
+        yields = np.full(len(recent_amounts), np.nan)
+
+    date_strings = np.datetime_as_string(recent_dates, unit="D").tolist()
+    rows = [
+        {
+            "date": date,
+            "amount": amount if amount else None,
+            "yield_": yield_value if amount and yield_value == yield_value else None,
+        }
+        for date, amount, yield_value in zip(date_strings, recent_amounts.tolist(), yields.tolist())
+    ]
+
+    trailing = trailing_sum(dates, amounts, today) if len(dates) else None
+    return {
+        "dividends": rows,
+        "five_year_growth_rate": recent_growth_rate(dates, amounts, today),
+        "trailing_12m_dividend": trailing if trailing else None,
+        "dividend_cagr": dividend_cagr(dates, amounts, today),
+        "dates": dates,
+        "amounts": amounts,
+    }
+
+
+def project_income(
+    dividends: Dict[str, Optional[pd.Series]],
+    quantities: Dict[str, float],
+    currencies: Dict[str, str],
+    today: Optional[np.datetime64] = None,
+    months: int = 12
+) -> Dict[str, Any]:
+    """
+    보유 종목 전체의 향후 배당 수입 달력 (전 종목을 한 번에 벡터 연산)
+
+    직전 months개월(이번 달 제외) 동안의 배당이 같은 날짜·금액으로 1년 뒤 반복된다고
+    보고 이번 달부터 months개월 달력을 만든다. 수입 = 주당 배당 × 보유 수량.
+
+    Args:
+        dividends: 심볼 → 배당 Series
+        quantities: 심볼 → 보유 수량 (같은 종목 여러 행은 합산해서 전달)
+        currencies: 심볼 → 통화 (달력 합계는 통화별로 따로 낸다)
+
+    Returns:
+        {"months": [...], "symbols": {...}, "annual_total": {통화: 합계}, "no_dividends": [...]}
+    """
+    today = np.datetime64("today", "D") if today is None else today
+    current_month = today.astype("datetime64[M]")
+    symbols = list(quantities)
+
+    # 전 종목 배당을 (종목 번호, 날짜, 금액) 평면 배열 하나로 이어 붙임
+    per_symbol = [dividend_arrays(dividends.get(symbol)) for symbol in symbols]
+    counts = np.array([len(dates) for dates, _ in per_symbol], dtype=np.int64)
+    if counts.sum():
+        dates = np.concatenate([dates for dates, _ in per_symbol])
+        amounts = np.concatenate([values for _, values in per_symbol])
+    else:
+        dates = np.empty(0, dtype="datetime64[D]")
+        amounts = np.empty(0, dtype=np.float64)
+    owner = np.repeat(np.arange(len(symbols)), counts)
+
+    paid_month = dates.astype("datetime64[M]")
+    offset = (paid_month - current_month).astype(np.int64)
+    window = (offset >= -months) & (offset < 0)
+    owner, dates, amounts, paid_month = owner[window], dates[window], amounts[window], paid_month[window]
+    bucket = offset[window] + months
+
+    # 1년 뒤 같은 날짜 (월 단위로 옮겨 2월 말 등 월말 날짜가 다음 달로 넘어가지 않게 함)
+    next_month = paid_month + np.timedelta64(months, "M")
+    days_in_month = ((next_month + 1).astype("datetime64[D]") - next_month.astype("datetime64[D]")) // _DAY
+    day = np.minimum((dates - paid_month.astype("datetime64[D]")) // _DAY, days_in_month - 1)
+    projected = next_month.astype("datetime64[D]") + day * _DAY
+
+    quantity = np.array([quantities[symbol] for symbol in symbols], dtype=np.float64)
+    income = amounts * quantity[owner]
+
+    currency_of = np.array([currencies.get(symbol, "USD") for symbol in symbols], dtype=object)
+    payment_currency = currency_of[owner]
+    month_labels = np.datetime_as_string(current_month + np.arange(months), unit="M").tolist()
+    month_totals: Dict[str, List[float]] = {}
+    for currency in dict.fromkeys(payment_currency.tolist()):
+        mask = payment_currency == currency
+        month_totals[currency] = np.bincount(bucket[mask], weights=income[mask], minlength=months).tolist()
+
+    symbol_income = np.bincount(owner, weights=income, minlength=len(symbols))
+    symbol_payments = np.bincount(owner, minlength=len(symbols))
+
+    order = np.lexsort((owner, projected.astype(np.int64)))
+    projected_strings = np.datetime_as_string(projected[order], unit="D").tolist()
+    calendar = [{"month": label, "totals": {}, "payments": []} for label in month_labels]
+    for i, date in zip(order.tolist(), projected_strings):
+        symbol = symbols[owner[i]]
+        calendar[bucket[i]]["payments"].append({
+            "symbol": symbol,
+            "date": date,
+            "amount_per_share": float(amounts[i]),
+            "quantity": quantities[symbol],
+            "income": float(income[i]),
+            "currency": currencies.get(symbol, "USD"),
+        })
+    for index, entry in enumerate(calendar):
+        entry["totals"] = {
+            currency: round(totals[index], 4) for currency, totals in month_totals.items() if totals[index]
+        }
+
+    return {
+        "months": calendar,
+        "symbols": {
+            symbol: {
+                "quantity": quantities[symbol],
+                "currency": currencies.get(symbol, "USD"),
+                "annual_income": round(float(symbol_income[index]), 4),
+                "payments_per_year": int(symbol_payments[index]),
+            }
+            for index, symbol in enumerate(symbols)
+        },
+        "annual_total": {currency: round(float(sum(totals)), 4) for currency, totals in month_totals.items()},
+        "no_dividends": [symbol for index, symbol in enumerate(symbols) if not symbol_payments[index]],
+    }
@@ -0,0 +1,300 @@
+"""
+재무 지표 점수화 - 재무 지표 계산, 카테고리 점수, 리스크 평가
+
+기업 분석 API와 펀더멘털 인덱스가 함께 사용하는 순수 함수 모음 (info 스냅샷 dict 입력)
+"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pydantic import BaseModel
+
+
+class FinancialMetric(BaseModel):
+    """재무 지표"""
+    name: str
+    value: Optional[float] = None
+    unit: Optional[str] = None
+    interpretation: Optional[str] = None
+    score: Optional[float] = None  # 0-100 점수
+
+
+class CategoryAnalysis(BaseModel):
+    """카테고리별 분석"""
+    category: str
+    score: float  # 0-100
+    metrics: List[FinancialMetric]
+    summary: str
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+
+
+class RiskAnalysis(BaseModel):
+    """리스크 분석"""
+    financial_risk: float  # 0-100
+    liquidity_risk: float
+    profitability_risk: float
+    growth_risk: float
+    volatility_risk: float
+    overall_risk: float
+    risk_factors: List[str] = []
+
+
+def validate_financial_data(data: Any, field_name: str) -> Optional[float]:
+    """재무 데이터 검증"""
+    if data is None:
+        return None
+    try:
+        value = float(data)
+        # 비정상적인 값 필터링
+        if np.isnan(value) or np.isinf(value):
+            return None
+        # 극단적인 값 필터링 (예: 음수 시가총액 등)
+        if field_name in ['marketCap', 'enterpriseValue', 'totalRevenue'] and value < 0:
+            return None
+        return value
+    except (ValueError, TypeError):
+        return None
+
+
+def calculate_financial_metrics(info: Dict) -> List[FinancialMetric]:
+    """재무 지표 계산 및 검증"""
+    metrics = []
+    
+    # PER (Price-to-Earnings Ratio)
+    pe_ratio = validate_financial_data(
+        info.get('trailingPE') or info.get('forwardPE'),
+        'peRatio'
+    )
+    if pe_ratio:
+        pe_score = 100 - min(100, max(0, (pe_ratio - 15) * 2))  # 15 근처가 이상적
+        pe_interp = "매우 저평가" if pe_ratio < 10 else "저평가" if pe_ratio < 15 else "적정" if pe_ratio < 25 else "고평가" if pe_ratio < 40 else "매우 고평가"
+        metrics.append(FinancialMetric(
+            name="PER (주가수익비율)",
+            value=pe_ratio,
+            interpretation=pe_interp,
+            score=pe_score
+        ))
+    
+    # PBR (Price-to-Book Ratio)
+    pb_ratio = validate_financial_data(info.get('priceToBook'), 'pbRatio')
+    if pb_ratio:
+        pb_score = 100 - min(100, max(0, (pb_ratio - 1.5) * 20))  # 1.5 근처가 이상적
+        pb_interp = "매우 저평가" if pb_ratio < 1 else "저평가" if pb_ratio < 1.5 else "적정" if pb_ratio < 3 else "고평가"
+        metrics.append(FinancialMetric(
+            name="PBR (주가순자산비율)",
+            value=pb_ratio,
+            interpretation=pb_interp,
+            score=pb_score
+        ))
+    
+    # ROE (Return on Equity)
+    roe = validate_financial_data(info.get('returnOnEquity'), 'roe')
+    if roe:
+        roe_score = min(100, max(0, roe * 2))  # 50% 이상이면 만점
+        roe_interp = "매우 우수" if roe > 0.2 else "우수" if roe > 0.15 else "양호" if roe > 0.1 else "보통" if roe > 0.05 else "낮음"
+        metrics.append(FinancialMetric(
+            name="ROE (자기자본이익률)",
+            value=roe * 100,  # 퍼센트로 변환
+            unit="%",
+            interpretation=roe_interp,
+            score=roe_score
+        ))
+    
+    # ROA (Return on Assets)
+    roa = validate_financial_data(info.get('returnOnAssets'), 'roa')
+    if roa:
+        roa_score = min(100, max(0, roa * 5))  # 20% 이상이면 만점
+        roa_interp = "매우 우수" if roa > 0.1 else "우수" if roa > 0.07 else "양호" if roa > 0.05 else "보통" if roa > 0.03 else "낮음"
+        metrics.append(FinancialMetric(
+            name="ROA (총자산이익률)",
+            value=roa * 100,
+            unit="%",
+            interpretation=roa_interp,
+            score=roa_score
+        ))
+    
+    # 부채비율 (Debt-to-Equity)
+    debt_to_equity = validate_financial_data(info.get('debtToEquity'), 'debtToEquity')
+    if debt_to_equity is not None:
+        de_score = max(0, 100 - (debt_to_equity * 2))  # 낮을수록 좋음
+        de_interp = "매우 우수" if debt_to_equity < 30 else "우수" if debt_to_equity < 50 else "양호" if debt_to_equity < 100 else "주의" if debt_to_equity < 200 else "위험"
+        metrics.append(FinancialMetric(
+            name="부채비율",
+            value=debt_to_equity,
+            unit="%",
+            interpretation=de_interp,
+            score=de_score
+        ))
+    
+    # 유동비율 (Current Ratio)
+    current_ratio = validate_financial_data(info.get('currentRatio'), 'currentRatio')
+    if current_ratio:
+        cr_score = min(100, max(0, (current_ratio - 1) * 25))  # 1 이상이면 좋음, 5 이상이면 만점
+        cr_interp = "매우 우수" if current_ratio > 2 else "우수" if current_ratio > 1.5 else "양호" if current_ratio > 1 else "주의"
+        metrics.append(FinancialMetric(
+            name="유동비율",
+            value=current_ratio,
+            interpretation=cr_interp,
+            score=cr_score
+        ))
+    
+    # 매출 성장률
+    revenue_growth = validate_financial_data(info.get('revenueGrowth'), 'revenueGrowth')
+    if revenue_growth is not None:
+        rg_score = min(100, max(0, revenue_growth * 200 + 50))  # 25% 이상이면 만점
+        rg_interp = "매우 우수" if revenue_growth > 0.2 else "우수" if revenue_growth > 0.1 else "양호" if revenue_growth > 0.05 else "보통" if revenue_growth > 0 else "감소"
+        metrics.append(FinancialMetric(
+            name="매출 성장률",
+            value=revenue_growth * 100,
+            unit="%",
+            interpretation=rg_interp,
+            score=rg_score
+        ))
+    
+    # 이익 성장률
+    earnings_growth = validate_financial_data(info.get('earningsGrowth'), 'earningsGrowth')
+    if earnings_growth is not None:
+        eg_score = min(100, max(0, earnings_growth * 100 + 50))  # 50% 이상이면 만점
+        eg_interp = "매우 우수" if earnings_growth > 0.3 else "우수" if earnings_growth > 0.15 else "양호" if earnings_growth > 0.05 else "보통" if earnings_growth > 0 else "감소"
+        metrics.append(FinancialMetric(
+            name="이익 성장률",
+            value=earnings_growth * 100,
+            unit="%",
+            interpretation=eg_interp,
+            score=eg_score
+        ))
+    
+    # 배당 수익률
+    dividend_yield = validate_financial_data(info.get('dividendYield'), 'dividendYield')
+    if dividend_yield:
+        dy_score = min(100, max(0, dividend_yield * 1000))  # 10% 이상이면 만점
+        dy_interp = "매우 우수" if dividend_yield > 0.05 else "우수" if dividend_yield > 0.03 else "양호" if dividend_yield > 0.02 else "보통"
+        metrics.append(FinancialMetric(
+            name="배당 수익률",
+            value=dividend_yield * 100,
+            unit="%",
+            interpretation=dy_interp,
+            score=dy_score
+        ))
+    
+    # Beta (변동성)
+    beta = validate_financial_data(info.get('beta'), 'beta')
+    if beta:
+        beta_score = 50 + (1 - abs(beta - 1)) * 50  # 1에 가까울수록 좋음
+        beta_interp = "안정적" if 0.8 < beta < 1.2 else "보통" if 0.6 < beta < 1.5 else "변동성 높음"
+        metrics.append(FinancialMetric(
+            name="Beta (시장 대비 변동성)",
+            value=beta,
+            interpretation=beta_interp,
+            score=beta_score
+        ))
+    
+    return metrics
+
+
+# 카테고리별 분석에 사용하는 지표 (기업 분석과 스크리너 인덱스가 공유)
+CATEGORY_DEFINITIONS = [
+    ("수익성", ["ROE (자기자본이익률)", "ROA (총자산이익률)"]),
+    ("안정성", ["부채비율", "유동비율"]),
+    ("성장성", ["매출 성장률", "이익 성장률"]),
+    ("배당", ["배당 수익률"]),
+    ("밸류에이션", ["PER (주가수익비율)", "PBR (주가순자산비율)"]),
+]
+
+
+def analyze_category(metrics: List[FinancialMetric], category: str, metric_names: List[str]) -> CategoryAnalysis:
+    """카테고리별 분석"""
+    category_metrics = [m for m in metrics if m.name in metric_names]
+    
+    if not category_metrics:
+        return CategoryAnalysis(
+            category=category,
+            score=50.0,
+            metrics=[],
+            summary="데이터 부족으로 분석 불가",
+            strengths=[],
+            weaknesses=[]
+        )
+    
+    # 점수 계산 (가중 평균)
+    scores = [m.score for m in category_metrics if m.score is not None]
+    avg_score = sum(scores) / len(scores) if scores else 50.0
+    
+    # 강점과 약점 파악
+    strengths = [m.name for m in category_metrics if m.score and m.score > 70]
+    weaknesses = [m.name for m in category_metrics if m.score and m.score < 40]
+    
+    # 요약 생성
+    if avg_score >= 75:
+        summary = f"{category} 영역이 매우 우수합니다."
+    elif avg_score >= 60:
+        summary = f"{category} 영역이 양호합니다."
+    elif avg_score >= 40:
+        summary = f"{category} 영역이 보통 수준입니다."
+    else:
+        summary = f"{category} 영역에 개선이 필요합니다."
+    
+    return CategoryAnalysis(
+        category=category,
+        score=avg_score,
+        metrics=category_metrics,
+        summary=summary,
+        strengths=strengths,
+        weaknesses=weaknesses
+    )
+
+
+def analyze_risk(metrics: List[FinancialMetric], info: Dict) -> RiskAnalysis:
+    """리스크 분석"""
+    # 재무 리스크 (부채비율, 유동비율)
+    debt_metric = next((m for m in metrics if m.name == "부채비율"), None)
+    current_metric = next((m for m in metrics if m.name == "유동비율"), None)
+    financial_risk = 50.0
+    if debt_metric and debt_metric.score is not None:
+        financial_risk = 100 - debt_metric.score
+    if current_metric and current_metric.score is not None:
+        financial_risk = (financial_risk + (100 - current_metric.score)) / 2
+    
+    # 유동성 리스크
+    liquidity_risk = 100 - (current_metric.score if current_metric and current_metric.score else 50)
+    
+    # 수익성 리스크
+    roe_metric = next((m for m in metrics if m.name == "ROE (자기자본이익률)"), None)
+    roa_metric = next((m for m in metrics if m.name == "ROA (총자산이익률)"), None)
+    profitability_scores = [m.score for m in [roe_metric, roa_metric] if m and m.score is not None]
+    profitability_risk = 100 - (sum(profitability_scores) / len(profitability_scores) if profitability_scores else 50)
+    
+    # 성장 리스크
+    revenue_metric = next((m for m in metrics if m.name == "매출 성장률"), None)
+    earnings_metric = next((m for m in metrics if m.name == "이익 성장률"), None)
+    growth_scores = [m.score for m in [revenue_metric, earnings_metric] if m and m.score is not None]
+    growth_risk = 100 - (sum(growth_scores) / len(growth_scores) if growth_scores else 50)
+    
+    # 변동성 리스크
+    beta_metric = next((m for m in metrics if m.name == "Beta (시장 대비 변동성)"), None)
+    volatility_risk = 100 - (beta_metric.score if beta_metric and beta_metric.score else 50)
+    
+    # 종합 리스크
+    overall_risk = (financial_risk + liquidity_risk + profitability_risk + growth_risk + volatility_risk) / 5
+    
+    # 리스크 요인
+    risk_factors = []
+    if financial_risk > 60:
+        risk_factors.append("재무 구조 취약")
+    if liquidity_risk > 60:
+        risk_factors.append("유동성 부족")
+    if profitability_risk > 60:
+        risk_factors.append("수익성 저하")
+    if growth_risk > 60:
+        risk_factors.append("성장 둔화")
+    if volatility_risk > 60:
+        risk_factors.append("높은 변동성")
+    
+    return RiskAnalysis(
+        financial_risk=financial_risk,
+        liquidity_risk=liquidity_risk,
+        profitability_risk=profitability_risk,
+        growth_risk=growth_risk,
+        volatility_risk=volatility_risk,
+        overall_risk=overall_risk,
+        risk_factors=risk_factors
+    )
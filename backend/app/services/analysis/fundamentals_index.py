@@ -0,0 +1,298 @@
+"""
+서비스 대상 종목 펀더멘털 컬럼 인덱스 - 스크리너 조회용
+"""
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.services.analysis.financial_scoring import (
+    CATEGORY_DEFINITIONS, analyze_category, analyze_risk, calculate_financial_metrics, validate_financial_data
+)
+from app.services.analysis.indicator_engine import indicator_engine
+
+# 카테고리 점수 컬럼 (financial_scoring.CATEGORY_DEFINITIONS 순서)
+CATEGORY_COLUMNS = [
+    "score_profitability",
+    "score_stability",
+    "score_growth",
+    "score_dividend",
+    "score_valuation",
+]
+
+# 숫자 컬럼: 이름 → 설명 (퍼센트 항목은 기업 분석과 같이 % 단위)
+NUMERIC_COLUMNS: Dict[str, str] = {
+    "price": "현재가",
+    "market_cap": "시가총액",
+    "per": "PER (주가수익비율)",
+    "pbr": "PBR (주가순자산비율)",
+    "roe": "ROE (%)",
+    "roa": "ROA (%)",
+    "debt_to_equity": "부채비율 (%)",
+    "current_ratio": "유동비율",
+    "revenue_growth": "매출 성장률 (%)",
+    "earnings_growth": "이익 성장률 (%)",
+    "dividend_yield": "배당 수익률 (%)",
+    "beta": "Beta",
+    "score_profitability": "수익성 점수",
+    "score_stability": "안정성 점수",
+    "score_growth": "성장성 점수",
+    "score_dividend": "배당 점수",
+    "score_valuation": "밸류에이션 점수",
+    "score_overall": "카테고리 평균 점수",
+    "risk_overall": "종합 리스크",
+    # 기술적 지표 (조회 시점의 지표 엔진 스냅샷에서 결합)
+    "rsi14": "RSI (14)",
+    "macd_hist": "MACD 히스토그램",
+    "stoch_k": "스토캐스틱 %K",
+    "atr14": "ATR (14)",
+    "sma50": "50일 이동평균",
+    "sma200": "200일 이동평균",
+}
+
+TEXT_COLUMNS: Dict[str, str] = {
+    "symbol": "심볼",
+    "name": "회사명",
+    "sector": "섹터",
+    "industry": "산업",
+    "exchange": "거래소",
+    "kind": "종류 (stock/etf)",
+}
+
+TECHNICAL_COLUMNS = ["rsi14", "macd_hist", "stoch_k", "atr14", "sma50", "sma200"]
+
+_FILTER_PATTERN = re.compile(r'^\s*([a-z0-9_]+)\s*(>=|<=|!=|>|<|=)\s*(.+?)\s*$')
+
+
+def parse_filter(expression: str) -> Tuple[str, str, str]:
+    """
+    'roe>15', 'per<=20', 'sector=Technology' 형식의 조건 파싱
+
+    Raises:
+        ValueError: 형식이 잘못됐거나 없는 컬럼일 때
+    """
+    match = _FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"잘못된 조건 형식입니다: {expression}")
+    column, op, value = match.groups()
+    if column not in NUMERIC_COLUMNS and column not in TEXT_COLUMNS:
+        raise ValueError(f"알 수 없는 컬럼입니다: {column}")
+    if column in TEXT_COLUMNS and op not in ("=", "!="):
+        raise ValueError(f"문자열 컬럼은 = 또는 != 만 사용할 수 있습니다: {expression}")
+    return column, op, value
+
+
+def _percent(value: float) -> float:
+    return value * 100 if np.isfinite(value) else np.nan
+
+
+def build_rows(infos: Dict[str, Dict], universe: List[Dict]) -> Dict[str, Any]:
+    """
+    info 스냅샷으로 종목별 값 계산 (financial_scoring의 재무 지표/카테고리/리스크 함수 재사용)
+
+    Returns:
+        컬럼 이름 → 값 리스트 (universe 순서, info가 없는 종목 제외)
+    """
+    def _info_value(info: Dict, *keys: str) -> float:
+        for key in keys:
+            value = validate_financial_data(info.get(key), key)
+            if value is not None:
+                return value
+        return np.nan
+
+    columns: Dict[str, list] = {name: [] for name in list(TEXT_COLUMNS) + list(NUMERIC_COLUMNS)}
+    for entry in universe:
+        info = infos.get(entry["symbol"])
+        if not info:
+            continue
+        metrics = calculate_financial_metrics(info)
+        category_scores = [analyze_category(metrics, category, names).score for category, names in CATEGORY_DEFINITIONS]
+        risk = analyze_risk(metrics, info)
+
+        columns["symbol"].append(entry["symbol"])
+        columns["name"].append(info.get("longName") or info.get("shortName") or entry.get("name") or "")
+        columns["sector"].append(info.get("sector") or "")
+        columns["industry"].append(info.get("industry") or "")
+        columns["exchange"].append(entry.get("exchange", ""))
+        columns["kind"].append(entry.get("kind", ""))
+
+        columns["price"].append(_info_value(info, "currentPrice", "regularMarketPrice"))
+        columns["market_cap"].append(_info_value(info, "marketCap"))
+        columns["per"].append(_info_value(info, "trailingPE", "forwardPE"))
+        columns["pbr"].append(_info_value(info, "priceToBook"))
+        columns["roe"].append(_percent(_info_value(info, "returnOnEquity")))
+        columns["roa"].append(_percent(_info_value(info, "returnOnAssets")))
+        columns["debt_to_equity"].append(_info_value(info, "debtToEquity"))
+        columns["current_ratio"].append(_info_value(info, "currentRatio"))
+        columns["revenue_growth"].append(_percent(_info_value(info, "revenueGrowth")))
+        columns["earnings_growth"].append(_percent(_info_value(info, "earningsGrowth")))
+        columns["dividend_yield"].append(_percent(_info_value(info, "dividendYield")))
+        columns["beta"].append(_info_value(info, "beta"))
+        for name, score in zip(CATEGORY_COLUMNS, category_scores):
+            columns[name].append(score)
+        columns["score_overall"].append(sum(category_scores) / len(category_scores))
+        columns["risk_overall"].append(risk.overall_risk)
+        for name in TECHNICAL_COLUMNS:
+            columns[name].append(np.nan)
+    return columns
+
+
+class FundamentalsIndex:
+    """
+    종목 × 필드 컬럼형 인덱스
+
+    컬럼마다 NumPy 배열 하나를 두므로 조건 필터는 배열 비교 몇 번, 정렬은 argsort 한 번으로
+    끝난다. 수백 종목 기준 조회는 밀리초 단위다. 빌드는 야간 스케줄러가 info 스냅샷
+    캐시로 수행하고, 기술적 지표 컬럼은 조회 시점의 지표 엔진 스냅샷에서 채운다.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self.queries = 0
+        self._technical_built_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        symbols = self._columns.get("symbol")
+        return len(symbols) if symbols is not None else 0
+
+    def build(self, infos: Dict[str, Dict], universe: List[Dict]) -> int:
+        """info 스냅샷들로 인덱스 재구성 (블로킹, 구성된 종목 수 반환)"""
+        started = time.perf_counter()
+        rows = build_rows(infos, universe)
+        columns: Dict[str, np.ndarray] = {}
+        for name, values in rows.items():
+            if name in TEXT_COLUMNS:
+                columns[name] = np.array(values, dtype=object)
+            else:
+                columns[name] = np.array(values, dtype=np.float64)
+        with self._lock:
+            self._columns = columns
+            self._technical_built_at = None
+            self.built_at = time.time()
+            self.build_seconds = round(time.perf_counter() - started, 3)
+        print(f"[FundamentalsIndex] {len(self)}개 종목 인덱스 구성 ({self.build_seconds}초)")
+        return len(self)
+
+    def _join_technical(self, columns: Dict[str, np.ndarray]) -> None:
+        """지표 엔진 스냅샷이 바뀌었으면 기술적 지표 컬럼 갱신 (스냅샷당 한 번)"""
+        snapshot = indicator_engine.snapshot
+        if snapshot is None or snapshot.built_at == self._technical_built_at:
+            return
+        positions = snapshot.positions(columns["symbol"])
+        found = positions >= 0
+        for name in TECHNICAL_COLUMNS:
+            values = np.full(len(positions), np.nan)
+            latest = snapshot.latest.get(name)
+            if latest is not None:
+                values[found] = latest[positions[found]]
+            columns[name] = values
+        self._technical_built_at = snapshot.built_at
+
+    def query(
+        self,
+        filters: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50
+    ) -> Dict[str, Any]:
+        """
+        조건 필터 + 정렬 + 페이지네이션
+
+        Args:
+            filters: ['roe>15', 'per<20', 'sector=Technology'] (모두 AND)
+            sort: 정렬 컬럼 ('-roe'처럼 앞에 '-'를 붙이면 내림차순, 값이 없는 종목은 항상 뒤)
+            page: 1부터 시작
+            page_size: 페이지당 종목 수
+
+        Raises:
+            ValueError: 조건/정렬 컬럼이 잘못됐을 때
+        """
+        started = time.perf_counter()
+        with self._lock:
+            columns = self._columns
+            if columns:
+                self._join_technical(columns)
+        self.queries += 1
+        total_symbols = len(columns.get("symbol", []))
+
+        mask = np.ones(total_symbols, dtype=bool)
+        for expression in filters or []:
+            column, op, raw = parse_filter(expression)
+            values = columns[column]
+            if column in TEXT_COLUMNS:
+                matched = np.char.lower(values.astype(str)) == raw.lower()
+                mask &= matched if op == "=" else ~matched
+                continue
+            try:
+                target = float(raw)
+            except ValueError:
+                raise ValueError(f"숫자 컬럼에는 숫자를 입력하세요: {expression}")
+            with np.errstate(invalid='ignore'):
+                if op == ">":
+                    mask &= values > target
+                elif op == ">=":
+                    mask &= values >= target
+                elif op == "<":
+                    mask &= values < target
+                elif op == "<=":
+                    mask &= values <= target
+                elif op == "=":
+                    mask &= values == target
+                else:
+                    mask &= values != target
+
+        selected = np.flatnonzero(mask)
+        if sort:
+            descending = sort.startswith("-")
+            column = sort.lstrip("-+")
+            if column not in NUMERIC_COLUMNS and column not in TEXT_COLUMNS:
+                raise ValueError(f"알 수 없는 정렬 컬럼입니다: {column}")
+            values = columns[column][selected]
+            if column in TEXT_COLUMNS:
+                order = np.argsort(values.astype(str), kind="stable")
+                if descending:
+                    order = order[::-1]
+            else:
+                # argsort는 NaN을 뒤로 보내므로 내림차순은 부호를 바꿔 정렬
+                order = np.argsort(-values if descending else values, kind="stable")
+            selected = selected[order]
+
+        page = max(page, 1)
+        start = (page - 1) * page_size
+        page_rows = selected[start:start + page_size]
+
+        results = []
+        for i in page_rows:
+            row: Dict[str, Any] = {name: columns[name][i] for name in TEXT_COLUMNS}
+            for name in NUMERIC_COLUMNS:
+                value = columns[name][i]
+                row[name] = round(float(value), 4) if np.isfinite(value) else None
+            results.append(row)
+
+        return {
+            "total": int(len(selected)),
+            "page": page,
+            "page_size": page_size,
+            "results": results,
+            "built_at": self.built_at,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "symbols": len(self),
+            "built_at": self.built_at,
+            "build_seconds": self.build_seconds,
+            "queries": self.queries,
+        }
+
+
+# 전역 펀더멘털 인덱스 인스턴스
+fundamentals_index = FundamentalsIndex()
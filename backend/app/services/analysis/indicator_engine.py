@@ -0,0 +1,270 @@
+"""
+종목 × 날짜 행렬 기반 기술적 지표 엔진 - 전체 종목을 한 번의 NumPy 연산으로 계산
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from app.services.data.price_store import price_store
+
+# 단순 이동평균 기간 (company 기술적 분석에서 사용하는 MA5~MA200)
+SMA_WINDOWS = (5, 10, 20, 50, 200)
+RSI_WINDOW = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_WINDOW, BOLLINGER_K = 20, 2.0
+ATR_WINDOW = 14
+STOCH_WINDOW, STOCH_SMOOTH = 14, 3
+LEVEL_WINDOW = 20  # 지지/저항선, 20일 등락률
+
+# 행렬 길이 (SMA200 + 여유분, 약 1년치 거래일)
+DEFAULT_LENGTH = 260
+
+
+# ------------------------------------------------------------
+# 행렬 연산 (axis=1이 시간 축, 앞쪽 NaN은 데이터가 짧은 종목의 패딩)
+# ------------------------------------------------------------
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """누적합 차분으로 구한 이동 합계 (창 안에 NaN이 있으면 NaN)"""
+    n, t = x.shape
+    out = np.full((n, t), np.nan)
+    if t < window:
+        return out
+    valid = ~np.isnan(x)
+    csum = np.zeros((n, t + 1))
+    np.cumsum(np.where(valid, x, 0.0), axis=1, out=csum[:, 1:])
+    ccount = np.zeros((n, t + 1))
+    np.cumsum(valid, axis=1, out=ccount[:, 1:])
+    sums = csum[:, window:] - csum[:, :-window]
+    counts = ccount[:, window:] - ccount[:, :-window]
+    out[:, window - 1:] = np.where(counts == window, sums, np.nan)
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """단순 이동평균"""
+    return rolling_sum(x, window) / window
+
+
+def rolling_reduce(x: np.ndarray, window: int, reducer) -> np.ndarray:
+    """창 단위 max/min/std 등 (창이 채워지지 않은 위치는 NaN)"""
+    n, t = x.shape
+    out = np.full((n, t), np.nan)
+    if t < window:
+        return out
+    out[:, window - 1:] = reducer(sliding_window_view(x, window, axis=1), axis=-1)
+    return out
+
+
+def ema(x: np.ndarray, span: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    지수이동평균 (pandas ewm(adjust=False)와 같은 재귀식)
+
+    시간 축 재귀는 피할 수 없으므로 날짜마다 한 번, 전체 종목 벡터에 대해 갱신한다.
+    각 종목의 첫 유효값에서 시작하고 중간 NaN은 직전 값을 유지한다.
+    """
+    if alpha is None:
+        alpha = 2.0 / (span + 1)
+    out = np.empty_like(x)
+    prev = np.full(x.shape[0], np.nan)
+    for i in range(x.shape[1]):
+        col = x[:, i]
+        prev = np.where(np.isnan(prev), col, np.where(np.isnan(col), prev, prev + alpha * (col - prev)))
+        out[:, i] = prev
+    return out
+
+
+def compute_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    close/high/low 행렬(종목 × 날짜)에서 전체 지표 행렬 계산
+
+    가격 차분, EMA12/26, 종가 이동합 같은 중간 결과는 한 번만 구해 여러 지표가 공유한다.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result: Dict[str, np.ndarray] = {"close": close}
+
+        # 이동평균 (SMA20은 볼린저 밴드 중심선으로 재사용)
+        for window in SMA_WINDOWS:
+            result[f"sma{window}"] = rolling_mean(close, window)
+
+        # RSI (14일 단순 평균 상승/하락폭 - 기존 기술적 분석과 같은 방식)
+        delta = np.full_like(close, np.nan)
+        delta[:, 1:] = np.diff(close, axis=1)
+        gain_sum = rolling_sum(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), RSI_WINDOW)
+        loss_sum = rolling_sum(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), RSI_WINDOW)
+        result["rsi14"] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+        # EMA / MACD
+        ema_fast = ema(close, span=MACD_FAST)
+        ema_slow = ema(close, span=MACD_SLOW)
+        macd = ema_fast - ema_slow
+        macd_signal = ema(macd, span=MACD_SIGNAL)
+        result["ema12"] = ema_fast
+        result["ema26"] = ema_slow
+        result["macd"] = macd
+        result["macd_signal"] = macd_signal
+        result["macd_hist"] = macd - macd_signal
+
+        # 볼린저 밴드 (모표준편차)
+        band = BOLLINGER_K * rolling_reduce(close, BOLLINGER_WINDOW, np.std)
+        middle = result[f"sma{BOLLINGER_WINDOW}"]
+        result["bb_middle"] = middle
+        result["bb_upper"] = middle + band
+        result["bb_lower"] = middle - band
+
+        # ATR (Wilder 평활, 전일 종가와 고가/저가로 구한 True Range)
+        prev_close = np.full_like(close, np.nan)
+        prev_close[:, 1:] = close[:, :-1]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        result["atr14"] = ema(true_range, alpha=1.0 / ATR_WINDOW)
+
+        # 스토캐스틱 %K(14) / %D(3)
+        highest = rolling_reduce(high, STOCH_WINDOW, np.max)
+        lowest = rolling_reduce(low, STOCH_WINDOW, np.min)
+        stoch_k = (close - lowest) / (highest - lowest) * 100.0
+        result["stoch_k"] = stoch_k
+        result["stoch_d"] = rolling_mean(stoch_k, STOCH_SMOOTH)
+
+        # 지지/저항선 및 20일 등락률 계산용
+        result["high20"] = rolling_reduce(high, LEVEL_WINDOW, np.max)
+        result["low20"] = rolling_reduce(low, LEVEL_WINDOW, np.min)
+        close_ago = np.full_like(close, np.nan)
+        close_ago[:, LEVEL_WINDOW - 1:] = close[:, :close.shape[1] - LEVEL_WINDOW + 1]
+        result["close_20_ago"] = close_ago
+
+    return result
+
+
+def _right_align(series: List[np.ndarray], length: int) -> np.ndarray:
+    """종목별 길이가 다른 시계열을 마지막 봉 기준으로 맞춘 행렬 (앞쪽은 NaN)"""
+    matrix = np.full((len(series), length), np.nan)
+    for row, values in enumerate(series):
+        values = np.asarray(values, dtype=np.float64)[-length:]
+        if len(values):
+            matrix[row, length - len(values):] = values
+    return matrix
+
+
+class IndicatorMatrix:
+    """
+    지표 계산 결과
+
+    행은 종목, 열은 각 종목의 마지막 봉을 기준으로 맞춘 최근 length개 봉이다.
+    (거래소마다 휴장일이 달라 날짜 기준으로 맞추면 중간에 빈 칸이 생기므로
+    봉 순서 기준으로 맞춘다. 마지막 열이 각 종목의 최신 값이다.)
+    """
+
+    def __init__(self, symbols: List[str], indicators: Dict[str, np.ndarray], bar_counts: np.ndarray):
+        self.symbols = symbols
+        self.indicators = indicators
+        self.bar_counts = bar_counts
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+        # 스크리너 등에서 바로 쓰도록 최신 값만 모은 열 벡터
+        self.latest: Dict[str, np.ndarray] = {name: values[:, -1] for name, values in indicators.items()}
+        self.built_at = time.time()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbols: List[str],
+        closes: List[np.ndarray],
+        highs: List[np.ndarray],
+        lows: List[np.ndarray],
+        length: int = DEFAULT_LENGTH
+    ) -> "IndicatorMatrix":
+        """종목별 종가/고가/저가 시계열로 행렬 구성 후 계산"""
+        close = _right_align(closes, length)
+        high = _right_align(highs, length)
+        low = _right_align(lows, length)
+        counts = np.array([min(len(c), length) for c in closes], dtype=np.int64)
+        return cls([symbol.upper() for symbol in symbols], compute_indicators(close, high, low), counts)
+
+    @classmethod
+    def from_bars(cls, bars: Dict[str, np.ndarray], length: int = DEFAULT_LENGTH) -> "IndicatorMatrix":
+        """PriceStore 봉 배열(BAR_DTYPE)들로 행렬 구성 후 계산"""
+        records = list(bars.values())
+        return cls.from_arrays(
+            list(bars),
+            [r['close'] for r in records],
+            [r['high'] for r in records],
+            [r['low'] for r in records],
+            length
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._index
+
+    def positions(self, symbols: Iterable[str]) -> np.ndarray:
+        """심볼 목록의 행 번호 (없는 종목은 -1)"""
+        return np.array([self._index.get(str(symbol).upper(), -1) for symbol in symbols], dtype=np.int64)
+
+    def row(self, symbol: str) -> Optional[Dict[str, Optional[float]]]:
+        """한 종목의 최신 지표 값 (계산되지 않은 값은 None)"""
+        index = self._index.get(symbol.upper())
+        if index is None:
+            return None
+        row: Dict[str, Optional[float]] = {"bars": int(self.bar_counts[index])}
+        for name, values in self.latest.items():
+            value = values[index]
+            row[name] = float(value) if np.isfinite(value) else None
+        return row
+
+
+class IndicatorEngine:
+    """
+    전체 종목 지표 스냅샷 관리
+
+    rebuild()가 로컬 가격 저장소의 일봉을 읽어 전 종목 행렬을 다시 계산하고,
+    /company는 row()로 자기 행만 읽는다. 블로킹이므로 게이트웨이 스레드에서 호출한다.
+    """
+
+    def __init__(self, length: int = DEFAULT_LENGTH):
+        self.length = length
+        self._snapshot: Optional[IndicatorMatrix] = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+        self.last_build_seconds: Optional[float] = None
+
+    @property
+    def snapshot(self) -> Optional[IndicatorMatrix]:
+        """가장 최근 계산된 전체 행렬"""
+        return self._snapshot
+
+    def rebuild(self, symbols: Iterable[str]) -> IndicatorMatrix:
+        """로컬 저장소 일봉으로 전체 행렬 재계산 (업스트림 호출 없음)"""
+        started = time.perf_counter()
+        bars = {}
+        for symbol in symbols:
+            records = price_store.get_bars(symbol, period="max", refresh=False)
+            if len(records):
+                bars[symbol] = records
+        snapshot = IndicatorMatrix.from_bars(bars, self.length)
+        with self._lock:
+            self._snapshot = snapshot
+            self.rebuilds += 1
+            self.last_build_seconds = round(time.perf_counter() - started, 3)
+        return snapshot
+
+    def row(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Optional[float]]]:
+        """스냅샷에서 한 종목의 최신 지표 조회 (없거나 max_age보다 오래됐으면 None)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if max_age is not None and time.time() - snapshot.built_at > max_age:
+            return None
+        return snapshot.row(symbol)
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            "symbols": len(snapshot.symbols) if snapshot else 0,
+            "length": self.length,
+            "rebuilds": self.rebuilds,
+            "last_build_seconds": self.last_build_seconds,
+            "built_at": snapshot.built_at if snapshot else None,
+        }
+
+
+# 전역 지표 엔진 인스턴스
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,428 @@
+"""
+종목별 증분 지표 상태 - 새 봉이 추가될 때 O(1)로 RSI/MACD/이동평균 등을 갱신
+"""
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.services.analysis.indicator_engine import (
+    SMA_WINDOWS, RSI_WINDOW, MACD_FAST, MACD_SLOW, MACD_SIGNAL,
+    BOLLINGER_WINDOW, BOLLINGER_K, ATR_WINDOW, STOCH_WINDOW, STOCH_SMOOTH, LEVEL_WINDOW,
+)
+from app.services.data.price_store import price_store, symbol_filename
+
+STATE_VERSION = 1
+
+# 저장된 기준 봉과 가격 저장소가 이 이상 다르면 수정주가가 바뀐 것으로 보고 재구성
+_ADJUSTMENT_TOLERANCE = 1e-4
+
+
+class RingBuffer:
+    """고정 크기 원형 버퍼 (push/ago 모두 O(1))"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._data: List[Optional[float]] = [None] * size
+        self._pos = 0
+        self.count = 0
+
+    def push(self, value: Optional[float]) -> None:
+        self._data[self._pos] = value
+        self._pos = (self._pos + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def ago(self, k: int) -> Optional[float]:
+        """k봉 전 값 (0 = 가장 최근)"""
+        return self._data[(self._pos - 1 - k) % self.size]
+
+    def latest(self, n: int) -> List[Optional[float]]:
+        """최근 n개 값 (최신순)"""
+        return [self.ago(k) for k in range(min(n, self.count))]
+
+    def to_list(self) -> List[Optional[float]]:
+        """오래된 순서의 값 목록"""
+        return [self.ago(k) for k in reversed(range(self.count))]
+
+    @classmethod
+    def from_list(cls, size: int, values: List[Optional[float]]) -> "RingBuffer":
+        ring = cls(size)
+        for value in values[-size:]:
+            ring.push(value)
+        return ring
+
+
+def _window_max(ring: RingBuffer, window: int) -> Optional[float]:
+    if ring.count < window:
+        return None
+    return max(ring.latest(window))
+
+
+def _window_min(ring: RingBuffer, window: int) -> Optional[float]:
+    if ring.count < window:
+        return None
+    return min(ring.latest(window))
+
+
+class IndicatorState:
+    """
+    한 종목의 지표 누적 상태
+
+    - 이동평균/볼린저: 최근 200개 종가 원형 버퍼 + 기간별 이동 합계(제곱합)
+    - RSI(14): 최근 14개 상승/하락폭 원형 버퍼 + 이동 합계
+    - EMA12/26, MACD 시그널(9), ATR(14, Wilder): 직전 값 하나
+    - 스토캐스틱/지지·저항선: 최근 20개 고가/저가, 최근 3개 %K 원형 버퍼
+
+    새 봉 하나를 반영하는 비용은 창 크기(최대 20)에만 비례하고 히스토리 길이와 무관하다.
+    장중에 마지막 봉이 다시 들어오면 직전 봉까지의 상태(previous)로 되돌린 뒤 다시 반영한다.
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self.last_date: Optional[int] = None
+        self.last_close: Optional[float] = None
+        self.last_high: Optional[float] = None
+        self.last_low: Optional[float] = None
+        self.closes = RingBuffer(max(SMA_WINDOWS))
+        self.sums: Dict[int, float] = {window: 0.0 for window in SMA_WINDOWS}
+        self.sum_squares = 0.0  # 볼린저 기간 종가 제곱합
+        self.gains = RingBuffer(RSI_WINDOW)
+        self.losses = RingBuffer(RSI_WINDOW)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.macd_signal: Optional[float] = None
+        self.atr: Optional[float] = None
+        self.highs = RingBuffer(LEVEL_WINDOW)
+        self.lows = RingBuffer(LEVEL_WINDOW)
+        self.stoch = RingBuffer(STOCH_SMOOTH)
+        self.previous: Optional[Dict] = None  # 마지막 봉 반영 전 상태 (to_dict 형식)
+
+    # ------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------
+
+    def _apply(self, high: float, low: float, close: float) -> None:
+        """봉 하나 반영 (O(창 크기))"""
+        prev_close = self.last_close
+
+        # RSI 상승/하락폭 (원형 버퍼에서 밀려나는 값을 합계에서 뺌)
+        if prev_close is not None:
+            delta = close - prev_close
+            if self.gains.count == RSI_WINDOW:
+                self.gain_sum -= self.gains.ago(RSI_WINDOW - 1)
+                self.loss_sum -= self.losses.ago(RSI_WINDOW - 1)
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self.gains.push(gain)
+            self.losses.push(loss)
+            self.gain_sum += gain
+            self.loss_sum += loss
+
+        # 이동평균 / 볼린저 제곱합
+        for window in SMA_WINDOWS:
+            if self.closes.count >= window:
+                self.sums[window] -= self.closes.ago(window - 1)
+        if self.closes.count >= BOLLINGER_WINDOW:
+            self.sum_squares -= self.closes.ago(BOLLINGER_WINDOW - 1) ** 2
+        self.closes.push(close)
+        for window in SMA_WINDOWS:
+            self.sums[window] += close
+        self.sum_squares += close * close
+
+        # EMA / MACD (pandas ewm(adjust=False)와 같은 재귀식)
+        alpha_fast = 2.0 / (MACD_FAST + 1)
+        alpha_slow = 2.0 / (MACD_SLOW + 1)
+        alpha_signal = 2.0 / (MACD_SIGNAL + 1)
+        self.ema_fast = close if self.ema_fast is None else self.ema_fast + alpha_fast * (close - self.ema_fast)
+        self.ema_slow = close if self.ema_slow is None else self.ema_slow + alpha_slow * (close - self.ema_slow)
+        macd = self.ema_fast - self.ema_slow
+        self.macd_signal = macd if self.macd_signal is None else self.macd_signal + alpha_signal * (macd - self.macd_signal)
+
+        # ATR (Wilder 평활)
+        true_range = high - low
+        if prev_close is not None:
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        self.atr = true_range if self.atr is None else self.atr + (true_range - self.atr) / ATR_WINDOW
+
+        # 스토캐스틱 %K
+        self.highs.push(high)
+        self.lows.push(low)
+        highest = _window_max(self.highs, STOCH_WINDOW)
+        lowest = _window_min(self.lows, STOCH_WINDOW)
+        if highest is not None and highest > lowest:
+            self.stoch.push((close - lowest) / (highest - lowest) * 100.0)
+        elif highest is not None:
+            self.stoch.push(None)
+
+        self.bars += 1
+        self.last_close = close
+        self.last_high = high
+        self.last_low = low
+
+    def update(self, date: int, high: float, low: float, close: float) -> bool:
+        """
+        봉 하나 반영
+
+        Args:
+            date: 1970-01-01 기준 일수 (PriceStore BAR_DTYPE 'date')
+
+        Returns:
+            상태가 바뀌었으면 True
+        """
+        if self.last_date is not None:
+            if date < self.last_date:
+                return False
+            if date == self.last_date:
+                if (close, high, low) == (self.last_close, self.last_high, self.last_low):
+                    return False
+                # 마지막(미완성) 봉 교체: 직전 봉까지의 상태로 되돌린 뒤 다시 반영
+                previous = self.previous
+                self._restore(previous or IndicatorState().to_dict())
+                self.previous = previous
+                self._apply(high, low, close)
+                self.last_date = date
+                return True
+        self.previous = self.to_dict()
+        self._apply(high, low, close)
+        self.last_date = date
+        return True
+
+    @classmethod
+    def from_bars(cls, bars) -> "IndicatorState":
+        """저장된 봉 전체로 상태 구성 (최초 1회 또는 수정주가 변경 시에만 O(히스토리))"""
+        state = cls()
+        for bar in bars:
+            state.update(int(bar['date']), float(bar['high']), float(bar['low']), float(bar['close']))
+        return state
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    def row(self) -> Dict[str, Optional[float]]:
+        """IndicatorMatrix.row()와 같은 형식의 최신 지표 값"""
+        close = self.last_close
+        row: Dict[str, Optional[float]] = {"bars": self.bars, "close": close}
+
+        for window in SMA_WINDOWS:
+            row[f"sma{window}"] = self.sums[window] / window if self.closes.count >= window else None
+
+        if self.gains.count >= RSI_WINDOW:
+            gain_sum = max(self.gain_sum, 0.0)
+            loss_sum = max(self.loss_sum, 0.0)
+            if loss_sum > 0:
+                row["rsi14"] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+            else:
+                row["rsi14"] = 100.0 if gain_sum > 0 else None
+        else:
+            row["rsi14"] = None
+
+        macd = self.ema_fast - self.ema_slow if self.ema_fast is not None else None
+        row["ema12"] = self.ema_fast
+        row["ema26"] = self.ema_slow
+        row["macd"] = macd
+        row["macd_signal"] = self.macd_signal
+        row["macd_hist"] = macd - self.macd_signal if macd is not None else None
+
+        middle = row[f"sma{BOLLINGER_WINDOW}"]
+        if middle is not None:
+            variance = max(self.sum_squares / BOLLINGER_WINDOW - middle * middle, 0.0)
+            band = BOLLINGER_K * math.sqrt(variance)
+            row["bb_middle"] = middle
+            row["bb_upper"] = middle + band
+            row["bb_lower"] = middle - band
+        else:
+            row["bb_middle"] = row["bb_upper"] = row["bb_lower"] = None
+
+        row["atr14"] = self.atr if self.bars >= 2 else None
+
+        stoch_recent = self.stoch.latest(STOCH_SMOOTH)
+        row["stoch_k"] = stoch_recent[0] if stoch_recent else None
+        if len(stoch_recent) == STOCH_SMOOTH and None not in stoch_recent:
+            row["stoch_d"] = sum(stoch_recent) / STOCH_SMOOTH
+        else:
+            row["stoch_d"] = None
+
+        row["high20"] = _window_max(self.highs, LEVEL_WINDOW)
+        row["low20"] = _window_min(self.lows, LEVEL_WINDOW)
+        row["close_20_ago"] = self.closes.ago(LEVEL_WINDOW - 1) if self.closes.count >= LEVEL_WINDOW else None
+        return row
+
+    # ------------------------------------------------------------
+    # 직렬화
+    # ------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """previous를 제외한 상태"""
+        return {
+            "bars": self.bars,
+            "last_date": self.last_date,
+            "last_close": self.last_close,
+            "last_high": self.last_high,
+            "last_low": self.last_low,
+            "closes": self.closes.to_list(),
+            "sums": {str(window): value for window, value in self.sums.items()},
+            "sum_squares": self.sum_squares,
+            "gains": self.gains.to_list(),
+            "losses": self.losses.to_list(),
+            "gain_sum": self.gain_sum,
+            "loss_sum": self.loss_sum,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "macd_signal": self.macd_signal,
+            "atr": self.atr,
+            "highs": self.highs.to_list(),
+            "lows": self.lows.to_list(),
+            "stoch": self.stoch.to_list(),
+        }
+
+    def _restore(self, data: Dict) -> None:
+        self.bars = data["bars"]
+        self.last_date = data["last_date"]
+        self.last_close = data["last_close"]
+        self.last_high = data["last_high"]
+        self.last_low = data["last_low"]
+        self.closes = RingBuffer.from_list(max(SMA_WINDOWS), data["closes"])
+        self.sums = {int(window): value for window, value in data["sums"].items()}
+        self.sum_squares = data["sum_squares"]
+        self.gains = RingBuffer.from_list(RSI_WINDOW, data["gains"])
+        self.losses = RingBuffer.from_list(RSI_WINDOW, data["losses"])
+        self.gain_sum = data["gain_sum"]
+        self.loss_sum = data["loss_sum"]
+        self.ema_fast = data["ema_fast"]
+        self.ema_slow = data["ema_slow"]
+        self.macd_signal = data["macd_signal"]
+        self.atr = data["atr"]
+        self.highs = RingBuffer.from_list(LEVEL_WINDOW, data["highs"])
+        self.lows = RingBuffer.from_list(LEVEL_WINDOW, data["lows"])
+        self.stoch = RingBuffer.from_list(STOCH_SMOOTH, data["stoch"])
+
+    @classmethod
+    def from_dict(cls, data: Dict, previous: Optional[Dict] = None) -> "IndicatorState":
+        state = cls()
+        state._restore(data)
+        state.previous = previous
+        return state
+
+
+class IndicatorStateStore:
+    """
+    종목별 증분 지표 상태 저장소
+
+    조회 시 가격 저장소에서 마지막으로 반영한 봉 이후의 꼬리만 읽어 상태에 반영하고
+    JSON 파일로 저장한다. 직전 봉(previous)의 종가가 가격 저장소와 달라졌으면
+    (분할/배당으로 수정주가가 바뀐 경우) 전체 봉으로 한 번 다시 구성한다.
+    모든 메서드는 블로킹이므로 MarketDataGateway 스레드 풀에서 호출해야 한다.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir or settings.INDICATOR_STATE_DIR
+        self._states: Dict[str, IndicatorState] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.bars_applied = 0
+        self.rebuilds = 0
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.data_dir, f"{symbol_filename(symbol)}.json")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(symbol)
+            if lock is None:
+                lock = self._locks[symbol] = threading.Lock()
+            return lock
+
+    def _load(self, symbol: str) -> Optional[IndicatorState]:
+        state = self._states.get(symbol)
+        if state is not None:
+            return state
+        try:
+            with open(self._path(symbol), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION:
+                return None
+            return IndicatorState.from_dict(data["state"], data.get("previous"))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, symbol: str, state: IndicatorState) -> None:
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = self._path(symbol)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "state": state.to_dict(), "previous": state.previous}, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _anchor_matches(state: IndicatorState, tail) -> bool:
+        """직전 봉 종가가 가격 저장소와 같은지 (수정주가 변경 감지)"""
+        previous = state.previous
+        if not previous or previous.get("last_date") is None:
+            return False
+        anchor = tail[tail['date'] == previous["last_date"]]
+        if not len(anchor):
+            return False
+        stored = previous["last_close"]
+        return abs(float(anchor['close'][0]) - stored) <= _ADJUSTMENT_TOLERANCE * abs(stored)
+
+    def get(self, symbol: str, refresh: bool = True) -> Optional[IndicatorState]:
+        """
+        최신 봉까지 반영된 상태 조회
+
+        Args:
+            refresh: True면 가격 저장소 꼬리 구간 동기화 후 반영
+        """
+        symbol = symbol.upper()
+        if refresh:
+            try:
+                price_store.sync(symbol)
+            except Exception as e:
+                print(f"[IndicatorState] {symbol} 동기화 실패 (로컬 데이터 사용): {e}")
+
+        with self._lock(symbol):
+            state = self._load(symbol)
+            changed = False
+            tail = None
+            if state is not None and state.previous:
+                tail = price_store.get_bars_since(symbol, state.previous["last_date"])
+            if state is None or tail is None or not self._anchor_matches(state, tail):
+                bars = price_store.get_bars(symbol, period="max", refresh=False)
+                if not len(bars):
+                    return None
+                state = IndicatorState.from_bars(bars)
+                self.rebuilds += 1
+                self.bars_applied += len(bars)
+                changed = True
+            else:
+                for bar in tail[tail['date'] >= state.last_date]:
+                    if state.update(int(bar['date']), float(bar['high']), float(bar['low']), float(bar['close'])):
+                        self.bars_applied += 1
+                        changed = True
+
+            self._states[symbol] = state
+            if changed:
+                try:
+                    self._save(symbol, state)
+                except OSError as e:
+                    print(f"[IndicatorState] {symbol} 상태 저장 실패: {e}")
+            return state
+
+    def row(self, symbol: str, refresh: bool = True) -> Optional[Dict[str, Optional[float]]]:
+        """최신 지표 값 (IndicatorMatrix.row()와 같은 형식)"""
+        state = self.get(symbol, refresh=refresh)
+        return state.row() if state is not None else None
+
+    def stats(self) -> Dict:
+        return {
+            "data_dir": self.data_dir,
+            "symbols_loaded": len(self._states),
+            "bars_applied": self.bars_applied,
+            "rebuilds": self.rebuilds,
+        }
+
+
+# 전역 증분 지표 상태 인스턴스
+indicator_states = IndicatorStateStore()
@@ -0,0 +1,101 @@
+"""
+포트폴리오 몬테카를로 시뮬레이션 - 과거 일간 수익률 재표본추출로 미래 경로 생성
+"""
+from typing import Dict, List, Optional
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+# 응답에 담을 밴드 시점 수 (horizon이 길어도 차트용으로 이 정도면 충분)
+BAND_POINTS = 60
+METHODS = ("bootstrap", "normal")
+
+
+def band_steps(horizon: int) -> np.ndarray:
+    """밴드를 기록할 시점 (1..horizon 중 최대 BAND_POINTS개, 마지막 날 포함)"""
+    return np.unique(np.linspace(1, horizon, min(horizon, BAND_POINTS)).round().astype(np.int64))
+
+
+def simulate_chunk(
+    portfolio_returns: np.ndarray,
+    paths: int,
+    horizon: int,
+    method: str,
+    seed: Optional[np.random.SeedSequence]
+) -> Dict[str, np.ndarray]:
+    """
+    경로 paths개 × horizon일 시뮬레이션 (프로세스 풀 워커에서 실행되는 최상위 함수)
+
+    bootstrap은 과거 포트폴리오 일간 수익률을 복원추출하고 (같은 날 종목 간 상관관계 유지),
+    normal은 과거 평균/표준편차의 정규분포에서 뽑는다.
+
+    Returns:
+        final: 경로별 누적 수익률, max_drawdown: 경로별 최대 낙폭, bands: 밴드 시점의 자산 배수 (float32)
+    """
+    rng = np.random.default_rng(seed)
+    if method == "normal":
+        daily = rng.normal(portfolio_returns.mean(), portfolio_returns.std(ddof=1), size=(paths, horizon))
+    else:
+        daily = portfolio_returns[rng.integers(0, len(portfolio_returns), size=(paths, horizon))]
+
+    wealth = np.cumprod(1.0 + daily, axis=1)
+    peak = np.maximum.accumulate(np.maximum(wealth, 1.0), axis=1)
+    max_drawdown = (1.0 - wealth / peak).max(axis=1)
+    return {
+        "final": wealth[:, -1] - 1.0,
+        "max_drawdown": max_drawdown,
+        "bands": wealth[:, band_steps(horizon) - 1].astype(np.float32),
+    }
+
+
+def split_paths(paths: int, chunk_size: int) -> List[int]:
+    """경로 수를 chunk_size 단위로 나눔"""
+    chunks = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        chunks.append(paths % chunk_size)
+    return chunks
+
+
+def chunk_seeds(seed: int, count: int) -> List[np.random.SeedSequence]:
+    """
+    청크별 독립 난수 시드
+
+    청크마다 SeedSequence를 따로 두므로 같은 seed와 청크 구성이면 워커 배정이나 완료 순서와
+    상관없이 결과가 재현된다.
+    """
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+def summarize(chunks: List[Dict[str, np.ndarray]], horizon: int) -> Dict:
+    """청크 결과를 합쳐 백분위 밴드와 최종 수익률/낙폭 분포 계산"""
+    final = np.concatenate([chunk["final"] for chunk in chunks])
+    max_drawdown = np.concatenate([chunk["max_drawdown"] for chunk in chunks])
+    bands = np.concatenate([chunk["bands"] for chunk in chunks])
+
+    steps = band_steps(horizon)
+    band_values = np.percentile(bands, PERCENTILES, axis=0) - 1.0
+    final_values = np.percentile(final, PERCENTILES)
+    drawdown_values = np.percentile(max_drawdown, PERCENTILES)
+
+    counts, edges = np.histogram(max_drawdown, bins=20, range=(0.0, max(float(max_drawdown.max()), 1e-9)))
+
+    return {
+        "paths": int(len(final)),
+        "horizon_days": horizon,
+        "bands": {
+            "days": steps.tolist(),
+            **{f"p{p}": np.round(values * 100, 2).tolist() for p, values in zip(PERCENTILES, band_values)},
+        },
+        "final_return": {
+            "mean": round(float(final.mean()) * 100, 2),
+            "probability_of_loss": round(float((final < 0).mean()) * 100, 2),
+            **{f"p{p}": round(float(value) * 100, 2) for p, value in zip(PERCENTILES, final_values)},
+        },
+        "max_drawdown": {
+            "mean": round(float(max_drawdown.mean()) * 100, 2),
+            **{f"p{p}": round(float(value) * 100, 2) for p, value in zip(PERCENTILES, drawdown_values)},
+            "histogram": {
+                "edges": np.round(edges * 100, 2).tolist(),
+                "counts": counts.tolist(),
+            },
+        },
+    }
@@ -0,0 +1,255 @@
+"""
+포트폴리오 리스크 엔진 - 보유 종목 일간 수익률 행렬 기반 변동성/베타/VaR/상관관계
+"""
+import threading
+import time
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.data.price_store import price_store
+
+TRADING_DAYS = 252
+CONFIDENCE_LEVELS = (0.95, 0.99)
+US_BENCHMARK = "^GSPC"
+KR_BENCHMARK = "^KS11"
+
+
+def benchmark_for(symbol: str) -> str:
+    """종목 시장 지수 (한국 종목은 KOSPI, 나머지는 S&P 500)"""
+    return KR_BENCHMARK if symbol.upper().endswith((".KS", ".KQ")) else US_BENCHMARK
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """시간 축(axis=0) 방향 NaN 앞 값 채우기 (앞쪽 NaN은 그대로)"""
+    valid = ~np.isnan(matrix)
+    index = np.where(valid, np.arange(matrix.shape[0])[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = matrix[index, np.arange(matrix.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+class ReturnsMatrix:
+    """
+    날짜 × 종목 일간 수익률 행렬 (보유 종목 + 시장 지수)
+
+    거래소마다 휴장일이 다르므로 전체 날짜의 합집합에 맞춘 뒤 종가를 앞 값으로 채우고
+    (휴장일 수익률 0), 모든 열에 값이 있는 구간만 남긴다. 수익률은 각 시장 현지 통화 기준이다.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        benchmarks: List[str],
+        dates: np.ndarray,
+        returns: np.ndarray,
+        last_close: np.ndarray,
+        missing: List[str]
+    ):
+        self.symbols = symbols
+        self.benchmarks = benchmarks
+        self.dates = dates
+        self.returns = returns[:, :len(symbols)]
+        self.benchmark_returns = returns[:, len(symbols):]
+        self.last_close = last_close[:len(symbols)]
+        self.missing = missing
+        self.built_at = time.time()
+
+    @classmethod
+    def build(cls, symbols: Sequence[str], lookback: int) -> "ReturnsMatrix":
+        """로컬 가격 저장소 일봉으로 행렬 구성 (필요 시 꼬리 구간 동기화 - 블로킹)"""
+        symbols = [symbol.upper() for symbol in symbols]
+        benchmarks = sorted({US_BENCHMARK} | {benchmark_for(symbol) for symbol in symbols})
+        # 거래일 lookback개를 채울 만큼의 달력일 (주말/휴장일 여유분 포함)
+        period = f"{int(lookback * 1.5) + 10}d"
+
+        loaded: Dict[str, np.ndarray] = {}
+        missing = []
+        for symbol in symbols + benchmarks:
+            try:
+                bars = price_store.get_bars(symbol, period=period)
+            except Exception as e:
+                print(f"[PortfolioRisk] {symbol} 일봉 조회 실패: {e}")
+                bars = None
+            if bars is None or len(bars) < 2:
+                missing.append(symbol)
+                continue
+            loaded[symbol] = bars
+
+        kept = [symbol for symbol in symbols if symbol in loaded]
+        kept_benchmarks = [symbol for symbol in benchmarks if symbol in loaded]
+        columns = kept + kept_benchmarks
+        if not kept:
+            empty = np.empty((0, len(columns)))
+            return cls(kept, kept_benchmarks, np.empty(0, dtype="datetime64[D]"), empty, np.empty(0), missing)
+
+        dates = np.unique(np.concatenate([loaded[symbol]['date'] for symbol in columns]))
+        closes = np.full((len(dates), len(columns)), np.nan)
+        for column, symbol in enumerate(columns):
+            bars = loaded[symbol]
+            closes[np.searchsorted(dates, bars['date']), column] = bars['close']
+
+        closes = forward_fill(closes)
+        complete = np.flatnonzero(~np.isnan(closes).any(axis=1))
+        closes = closes[complete[0]:] if len(complete) else closes[:0]
+        dates = dates[complete[0]:] if len(complete) else dates[:0]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = closes[1:] / closes[:-1] - 1.0
+        returns = returns[-lookback:]
+        return_dates = dates[1:][-lookback:].astype("datetime64[D]")
+        last_close = closes[-1] if len(closes) else np.full(len(columns), np.nan)
+        return cls(kept, kept_benchmarks, return_dates, returns, last_close, missing)
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+
+def compute_risk(matrix: ReturnsMatrix, weights: np.ndarray, portfolio_value: float) -> Dict:
+    """
+    수익률 행렬과 비중으로 포트폴리오 리스크 지표 계산
+
+    Args:
+        matrix: 보유 종목 수익률 행렬
+        weights: matrix.symbols 순서의 비중 (합 1)
+        portfolio_value: VaR/CVaR 금액 환산용 평가금액
+
+    Returns:
+        portfolio(변동성, 베타, VaR/CVaR), holdings(종목별 변동성/베타), correlation
+    """
+    returns = matrix.returns
+    observations = len(returns)
+    portfolio_returns = returns @ weights
+
+    # 변동성 (연율화)
+    scale = np.sqrt(TRADING_DAYS)
+    volatilities = returns.std(axis=0, ddof=1) * scale
+    portfolio_volatility = float(portfolio_returns.std(ddof=1) * scale)
+    weighted_volatility = float(volatilities @ weights)
+
+    # 베타: 중심화한 행렬곱 한 번으로 전 종목 × 전 지수 공분산
+    centered = returns - returns.mean(axis=0)
+    benchmark_centered = matrix.benchmark_returns - matrix.benchmark_returns.mean(axis=0)
+    benchmark_variance = (benchmark_centered ** 2).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        betas = (centered.T @ benchmark_centered) / benchmark_variance
+    benchmark_index = {symbol: i for i, symbol in enumerate(matrix.benchmarks)}
+    portfolio_beta = weights @ betas
+
+    # VaR / CVaR (1일, 손실을 양수로 표시)
+    mean = float(portfolio_returns.mean())
+    sigma = float(portfolio_returns.std(ddof=1))
+    normal = NormalDist()
+    value_at_risk = {}
+    for level in CONFIDENCE_LEVELS:
+        tail = 1.0 - level
+        threshold = np.quantile(portfolio_returns, tail)
+        historical_var = -float(threshold)
+        historical_cvar = -float(portfolio_returns[portfolio_returns <= threshold].mean())
+        z = normal.inv_cdf(tail)
+        parametric_var = -(mean + z * sigma)
+        parametric_cvar = -(mean - sigma * normal.pdf(z) / tail)
+        value_at_risk[f"{int(level * 100)}"] = {
+            "historical_var": _pct(historical_var),
+            "historical_cvar": _pct(historical_cvar),
+            "parametric_var": _pct(parametric_var),
+            "parametric_cvar": _pct(parametric_cvar),
+            "historical_var_amount": round(historical_var * portfolio_value, 2),
+            "parametric_var_amount": round(parametric_var * portfolio_value, 2),
+        }
+
+    correlation = np.corrcoef(returns, rowvar=False) if len(matrix.symbols) > 1 else np.ones((1, 1))
+
+    holdings = []
+    for i, symbol in enumerate(matrix.symbols):
+        benchmark = benchmark_for(symbol)
+        column = benchmark_index.get(benchmark)
+        holdings.append({
+            "symbol": symbol,
+            "weight": _round(weights[i]),
+            "volatility": _pct(volatilities[i]),
+            "benchmark": benchmark,
+            "beta": _round(betas[i, column]) if column is not None else None,
+        })
+
+    return {
+        "observations": observations,
+        "start": str(matrix.dates[0]) if observations else None,
+        "end": str(matrix.dates[-1]) if observations else None,
+        "portfolio": {
+            "value": round(portfolio_value, 2),
+            "volatility": _pct(portfolio_volatility),
+            "weighted_volatility": _pct(weighted_volatility),
+            "diversification_ratio": _round(weighted_volatility / portfolio_volatility) if portfolio_volatility else None,
+            "beta": {symbol: _round(portfolio_beta[i]) for i, symbol in enumerate(matrix.benchmarks)},
+            "var": value_at_risk,
+        },
+        "holdings": holdings,
+        "correlation": {
+            "symbols": matrix.symbols,
+            "matrix": np.where(np.isfinite(correlation), np.round(correlation, 4), None).tolist(),
+        },
+    }
+
+
+def _round(value, digits: int = 4) -> Optional[float]:
+    value = float(value)
+    return round(value, digits) if np.isfinite(value) else None
+
+
+def _pct(value) -> Optional[float]:
+    """비율 → % (소수점 2자리)"""
+    value = float(value)
+    return round(value * 100, 2) if np.isfinite(value) else None
+
+
+class RiskEngine:
+    """
+    종목 조합별 수익률 행렬 캐시
+
+    행렬은 보유 수량과 무관하므로 종목 집합을 키로 캐시하고, 비중은 요청마다
+    곱하기만 한다. 캐시 적중 시 리스크 계산은 수백 × 수십 행렬 연산 몇 번이다.
+    """
+
+    def __init__(self, lookback: Optional[int] = None, ttl: Optional[float] = None, maxsize: Optional[int] = None):
+        self.lookback = lookback or settings.RISK_LOOKBACK_DAYS
+        self._cache = TTLCache(
+            maxsize=maxsize or settings.RISK_MATRIX_CACHE_SIZE,
+            ttl=ttl or settings.RISK_MATRIX_TTL
+        )
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.last_build_seconds: Optional[float] = None
+
+    @staticmethod
+    def key(symbols: Sequence[str]) -> Tuple[str, ...]:
+        return tuple(sorted({symbol.upper() for symbol in symbols}))
+
+    def peek(self, symbols: Sequence[str]) -> Optional[ReturnsMatrix]:
+        """캐시된 행렬만 조회"""
+        return self._cache.get(self.key(symbols))
+
+    def build(self, symbols: Sequence[str]) -> ReturnsMatrix:
+        """행렬 구성 후 캐시 (블로킹이므로 게이트웨이 스레드에서 호출)"""
+        key = self.key(symbols)
+        started = time.perf_counter()
+        matrix = ReturnsMatrix.build(key, self.lookback)
+        self._cache.set(key, matrix)
+        with self._lock:
+            self.builds += 1
+            self.last_build_seconds = round(time.perf_counter() - started, 3)
+        return matrix
+
+    def stats(self) -> Dict:
+        return {
+            "lookback_days": self.lookback,
+            "builds": self.builds,
+            "last_build_seconds": self.last_build_seconds,
+            "cache": self._cache.stats(),
+        }
+
+
+# 전역 리스크 엔진 인스턴스
+risk_engine = RiskEngine()
@@ -5,5 +5,16 @@ from app.services.data.yahoo_finance import YahooFinanceDataProvider
 from app.services.data.alpha_vantage import AlphaVantageDataProvider
 from app.services.data.fred_api import FREDDataProvider
 from app.services.data.fmp_economic import FMPEconomicProvider
+from app.services.data.market_data_gateway import MarketDataGateway, market_data_gateway
+from app.services.data.quote_poller import QuotePoller, quote_poller
 
-__all__ = ["YahooFinanceDataProvider", "AlphaVantageDataProvider", "FREDDataProvider", "FMPEconomicProvider"]
+__all__ = [
+    "YahooFinanceDataProvider",
+    "AlphaVantageDataProvider",
+    "FREDDataProvider",
+    "FMPEconomicProvider",
+    "MarketDataGateway",
+    "market_data_gateway",
+    "QuotePoller",
+    "quote_poller",
+]
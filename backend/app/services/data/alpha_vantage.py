@@ -1,20 +1,23 @@
 """
 Alpha Vantage API를 통한 주식 데이터 수집 모듈
 """
-import httpx
 import pandas as pd
 from typing import List, Optional, Dict
 from app.core.config import settings
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class AlphaVantageDataProvider:
     """Alpha Vantage API를 통한 주식 데이터 제공자"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.name = "Alpha Vantage"
         self.api_key = settings.ALPHA_VANTAGE_API_KEY
         self.base_url = "https://www.alphavantage.co/query"
     
+    @coalesce()
     async def get_candles(
         self,
         symbol: str,
@@ -44,7 +47,7 @@ class AlphaVantageDataProvider:
             elif interval in ["1min", "5min", "15min", "30min", "60min"]:
                 function = f"TIME_SERIES_INTRADAY&interval={interval}"
             
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     self.base_url,
                     params={
@@ -92,13 +95,14 @@ class AlphaVantageDataProvider:
             print(f"[AlphaVantage] Error fetching data for {symbol}: {e}")
             return []
     
+    @coalesce()
     async def get_dividend_data(self, symbol: str) -> Optional[Dict]:
         """배당 데이터 조회"""
         if not self.api_key:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     self.base_url,
                     params={
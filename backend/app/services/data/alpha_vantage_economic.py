@@ -2,16 +2,18 @@
 Alpha Vantage 경제 지표 데이터 제공자
 무료 API로 주요 경제 지표 데이터 제공
 """
-import httpx
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 import os
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, HTTPSession, http_clients
 
 
 class AlphaVantageEconomicProvider:
     """Alpha Vantage 경제 지표 API"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.api_key = os.getenv('ALPHA_VANTAGE_API_KEY', 'demo')
         self.base_url = "https://www.alphavantage.co/query"
         
@@ -22,6 +24,7 @@ class AlphaVantageEconomicProvider:
             {'function': 'FEDERAL_FUNDS_RATE', 'name': 'FOMC 기준금리', 'country': 'US', 'impact': 'High'},
         ]
     
+    @coalesce()
     async def get_economic_calendar(
         self,
         start_date: Optional[str] = None,
@@ -36,7 +39,7 @@ class AlphaVantageEconomicProvider:
         
         all_events = []
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.http.session(timeout=30.0) as client:
             for indicator in self.indicators:
                 try:
                     events = await self._fetch_indicator(
@@ -62,7 +65,7 @@ class AlphaVantageEconomicProvider:
     
     async def _fetch_indicator(
         self,
-        client: httpx.AsyncClient,
+        client: HTTPSession,
         indicator: Dict,
         start_date: str,
         end_date: str
@@ -7,18 +7,22 @@ import asyncio
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class FMPEconomicProvider:
     """Financial Modeling Prep를 통한 경제 지표 데이터 제공자 (상업적 사용 가능)"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.name = "Financial Modeling Prep"
         self.api_key = getattr(settings, 'FMP_API_KEY', None)
         # FMP API v4 사용 (v3는 레거시로 더 이상 지원 안 됨)
         # v4가 최신 버전이며 stable은 리다이렉트됨
         self.base_url = "https://financialmodelingprep.com/api/v4"
     
+    @coalesce()
     async def get_economic_indicator(
         self,
         indicator: str,
@@ -58,7 +62,7 @@ class FMPEconomicProvider:
             if name:
                 params["name"] = name
             
-            async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
+            async with self.http.session(follow_redirects=True, timeout=15.0) as client:
                 response = await client.get(
                     url,
                     params=params
@@ -101,6 +105,7 @@ class FMPEconomicProvider:
             print(f"[FMP] Error fetching {indicator}: {error_msg}")
             return None
     
+    @coalesce()
     async def get_economic_calendar(
         self,
         start_date: Optional[str] = None,
@@ -180,13 +185,14 @@ class FMPEconomicProvider:
         
         return None
     
+    @coalesce()
     async def get_treasury_rates(self) -> Optional[List[Dict]]:
         """국채 수익률 조회"""
         if not self.api_key:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     f"{self.base_url}/treasury",
                     params={"apikey": self.api_key},
@@ -203,13 +209,14 @@ class FMPEconomicProvider:
             print(f"[FMP] Error fetching treasury rates: {e}")
             return None
     
+    @coalesce()
     async def get_market_indices(self) -> Optional[List[Dict]]:
         """주요 시장 지수 조회"""
         if not self.api_key:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     f"{self.base_url}/quotes/index",
                     params={"apikey": self.api_key},
@@ -1,16 +1,18 @@
 """
 FRED API를 통한 경제 지표 데이터 수집 모듈
 """
-import httpx
 from typing import List, Optional, Dict, Set
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class FREDDataProvider:
     """FRED API를 통한 경제 지표 데이터 제공자"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.name = "FRED"
         self.api_key = settings.FRED_API_KEY
         self.base_url = "https://api.stlouisfed.org/fred"
@@ -18,6 +20,7 @@ class FREDDataProvider:
         self._copyrighted_series_cache: Optional[Set[str]] = None
         self._copyright_cache_time: Optional[datetime] = None
     
+    @coalesce()
     async def get_series(
         self,
         series_id: str,
@@ -56,7 +59,7 @@ class FREDDataProvider:
             if not end_date:
                 end_date = datetime.now().strftime('%Y-%m-%d')
             
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     f"{self.base_url}/series/observations",
                     params={
@@ -94,6 +97,7 @@ class FREDDataProvider:
             print(f"[FRED] Error fetching series {series_id}: {e}")
             return None
     
+    @coalesce()
     async def search_series(
         self,
         search_text: str,
@@ -113,7 +117,7 @@ class FREDDataProvider:
             return []
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     f"{self.base_url}/series/search",
                     params={
@@ -165,6 +169,7 @@ class FREDDataProvider:
         # 'Copyright' 또는 'copyright'가 포함되어 있는지 확인
         return 'copyright' in notes.lower()
     
+    @coalesce()
     async def check_series_copyright(self, series_id: str) -> bool:
         """
         시리즈가 저작권이 있는지 확인
@@ -190,6 +195,7 @@ class FREDDataProvider:
             # 에러 발생 시 안전하게 True 반환 (저작권이 있을 수 있으므로 사용 금지)
             return True
     
+    @coalesce()
     async def get_series_info(self, series_id: str) -> Optional[Dict]:
         """
         시리즈 정보 조회
@@ -204,7 +210,7 @@ class FREDDataProvider:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self.http.session() as client:
                 response = await client.get(
                     f"{self.base_url}/series",
                     params={
@@ -235,6 +241,7 @@ class FREDDataProvider:
             print(f"[FRED] Error fetching series info for {series_id}: {e}")
             return None
     
+    @coalesce()
     async def get_economic_calendar(
         self,
         start_date: Optional[str] = None,
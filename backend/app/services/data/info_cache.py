@@ -0,0 +1,78 @@
+"""
+yfinance Ticker.info 스냅샷 캐시 - 프로세스 전역 공유
+"""
+from typing import Dict, Optional
+import yfinance as yf
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class InfoSnapshotCache:
+    """
+    종목별 Ticker.info 스냅샷 캐시
+
+    배당/기업 분석/뉴스 페이지가 같은 종목의 info를 여러 번 조회하므로
+    한 번 받아온 스냅샷을 TTL 동안 공유한다. 반환되는 dict는 여러 요청이
+    공유하므로 읽기 전용으로 취급해야 한다.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._cache = TTLCache(
+            maxsize=maxsize or settings.INFO_CACHE_MAX_SIZE,
+            ttl=ttl or settings.INFO_CACHE_TTL
+        )
+        self.upstream_calls = 0
+
+    @staticmethod
+    def _key(symbol: str) -> str:
+        return symbol.strip().upper()
+
+    def peek(self, symbol: str) -> Optional[Dict]:
+        """캐시된 스냅샷만 조회 (없으면 None, 업스트림 호출 없음)"""
+        return self._cache.get(self._key(symbol))
+
+    def get(self, symbol: str, refresh: bool = False) -> Dict:
+        """
+        info 스냅샷 조회 (캐시 miss 시 yfinance 호출 - 블로킹이므로 스레드에서 호출)
+
+        Args:
+            symbol: yfinance 심볼 (예: 'AAPL', '005930.KS')
+            refresh: True면 캐시를 무시하고 새로 조회
+        """
+        if not refresh:
+            cached = self.peek(symbol)
+            if cached is not None:
+                return cached
+        return self.fetch(symbol)
+
+    def fetch(self, symbol: str) -> Dict:
+        """캐시 확인 없이 업스트림에서 조회 후 저장 (블로킹)"""
+        self.upstream_calls += 1
+        info = yf.Ticker(symbol).info
+        if not isinstance(info, dict):
+            info = {}
+        # 빈 응답은 일시적 오류일 수 있으므로 캐시하지 않음
+        if info:
+            self._cache.set(self._key(symbol), info)
+        return info
+
+    def put(self, symbol: str, info: Dict) -> None:
+        """외부에서 받아온 스냅샷 저장"""
+        if info:
+            self._cache.set(self._key(symbol), info)
+
+    def invalidate(self, symbol: str) -> bool:
+        """특정 종목 스냅샷 무효화"""
+        return self._cache.delete(self._key(symbol))
+
+    def invalidate_all(self) -> None:
+        """전체 무효화"""
+        self._cache.clear()
+
+    def stats(self) -> Dict:
+        """hit/miss 통계"""
+        return {**self._cache.stats(), "upstream_calls": self.upstream_calls}
+
+
+# 전역 info 캐시 인스턴스
+info_cache = InfoSnapshotCache()
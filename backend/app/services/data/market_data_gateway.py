@@ -0,0 +1,205 @@
+"""
+시장 데이터 게이트웨이 - 모든 yfinance 호출을 이벤트 루프 밖에서 실행
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import pandas as pd
+import yfinance as yf
+from app.core.config import settings
+from app.core.singleflight import singleflight, freeze
+from app.services.data.info_cache import info_cache
+from app.services.data.price_store import price_store
+
+
+class MarketDataGateway:
+    """
+    yfinance 동기 호출을 제한된 스레드 풀에서 실행하고 awaitable 메서드로 노출
+
+    yfinance는 내부적으로 블로킹 HTTP 요청을 사용하므로 async 핸들러에서 직접
+    호출하면 uvicorn 워커의 다른 요청까지 모두 멈춘다. 모든 호출은 이 게이트웨이를
+    거쳐 스레드 풀에서 실행되며, 호출마다 데드라인(timeout)이 적용된다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.name = "Market Data Gateway"
+        self.max_workers = max_workers or settings.MARKET_DATA_MAX_WORKERS
+        self.timeout = timeout or settings.MARKET_DATA_TIMEOUT
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """스레드 풀 (최초 사용 시 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="market-data"
+            )
+        return self._executor
+
+    async def run(
+        self,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        coalesce: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        동기 함수를 스레드 풀에서 실행
+
+        Args:
+            func: 실행할 동기 함수
+            timeout: 호출 데드라인 (초, 기본값: MARKET_DATA_TIMEOUT)
+            coalesce: True면 같은 (소유 클래스, 함수, 인자)의 동시 호출을 하나로 합침
+
+        Raises:
+            asyncio.TimeoutError: 데드라인 초과 시
+        """
+        if coalesce:
+            owner = getattr(func, '__self__', None)
+            key = (
+                type(owner).__name__ if owner is not None else func.__module__,
+                func.__name__,
+                freeze(args),
+                freeze(kwargs),
+            )
+            return await singleflight.do(key, lambda: self.run(func, *args, timeout=timeout, **kwargs))
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        # 타임아웃 시 대기만 중단되며 스레드 자체는 yfinance 요청이 끝날 때까지 남는다
+        return await asyncio.wait_for(future, timeout=timeout or self.timeout)
+
+    async def get_info(self, symbol: str, refresh: bool = False, timeout: Optional[float] = None) -> Dict:
+        """Ticker.info 조회 (공유 스냅샷 캐시 우선, 반환값은 읽기 전용)"""
+        if not refresh:
+            cached = info_cache.peek(symbol)
+            if cached is not None:
+                return cached
+        return await singleflight.do(
+            ("YahooFinance", "info", symbol.upper()),
+            lambda: self.run(info_cache.fetch, symbol, timeout=timeout)
+        )
+
+    async def get_history(
+        self,
+        symbol: str,
+        period: str = "1y",
+        interval: str = "1d",
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """Ticker.history 조회"""
+        return await singleflight.do(
+            ("YahooFinance", "history", symbol.upper(), period, interval, freeze(kwargs)),
+            lambda: self.run(
+                lambda: yf.Ticker(symbol).history(period=period, interval=interval, **kwargs),
+                timeout=timeout
+            )
+        )
+
+    async def get_daily_history(
+        self,
+        symbol: str,
+        period: str = "1y",
+        timeout: Optional[float] = None
+    ) -> pd.DataFrame:
+        """일봉 히스토리 조회 (로컬 저장소 우선, 부족한 꼬리 구간만 업스트림에서 추가)"""
+        return await singleflight.do(
+            ("YahooFinance", "daily_history", symbol.upper(), period),
+            lambda: self.run(price_store.get_history, symbol, period, timeout=timeout)
+        )
+
+    async def get_news(self, symbol: str, timeout: Optional[float] = None) -> List[Dict]:
+        """Ticker.get_news 조회"""
+        news = await singleflight.do(
+            ("YahooFinance", "news", symbol.upper()),
+            lambda: self.run(lambda: yf.Ticker(symbol).get_news(), timeout=timeout)
+        )
+        return news or []
+
+    async def get_dividends(self, symbol: str, timeout: Optional[float] = None) -> pd.Series:
+        """Ticker.dividends 조회"""
+        return await singleflight.do(
+            ("YahooFinance", "dividends", symbol.upper()),
+            lambda: self.run(lambda: yf.Ticker(symbol).dividends, timeout=timeout)
+        )
+
+    async def download(
+        self,
+        symbols: List[str],
+        period: str = "5d",
+        interval: str = "1d",
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """yf.download로 여러 종목 일괄 조회"""
+        return await singleflight.do(
+            ("YahooFinance", "download", freeze(symbols), period, interval, freeze(kwargs)),
+            lambda: self.run(
+                yf.download,
+                symbols,
+                period=period,
+                interval=interval,
+                progress=False,
+                timeout=timeout,
+                **kwargs
+            )
+        )
+
+    async def get_dividends_batch(
+        self,
+        symbols: List[str],
+        period: str = "2y",
+        timeout: Optional[float] = None
+    ) -> Dict[str, pd.Series]:
+        """
+        여러 종목 배당 이력을 yf.download(actions=True) 한 번으로 조회
+
+        종목 수가 QUOTE_POLL_BATCH_SIZE를 넘으면 나눠서 동시에 조회한다.
+
+        Returns:
+            심볼 → 배당 Series (배당이 없는 종목은 빈 Series)
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols:
+            return {}
+        batch_size = settings.QUOTE_POLL_BATCH_SIZE
+        chunks = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+        frames = await asyncio.gather(*(
+            self.download(chunk, period=period, interval="1d", timeout=timeout, actions=True)
+            for chunk in chunks
+        ))
+        result: Dict[str, pd.Series] = {}
+        for chunk, data in zip(chunks, frames):
+            for symbol in chunk:
+                result[symbol] = self._action_column(data, "Dividends", symbol, single=len(chunk) == 1)
+        return result
+
+    @staticmethod
+    def _action_column(data: pd.DataFrame, column: str, symbol: str, single: bool) -> pd.Series:
+        """yf.download 결과에서 한 종목의 배당/분할 열 추출 (0인 날 제외)"""
+        if data is None or data.empty:
+            return pd.Series(dtype="float64")
+        if isinstance(data.columns, pd.MultiIndex):
+            if column not in data.columns.get_level_values(0) or symbol not in data[column].columns:
+                return pd.Series(dtype="float64")
+            series = data[column][symbol]
+        elif single and column in data.columns:
+            series = data[column]
+        else:
+            return pd.Series(dtype="float64")
+        series = series.dropna()
+        return series[series > 0]
+
+    def shutdown(self):
+        """스레드 풀 종료 (lifespan 종료 시 호출)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# 전역 게이트웨이 인스턴스
+market_data_gateway = MarketDataGateway()
@@ -0,0 +1,267 @@
+"""
+로컬 일봉(OHLCV) 저장소 - 종목별 memory-mapped NumPy 파일 + 증분 추가
+"""
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: 단일 프로세스 실행만 지원
+    fcntl = None
+
+# 파일 레코드 형식 (고정 길이라 파일 끝에 그대로 append 가능)
+BAR_DTYPE = np.dtype([
+    ('date', '<i8'),  # 거래소 현지 날짜 (1970-01-01 기준 일수)
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+# yfinance period 문자열 → 일수
+_PERIOD_UNITS = {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}
+
+# 수정주가 기준이 바뀌었는지 판단할 때 허용하는 상대 오차
+_ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def symbol_filename(symbol: str) -> str:
+    """'^GSPC', 'CL=F', 'DX-Y.NYB' 등 특수문자가 들어간 심볼을 파일명에 안전한 형태로 변환"""
+    return re.sub(r'[^A-Za-z0-9.\-]', lambda m: f"_{ord(m.group()):02X}", symbol.upper())
+
+
+def period_to_days(period: str) -> Optional[int]:
+    """'1mo', '1y', '5d' 같은 period 문자열을 일수로 변환 ('max'는 None)"""
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period.strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * _PERIOD_UNITS[match.group(2)]
+
+
+class PriceStore:
+    """
+    종목별 일봉 로컬 저장소
+
+    심볼마다 BAR_DTYPE 레코드를 이어 붙인 바이너리 파일 하나를 두고 np.memmap으로 읽는다.
+    조회 시 마지막 동기화 후 refresh_interval이 지났으면 Yahoo에서 마지막 저장일 이후의
+    꼬리 구간만 받아와 덧붙인다. 장중의 미완성 봉은 다음 동기화 때 덮어쓴다.
+    모든 메서드는 블로킹이므로 MarketDataGateway 스레드 풀에서 호출해야 한다.
+
+    여러 워커 프로세스가 같은 디렉토리를 공유하므로 스레드 락에 더해 종목별 .lock 파일에
+    flock을 건다 (쓰기는 배타, 읽기는 공유). 다른 워커가 잘라내고 다시 쓰는 중인 파일을
+    읽거나 두 워커가 같은 파일을 동시에 고쳐 쓰지 않는다.
+    """
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        refresh_interval: Optional[float] = None,
+        initial_period: Optional[str] = None
+    ):
+        self.data_dir = data_dir or settings.PRICE_STORE_DIR
+        self.refresh_interval = refresh_interval if refresh_interval is not None else settings.PRICE_STORE_REFRESH_SECONDS
+        self.initial_period = initial_period or settings.PRICE_STORE_INITIAL_PERIOD
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._synced_at: Dict[str, float] = {}
+        self.local_reads = 0
+        self.upstream_calls = 0
+        self.bars_appended = 0
+
+    # ------------------------------------------------------------
+    # 파일 접근
+    # ------------------------------------------------------------
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.data_dir, f"{symbol_filename(symbol)}.bars")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        key = symbol.upper()
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def _locked(self, symbol: str, exclusive: bool = False) -> Iterator[None]:
+        """스레드 락 + 프로세스 간 파일 락 (읽기는 공유, 쓰기는 배타)"""
+        with self._lock(symbol):
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(self._path(symbol) + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_bars(self, symbol: str) -> np.ndarray:
+        """저장된 봉 전체 읽기 (락을 잡은 상태에서 호출)"""
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        count = os.path.getsize(path) // BAR_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode='r', shape=(count,))
+
+    def _write_from(self, symbol: str, keep: int, bars: np.ndarray) -> None:
+        """앞쪽 keep개 레코드만 남기고 bars를 이어 쓰기 (락을 잡은 상태에서 호출)"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = self._path(symbol)
+        mode = 'r+b' if os.path.exists(path) else 'wb'
+        with open(path, mode) as f:
+            f.truncate(keep * BAR_DTYPE.itemsize)
+            f.seek(keep * BAR_DTYPE.itemsize)
+            f.write(bars.tobytes())
+        self.bars_appended += len(bars)
+
+    # ------------------------------------------------------------
+    # 업스트림 동기화
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _frame_to_bars(df: pd.DataFrame) -> np.ndarray:
+        """yfinance history DataFrame → BAR_DTYPE 배열"""
+        if df is None or df.empty:
+            return np.empty(0, dtype=BAR_DTYPE)
+        df = df.dropna(subset=['Close'])
+        index = df.index
+        if getattr(index, 'tz', None) is not None:
+            # 한국 지수처럼 UTC로 바꾸면 날짜가 밀리므로 현지 날짜 그대로 사용
+            index = index.tz_localize(None)
+        bars = np.empty(len(df), dtype=BAR_DTYPE)
+        bars['date'] = index.normalize().values.astype('datetime64[D]').astype(np.int64)
+        bars['open'] = df['Open'].to_numpy(dtype=np.float64)
+        bars['high'] = df['High'].to_numpy(dtype=np.float64)
+        bars['low'] = df['Low'].to_numpy(dtype=np.float64)
+        bars['close'] = df['Close'].to_numpy(dtype=np.float64)
+        bars['volume'] = df['Volume'].fillna(0).to_numpy(dtype=np.float64)
+        # 같은 날짜가 중복되면 마지막 값 유지
+        _, last_idx = np.unique(bars['date'][::-1], return_index=True)
+        return bars[::-1][last_idx]
+
+    def sync(self, symbol: str, force: bool = False) -> int:
+        """
+        마지막 저장일 이후 꼬리 구간만 받아와 추가
+
+        Returns:
+            새로 기록한 봉 개수
+        """
+        with self._locked(symbol, exclusive=True):
+            synced_at = self._synced_at.get(symbol.upper())
+            if not force and synced_at is not None and time.monotonic() - synced_at < self.refresh_interval:
+                return 0
+
+            # memmap을 잡은 채로 파일을 잘라내지 않도록 복사본 사용 (Windows 호환)
+            stored = np.array(self._read_bars(symbol))
+            ticker = yf.Ticker(symbol)
+            self.upstream_calls += 1
+
+            if len(stored) < 2:
+                fetched = self._frame_to_bars(ticker.history(period=self.initial_period, interval="1d"))
+                self._write_from(symbol, 0, fetched)
+            else:
+                # 마지막 두 봉부터 다시 받아 완성 봉으로 수정주가 기준 변화를 확인하고
+                # 마지막(미완성일 수 있는) 봉은 새 값으로 교체
+                anchor = stored[-2]
+                start = date(1970, 1, 1) + timedelta(days=int(anchor['date']))
+                fetched = self._frame_to_bars(ticker.history(start=start.isoformat(), interval="1d"))
+                if len(fetched) == 0:
+                    self._synced_at[symbol.upper()] = time.monotonic()
+                    return 0
+
+                overlap = fetched[fetched['date'] == anchor['date']]
+                if len(overlap) and abs(overlap['close'][0] - anchor['close']) > _ADJUSTMENT_TOLERANCE * abs(anchor['close']):
+                    # 분할/배당으로 과거 수정주가가 바뀜 → 전체 재구성
+                    self.upstream_calls += 1
+                    fetched = self._frame_to_bars(ticker.history(period=self.initial_period, interval="1d"))
+                    self._write_from(symbol, 0, fetched)
+                else:
+                    keep = int(np.searchsorted(stored['date'], fetched['date'][0], side='left'))
+                    self._write_from(symbol, keep, fetched)
+
+            self._synced_at[symbol.upper()] = time.monotonic()
+            return len(fetched)
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    def get_bars(self, symbol: str, period: str = "1y", refresh: bool = True) -> np.ndarray:
+        """
+        일봉 레코드 배열 조회 (BAR_DTYPE)
+
+        Args:
+            symbol: yfinance 심볼
+            period: '5d', '1mo', '1y', '5y', 'max' 등
+            refresh: True면 필요 시 꼬리 구간 동기화
+        """
+        if refresh:
+            try:
+                self.sync(symbol)
+            except Exception as e:
+                # 업스트림 실패 시 로컬 데이터로 응답
+                print(f"[PriceStore] {symbol} 동기화 실패 (로컬 데이터 사용): {e}")
+
+        with self._locked(symbol):
+            bars = np.array(self._read_bars(symbol))
+        self.local_reads += 1
+
+        days = period_to_days(period)
+        if days is not None and len(bars):
+            cutoff = (date.today() - date(1970, 1, 1)).days - days
+            bars = bars[bars['date'] >= cutoff]
+        return bars
+
+    def get_bars_since(self, symbol: str, start: int) -> np.ndarray:
+        """
+        start(1970-01-01 기준 일수) 이후의 봉만 조회 (동기화 없음)
+
+        memmap에서 날짜를 이진 탐색해 꼬리만 복사하므로 전체 히스토리 길이와 무관하다.
+        """
+        with self._locked(symbol):
+            bars = self._read_bars(symbol)
+            index = int(np.searchsorted(bars['date'], start, side='left')) if len(bars) else 0
+            tail = np.array(bars[index:])
+        self.local_reads += 1
+        return tail
+
+    def get_history(self, symbol: str, period: str = "1y", refresh: bool = True) -> pd.DataFrame:
+        """yfinance history와 같은 컬럼(Open/High/Low/Close/Volume)의 DataFrame 반환"""
+        bars = self.get_bars(symbol, period, refresh=refresh)
+        index = pd.DatetimeIndex(bars['date'].astype('datetime64[D]'), name='Date').tz_localize('UTC')
+        return pd.DataFrame({
+            'Open': bars['open'],
+            'High': bars['high'],
+            'Low': bars['low'],
+            'Close': bars['close'],
+            'Volume': bars['volume'],
+        }, index=index)
+
+    def stats(self) -> Dict:
+        """저장소 사용 통계"""
+        return {
+            "data_dir": self.data_dir,
+            "symbols_synced": len(self._synced_at),
+            "local_reads": self.local_reads,
+            "upstream_calls": self.upstream_calls,
+            "bars_appended": self.bars_appended,
+        }
+
+
+# 전역 가격 저장소 인스턴스
+price_store = PriceStore()
@@ -0,0 +1,247 @@
+"""
+중앙 시세 폴러 - 구독 중인 종목을 주기마다 한 번씩 조회해 모든 구독자에게 변경분 전달
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.data.market_data_gateway import market_data_gateway
+from app.services.data.yahoo_finance import YahooFinanceDataProvider
+
+
+class QuotePollerFull(Exception):
+    """폴링 대상 종목 수가 QUOTE_POLL_MAX_SYMBOLS에 도달함 (503으로 응답)"""
+
+
+class QuoteSubscription:
+    """
+    구독자 한 명(브라우저 탭 하나)의 상태
+
+    폴러가 변경분을 pending에 합쳐 두고 이벤트를 세운다. 구독자가 느려도
+    종목별 최신 값만 남으므로 큐가 무한히 쌓이지 않는다.
+    """
+
+    def __init__(self, subscription_id: int, symbols: Set[str]):
+        self.id = subscription_id
+        self.symbols = symbols
+        self.pending: Dict[str, Dict] = {}
+        self._event = asyncio.Event()
+
+    def push(self, quotes: Dict[str, Dict]) -> int:
+        """변경분 합치기 (폴러에서 호출, 전달한 종목 수 반환)"""
+        matched = {symbol: quote for symbol, quote in quotes.items() if symbol in self.symbols}
+        if matched:
+            self.pending.update(matched)
+            self._event.set()
+        return len(matched)
+
+    async def next_update(self, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        다음 변경분 대기
+
+        Returns:
+            {symbol: quote} (timeout 동안 변경이 없으면 빈 dict)
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self._event.clear()
+        updates, self.pending = self.pending, {}
+        return updates
+
+
+class QuotePoller:
+    """
+    공유 시세 캐시 + 구독 기반 주기 조회
+
+    열린 탭마다 /portfolio/prices를 폴링하면 업스트림 호출이 접속자 수에 비례해 늘어난다.
+    폴러는 모든 구독자의 종목 합집합을 interval마다 한 번만 조회하고, 가격이 바뀐 종목만
+    해당 종목을 구독 중인 구독자에게 전달한다. 조회 결과는 공유 캐시에 남아
+    /portfolio/prices 같은 단발 조회도 함께 사용한다.
+
+    공유 캐시는 크기 제한(LRU) TTLCache다. 구독 중인 종목은 폴링마다 다시 저장되어 남고,
+    아무도 구독하지 않는 종목은 QUOTE_CACHE_RETENTION 뒤에 만료되며, 임의 종목 조회가
+    몰려도 QUOTE_CACHE_MAX_SYMBOLS를 넘지 않는다.
+    """
+
+    def __init__(self, interval: Optional[float] = None, batch_size: Optional[int] = None):
+        self.interval = interval or settings.QUOTE_POLL_INTERVAL
+        self.batch_size = batch_size or settings.QUOTE_POLL_BATCH_SIZE
+        self._provider = YahooFinanceDataProvider()
+        # symbol → (시세, 조회 시각 monotonic)
+        self._quotes = TTLCache(maxsize=settings.QUOTE_CACHE_MAX_SYMBOLS, ttl=settings.QUOTE_CACHE_RETENTION)
+        self._subscriptions: Dict[int, QuoteSubscription] = {}
+        self._refcount: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.upstream_calls = 0
+        self.deltas_sent = 0
+
+    # ------------------------------------------------------------
+    # 구독 관리
+    # ------------------------------------------------------------
+
+    def subscribe(self, symbols: Iterable[str]) -> QuoteSubscription:
+        """
+        종목 구독 시작 (폴러가 멈춰 있으면 시작)
+
+        Raises:
+            QuotePollerFull: 새 종목을 더하면 폴링 대상이 QUOTE_POLL_MAX_SYMBOLS를 넘을 때
+        """
+        wanted = {s.strip().upper() for s in symbols if s.strip()}
+        added = len(wanted - self._refcount.keys())
+        if added and len(self._refcount) + added > settings.QUOTE_POLL_MAX_SYMBOLS:
+            raise QuotePollerFull(f"폴링 대상 종목이 최대치({settings.QUOTE_POLL_MAX_SYMBOLS})에 도달했습니다.")
+        subscription = QuoteSubscription(next(self._ids), wanted)
+        self._subscriptions[subscription.id] = subscription
+        for symbol in subscription.symbols:
+            self._refcount[symbol] = self._refcount.get(symbol, 0) + 1
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        """구독 해제 (아무도 구독하지 않는 종목은 폴링 대상에서 제외)"""
+        if self._subscriptions.pop(subscription.id, None) is None:
+            return
+        for symbol in subscription.symbols:
+            remaining = self._refcount.get(symbol, 0) - 1
+            if remaining > 0:
+                self._refcount[symbol] = remaining
+            else:
+                self._refcount.pop(symbol, None)
+
+    # ------------------------------------------------------------
+    # 시세 조회
+    # ------------------------------------------------------------
+
+    async def _fetch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """업스트림에서 batch_size 단위로 조회 후 공유 캐시에 반영, 가격이 바뀐 종목만 반환"""
+        changed: Dict[str, Dict] = {}
+        for start in range(0, len(symbols), self.batch_size):
+            chunk = symbols[start:start + self.batch_size]
+            self.upstream_calls += 1
+            try:
+                quotes = await market_data_gateway.run(
+                    self._provider.get_current_prices_batch, chunk, coalesce=True
+                )
+            except Exception as e:
+                print(f"[QuotePoller] 시세 조회 실패 ({len(chunk)}개 종목): {e}")
+                continue
+
+            now = time.monotonic()
+            for symbol, quote in quotes.items():
+                symbol = symbol.upper()
+                entry = {
+                    "price": quote.get("price", 0),
+                    "change": quote.get("change", 0),
+                    "changePercent": quote.get("changePercent", 0),
+                    "updated_at": time.time(),
+                }
+                cached = self._quotes.get(symbol)
+                previous = cached[0] if cached else None
+                self._quotes.set(symbol, (entry, now))
+                if previous is None or previous["price"] != entry["price"] or previous["change"] != entry["change"]:
+                    changed[symbol] = entry
+        return changed
+
+    async def get_quotes(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        공유 캐시에서 시세 조회 (없거나 max_age보다 오래된 종목만 한 번에 업스트림 조회)
+
+        Args:
+            symbols: 종목 심볼 목록
+            max_age: 허용할 캐시 나이 (초, 기본값: QUOTE_CACHE_MAX_AGE)
+
+        Returns:
+            {symbol: {"price", "change", "changePercent", "updated_at"}} (조회 실패 종목은 제외)
+        """
+        max_age = settings.QUOTE_CACHE_MAX_AGE if max_age is None else max_age
+        wanted = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        now = time.monotonic()
+        cached: Dict[str, Optional[Tuple[Dict, float]]] = {s: self._quotes.get(s) for s in wanted}
+        missing = [s for s in wanted if cached[s] is None or now - cached[s][1] > max_age]
+        if missing:
+            changed = await self._fetch(missing)
+            self._broadcast(changed)
+            # 조회에 실패한 종목은 이전 시세가 그대로 남음 (호출자가 updated_at으로 판단)
+            cached.update({s: self._quotes.get(s) for s in missing})
+        return {s: entry[0] for s, entry in cached.items() if entry is not None}
+
+    def peek(self, symbol: str) -> Optional[Dict]:
+        """캐시된 시세만 조회 (업스트림 호출 없음)"""
+        cached = self._quotes.get(symbol.strip().upper())
+        return cached[0] if cached else None
+
+    # ------------------------------------------------------------
+    # 폴링 루프
+    # ------------------------------------------------------------
+
+    def _broadcast(self, changed: Dict[str, Dict]) -> None:
+        if not changed:
+            return
+        for subscription in list(self._subscriptions.values()):
+            self.deltas_sent += subscription.push(changed)
+
+    async def poll_once(self) -> int:
+        """구독 중인 모든 종목을 한 번 조회하고 변경분 전달 (변경된 종목 수 반환)"""
+        symbols = sorted(self._refcount)
+        if not symbols:
+            return 0
+        self.polls += 1
+        # 직전에 단발 조회로 갱신된 종목은 건너뜀
+        now = time.monotonic()
+        due = []
+        for symbol in symbols:
+            cached = self._quotes.get(symbol)
+            if cached is None or now - cached[1] >= self.interval * 0.5:
+                due.append(symbol)
+        changed = await self._fetch(due) if due else {}
+        self._broadcast(changed)
+        return len(changed)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[QuotePoller] 폴링 오류: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """폴링 루프 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """폴링 루프 종료 (lifespan 종료 시 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        """폴러 지표"""
+        return {
+            "interval_seconds": self.interval,
+            "subscribers": len(self._subscriptions),
+            "distinct_symbols": len(self._refcount),
+            "cached_symbols": len(self._quotes),
+            "cache": self._quotes.stats(),
+            "polls": self.polls,
+            "upstream_calls": self.upstream_calls,
+            "deltas_sent": self.deltas_sent,
+        }
+
+
+# 전역 시세 폴러 인스턴스
+quote_poller = QuotePoller()
@@ -1,9 +1,10 @@
 """
 Yahoo Finance 경제 지표 - 상업적 사용 가능 (무료)
 """
-import yfinance as yf
+import asyncio
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
+from app.services.data.market_data_gateway import market_data_gateway
 
 
 class YahooEconomicProvider:
@@ -30,13 +31,20 @@ class YahooEconomicProvider:
             경제 지표 데이터
         """
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5y")
+            # 히스토리와 이름 조회용 info를 게이트웨이에서 동시에 조회
+            hist, info = await asyncio.gather(
+                market_data_gateway.get_daily_history(symbol, period="5y"),
+                market_data_gateway.get_info(symbol),
+                return_exceptions=True
+            )
+            if isinstance(hist, Exception):
+                raise hist
             
             if hist.empty:
                 return None
             
-            info = ticker.info
+            if isinstance(info, Exception):
+                info = {}
             
             return {
                 'symbol': symbol,
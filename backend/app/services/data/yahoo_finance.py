@@ -5,6 +5,8 @@ import yfinance as yf
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 import pandas as pd
+from app.services.data.info_cache import info_cache
+from app.services.data.price_store import price_store
 
 
 class YahooFinanceDataProvider:
@@ -52,8 +54,12 @@ class YahooFinanceDataProvider:
             else:
                 period = "5y"
             
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=yf_interval)
+            if yf_interval == '1d':
+                # 일봉은 로컬 저장소에서 읽고 부족한 꼬리 구간만 업스트림에서 받아옴
+                df = price_store.get_history(symbol, period)
+            else:
+                ticker = yf.Ticker(symbol)
+                df = ticker.history(period=period, interval=yf_interval)
             
             if df.empty:
                 return []
@@ -156,8 +162,7 @@ class YahooFinanceDataProvider:
     def get_company_info(self, symbol: str) -> Optional[Dict]:
         """회사 정보 조회"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = info_cache.get(symbol)
             
             return {
                 'symbol': symbol,
@@ -180,9 +185,10 @@ class YahooFinanceDataProvider:
             if dividends.empty:
                 return None
             
+            info = info_cache.get(symbol)
             return {
-                'dividend_yield': ticker.info.get('dividendYield', 0),
-                'dividend_rate': ticker.info.get('dividendRate', 0),
+                'dividend_yield': info.get('dividendYield', 0),
+                'dividend_rate': info.get('dividendRate', 0),
                 'dividend_history': [
                     {
                         'date': date.strftime('%Y-%m-%d'),
@@ -1,24 +1,27 @@
 """
 경제 캘린더 데이터 수집 - 여러 소스 사용
 """
-import httpx
 from bs4 import BeautifulSoup
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 import json
 import re
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class EconomicCalendarScraper:
     """여러 소스에서 경제 캘린더 데이터 수집"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/html, */*',
             'Accept-Language': 'en-US,en;q=0.9',
         }
     
+    @coalesce()
     async def get_economic_calendar(
         self,
         start_date: Optional[str] = None,
@@ -53,7 +56,7 @@ class EconomicCalendarScraper:
         try:
             url = "https://www.myfxbook.com/api/get-economic-calendar.json"
             
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=15.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=self.headers)
                 
                 if response.status_code != 200:
@@ -123,7 +126,7 @@ class EconomicCalendarScraper:
                 'to': end_date
             }
             
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=15.0, follow_redirects=True) as client:
                 response = await client.get(url, params=params, headers=self.headers)
                 
                 if response.status_code != 200:
@@ -230,7 +233,7 @@ class EconomicCalendarScraper:
                 'countries': 'US,KR,JP,DE,GB,CN,EU'
             }
             
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=15.0, follow_redirects=True) as client:
                 response = await client.get(url, params=params, headers=self.headers)
                 
                 if response.status_code != 200:
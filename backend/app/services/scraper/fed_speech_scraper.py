@@ -6,15 +6,19 @@ from bs4 import BeautifulSoup
 from typing import List, Optional, Dict
 from datetime import datetime
 import re
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class FedSpeechScraper:
     """Fed 연설문 스크래퍼"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.base_url = "https://www.federalreserve.gov"
         self.speeches_url = f"{self.base_url}/newsevents/speeches.htm"
     
+    @coalesce()
     async def get_recent_speeches(self, limit: int = 10) -> List[Dict]:
         """
         최근 Fed 연설문 목록 조회
@@ -32,7 +36,7 @@ class FedSpeechScraper:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(self.speeches_url, headers=headers)
                 
                 if response.status_code != 200:
@@ -227,6 +231,7 @@ class FedSpeechScraper:
         ]
         return sample_speeches[:limit]
     
+    @coalesce()
     async def get_speech_content(self, url: str) -> Optional[str]:
         """
         연설문 내용 조회
@@ -243,7 +248,7 @@ class FedSpeechScraper:
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=headers)
                 
                 if response.status_code != 200:
@@ -6,15 +6,19 @@ from bs4 import BeautifulSoup
 from typing import List, Optional, Dict
 from datetime import datetime
 import re
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, http_clients
 
 
 class FOMCScraper:
     """FOMC 회의록 스크래퍼"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.base_url = "https://www.federalreserve.gov"
         self.meetings_url = f"{self.base_url}/monetarypolicy/fomccalendars.htm"
     
+    @coalesce()
     async def get_recent_meetings(self, limit: int = 10) -> List[Dict]:
         """
         최근 FOMC 회의록 목록 조회
@@ -32,7 +36,7 @@ class FOMCScraper:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(self.meetings_url, headers=headers)
                 
                 if response.status_code != 200:
@@ -204,6 +208,7 @@ class FOMCScraper:
         ]
         return sample_meetings[:limit]
     
+    @coalesce()
     async def get_meeting_minutes(self, url: str) -> Optional[str]:
         """
         회의록 내용 조회
@@ -220,7 +225,7 @@ class FOMCScraper:
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=headers)
                 
                 if response.status_code != 200:
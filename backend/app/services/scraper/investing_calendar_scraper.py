@@ -9,12 +9,15 @@ from datetime import datetime, timedelta
 import re
 import json
 import asyncio
+from app.core.singleflight import coalesce
+from app.core.http import HTTPClientRegistry, HTTPSession, http_clients
 
 
 class InvestingCalendarScraper:
     """Investing.com 경제 캘린더 스크래퍼 - 주 단위 분할 수집"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPClientRegistry] = None):
+        self.http = http or http_clients
         self.base_url = "https://www.investing.com"
         self.ajax_url = f"{self.base_url}/economic-calendar/Service/getCalendarFilteredData"
         
@@ -32,6 +35,7 @@ class InvestingCalendarScraper:
         
         self.importance_map = {1: "Low", 2: "Medium", 3: "High"}
     
+    @coalesce()
     async def get_economic_calendar(
         self,
         start_date: Optional[str] = None,
@@ -59,7 +63,7 @@ class InvestingCalendarScraper:
                 'Accept-Language': 'en-US,en;q=0.9',
             }
             
-            async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+            async with self.http.session(timeout=60.0, follow_redirects=True) as client:
                 # 1. 메인 페이지에서 쿠키 획득
                 try:
                     main_response = await client.get(
@@ -118,7 +122,7 @@ class InvestingCalendarScraper:
     
     async def _fetch_week_data(
         self,
-        client: httpx.AsyncClient,
+        client: HTTPSession,
         start_date: str,
         end_date: str,
         cookies: dict
@@ -318,7 +322,7 @@ class InvestingCalendarScraper:
     
     async def _scrape_html_fallback(
         self, 
-        client: httpx.AsyncClient, 
+        client: HTTPSession, 
         start_date: str, 
         end_date: str,
         html_content: Optional[str] = None
@@ -1,4 +1,12 @@
 """
 Background Tasks
 """
+from app.tasks.prefetch import PrefetchScheduler, prefetch_scheduler
+from app.tasks.universe import load_universe, universe_symbols
 
+__all__ = [
+    "PrefetchScheduler",
+    "prefetch_scheduler",
+    "load_universe",
+    "universe_symbols",
+]
@@ -0,0 +1,237 @@
+"""
+서비스 대상 종목 사전 조회 스케줄러 - 재시작 후에도 시세/info/일봉 캐시를 미리 채워 둠
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.services.analysis.fundamentals_index import fundamentals_index
+from app.services.analysis.indicator_engine import indicator_engine
+from app.services.data.info_cache import info_cache
+from app.services.data.market_data_gateway import market_data_gateway
+from app.services.data.price_store import price_store
+from app.services.data.quote_poller import quote_poller
+from app.tasks.universe import load_universe, universe_symbols
+
+
+class UpstreamBudget:
+    """
+    분당 업스트림 호출 예산 (토큰 버킷)
+
+    모든 사전 조회 작업이 공유하므로 사용자 요청이 쓸 게이트웨이 스레드와
+    Yahoo 호출 한도를 잠식하지 않는다.
+    """
+
+    def __init__(self, calls_per_minute: int):
+        self.rate = max(calls_per_minute, 1) / 60.0
+        self.capacity = max(1.0, calls_per_minute / 12.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        """토큰 하나를 쓸 수 있을 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+
+
+class PrefetchJob:
+    """주기마다 대상 항목을 하나씩 새로 고치는 작업"""
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        items: List,
+        refresh: Callable[[object], Awaitable],
+        on_cycle: Optional[Callable[[], Awaitable]] = None
+    ):
+        self.name = name
+        self.interval = interval
+        self.items = items
+        self.refresh = refresh
+        self.on_cycle = on_cycle
+        self.cycles = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.last_cycle_seconds: Optional[float] = None
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "items": len(self.items),
+            "cycles": self.cycles,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+            "last_cycle_seconds": self.last_cycle_seconds,
+        }
+
+
+class PrefetchScheduler:
+    """
+    종목 목록 전체를 작업별 주기 안에서 나눠 새로 고치는 스케줄러
+
+    - quotes: QUOTE_POLL_BATCH_SIZE 단위 일괄 시세 → 공유 시세 캐시
+    - info: 종목별 Ticker.info → info 스냅샷 캐시 (TTL보다 짧은 주기)
+    - bars: 종목별 일봉 꼬리 동기화 → 로컬 가격 저장소 (재동기화 주기보다 짧은 주기),
+      한 주기가 끝날 때마다 전 종목 지표 행렬 재계산
+    - fundamentals: info 웜업 직후 한 번, 이후 매일 FUNDAMENTALS_INDEX_HOUR에 스크리너 인덱스 재구성
+
+    첫 주기는 예산이 허락하는 한 바로 채우고(웜업), 이후 주기는 항목을 주기 전체에
+    고르게 흩어 호출이 몰리지 않게 한다. 모든 호출은 UpstreamBudget을 거친다.
+    """
+
+    def __init__(self, calls_per_minute: Optional[int] = None):
+        self.budget = UpstreamBudget(calls_per_minute or settings.PREFETCH_MAX_CALLS_PER_MINUTE)
+        self.jobs: List[PrefetchJob] = []
+        self._tasks: List[asyncio.Task] = []
+        self._info_warmed = asyncio.Event()
+
+    def _build_jobs(self, symbols: List[str]) -> List[PrefetchJob]:
+        batch_size = settings.QUOTE_POLL_BATCH_SIZE
+        quote_batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+        return [
+            PrefetchJob("quotes", settings.PREFETCH_QUOTE_INTERVAL, quote_batches, self._refresh_quotes),
+            PrefetchJob(
+                "info", settings.PREFETCH_INFO_INTERVAL, symbols, self._refresh_info,
+                on_cycle=self._info_cycle_done
+            ),
+            PrefetchJob(
+                "bars", settings.PREFETCH_BARS_INTERVAL, symbols, self._refresh_bars,
+                on_cycle=lambda: market_data_gateway.run(indicator_engine.rebuild, symbols, timeout=120)
+            ),
+        ]
+
+    @staticmethod
+    async def _refresh_quotes(batch: List[str]) -> None:
+        await quote_poller.get_quotes(batch, max_age=0)
+
+    @staticmethod
+    async def _refresh_info(symbol: str) -> None:
+        await market_data_gateway.get_info(symbol, refresh=True)
+
+    @staticmethod
+    async def _refresh_bars(symbol: str) -> None:
+        await market_data_gateway.run(price_store.sync, symbol, force=True)
+
+    async def _info_cycle_done(self) -> None:
+        self._info_warmed.set()
+
+    async def rebuild_fundamentals(self) -> int:
+        """info 스냅샷 캐시로 스크리너 인덱스 재구성 (캐시에 없는 종목만 예산 안에서 조회)"""
+        universe = load_universe()
+        infos = {}
+        for entry in universe:
+            symbol = entry["symbol"]
+            info = info_cache.peek(symbol)
+            if info is None:
+                await self.budget.acquire()
+                try:
+                    info = await market_data_gateway.get_info(symbol)
+                except Exception as e:
+                    print(f"[Prefetch] fundamentals {symbol} info 조회 실패: {e}")
+                    continue
+            if info:
+                infos[symbol] = info
+        return await market_data_gateway.run(fundamentals_index.build, infos, universe, timeout=120)
+
+    async def _run_fundamentals(self) -> None:
+        # 재시작 직후에는 info 웜업이 끝나는 대로 한 번 구성
+        await self._info_warmed.wait()
+        while True:
+            try:
+                await self.rebuild_fundamentals()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Prefetch] 스크리너 인덱스 구성 실패: {e}")
+            now = datetime.now()
+            next_run = now.replace(hour=settings.FUNDAMENTALS_INDEX_HOUR, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+
+    async def _run_job(self, job: PrefetchJob, initial_delay: float) -> None:
+        await asyncio.sleep(initial_delay)
+        warmup = True
+        while True:
+            started = time.monotonic()
+            spacing = 0.0 if warmup else job.interval / max(len(job.items), 1)
+            for index, item in enumerate(job.items):
+                await self.budget.acquire()
+                try:
+                    await job.refresh(item)
+                    job.refreshed += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    job.failures += 1
+                    print(f"[Prefetch] {job.name} {item} 갱신 실패: {e}")
+                # 항목별 예정 시각에 맞춰 대기 (앞 호출이 늦어졌으면 바로 진행)
+                delay = started + (index + 1) * spacing - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if job.on_cycle is not None:
+                try:
+                    await job.on_cycle()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[Prefetch] {job.name} 주기 후처리 실패: {e}")
+
+            elapsed = time.monotonic() - started
+            job.cycles += 1
+            job.last_cycle_seconds = round(elapsed, 1)
+            if warmup:
+                print(f"[Prefetch] {job.name} 웜업 완료: {len(job.items)}건, {elapsed:.1f}초")
+                warmup = False
+            await asyncio.sleep(max(0.0, job.interval - elapsed))
+
+    def start(self) -> None:
+        """작업 시작 (lifespan 시작 시 호출)"""
+        if self._tasks:
+            return
+        symbols = universe_symbols()
+        if not symbols:
+            print("[Prefetch] 대상 종목이 없어 스케줄러를 시작하지 않습니다.")
+            return
+        self.jobs = self._build_jobs(symbols)
+        loop = asyncio.get_running_loop()
+        for index, job in enumerate(self.jobs):
+            # 작업끼리 같은 순간에 시작하지 않도록 약간씩 어긋나게 시작
+            self._tasks.append(loop.create_task(self._run_job(job, initial_delay=index * 2 + random.random())))
+        self._tasks.append(loop.create_task(self._run_fundamentals()))
+        print(f"[Prefetch] 스케줄러 시작: {len(symbols)}개 종목, 분당 최대 {settings.PREFETCH_MAX_CALLS_PER_MINUTE}회 호출")
+
+    async def stop(self) -> None:
+        """작업 종료 (lifespan 종료 시 호출)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict:
+        """작업별 진행 지표"""
+        return {
+            "running": bool(self._tasks),
+            "budget_per_minute": round(self.budget.rate * 60),
+            "budget_waited_seconds": round(self.budget.waited_seconds, 1),
+            "jobs": {job.name: job.stats() for job in self.jobs},
+        }
+
+
+# 전역 스케줄러 인스턴스
+prefetch_scheduler = PrefetchScheduler()
@@ -0,0 +1,85 @@
+"""
+서비스 대상 종목 목록 (stock_list_organized.txt) 파서
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+# backend/stock_list_organized.txt
+DEFAULT_UNIVERSE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "stock_list_organized.txt"
+)
+
+# "번호  심볼  회사명  거래소" 형식의 표 행 (회사명에는 공백이 들어갈 수 있음)
+_ROW_PATTERN = re.compile(r'^\s*(\d+)\s+([A-Z0-9.\-^=]+)\s+(.+?)\s+(\S+)\s*$')
+
+
+def _section_kind(line: str) -> Optional[str]:
+    """섹션 제목 줄이면 종류('stock'/'etf') 반환"""
+    if line.startswith("일반 주식"):
+        return "stock"
+    if line.startswith("ETF"):
+        return "etf"
+    return None
+
+
+def parse_universe(path: str) -> List[Dict]:
+    """
+    종목 목록 파일 파싱
+
+    '====' 줄로 구분된 섹션의 제목(일반 주식 / ETF 및 펀드)으로 종류를 정하고,
+    번호로 시작하는 표 행만 읽는다. 머리글과 '----' 구분선은 건너뛴다.
+
+    Returns:
+        [{"symbol", "name", "exchange", "kind"}] (파일 순서, 심볼 중복 제거)
+    """
+    universe: List[Dict] = []
+    seen = set()
+    kind = None
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith(("=", "-")):
+                continue
+            section = _section_kind(line)
+            if section:
+                kind = section
+                continue
+            if kind is None:
+                continue
+            match = _ROW_PATTERN.match(line)
+            if not match:
+                continue
+            symbol = match.group(2)
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            universe.append({
+                "symbol": symbol,
+                "name": match.group(3),
+                "exchange": match.group(4),
+                "kind": kind,
+            })
+    return universe
+
+
+@lru_cache(maxsize=1)
+def load_universe() -> List[Dict]:
+    """설정된 종목 목록 파일을 한 번만 읽어 반환 (파일이 없으면 빈 목록)"""
+    path = settings.PREFETCH_UNIVERSE_FILE or DEFAULT_UNIVERSE_FILE
+    try:
+        universe = parse_universe(path)
+    except OSError as e:
+        print(f"[Universe] 종목 목록을 읽을 수 없습니다 ({path}): {e}")
+        return []
+    stocks = sum(1 for entry in universe if entry["kind"] == "stock")
+    print(f"[Universe] 일반 주식 {stocks}개 + ETF {len(universe) - stocks}개 로드")
+    return universe
+
+
+def universe_symbols() -> List[str]:
+    """서비스 대상 종목 심볼 목록"""
+    return [entry["symbol"] for entry in load_universe()]
@@ -0,0 +1,95 @@
+"""
+캐시 코덱 벤치마크 - 대표 페이로드별 인코딩/디코딩 시간과 저장 바이트 비교
+
+사용법 (backend 디렉터리에서):
+    python benchmark_cache_codecs.py [반복 횟수]
+"""
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from app.core.codecs import COMPRESSORS, SERIALIZERS, CacheCodec
+from app.core.config import settings
+
+
+def economic_series(years: int = 5) -> dict:
+    """YahooEconomicProvider 형태의 일간 {date, value} 시계열"""
+    start = date.today() - timedelta(days=365 * years)
+    value = 4.0
+    data = []
+    for day in range(365 * years):
+        value += random.gauss(0, 0.03)
+        data.append({"date": (start + timedelta(days=day)).isoformat(), "value": round(value, 4)})
+    return {
+        "symbol": "^TNX",
+        "current_value": data[-1]["value"],
+        "data": data,
+        "updated_at": date.today().isoformat(),
+    }
+
+
+def company_analysis() -> dict:
+    """기업 분석 응답과 비슷한 중첩 구조 (재무제표 분기 × 항목)"""
+    items = ["revenue", "grossProfit", "operatingIncome", "netIncome", "eps", "totalAssets", "totalDebt", "freeCashFlow"]
+    quarters = [
+        {"period": f"{year}Q{q}", **{item: random.uniform(1e6, 1e10) for item in items}}
+        for year in range(2015, 2025) for q in range(1, 5)
+    ]
+    return {
+        "symbol": "AAPL",
+        "profile": {"name": "Apple Inc.", "sector": "Technology", "description": "Lorem ipsum " * 80},
+        "financials": {"quarterly": quarters, "annual": quarters[::4]},
+        "ratios": {f"ratio_{i}": random.random() for i in range(60)},
+        "news": [{"title": f"headline {i}", "summary": "요약 문장입니다. " * 10} for i in range(20)],
+    }
+
+
+def small_response() -> dict:
+    """/economic/indices 크기의 작은 응답"""
+    return {
+        "indicator": "market_indices",
+        "data": [{"symbol": s, "price": random.uniform(100, 40000), "change": 0, "changePercent": 0} for s in ["GSPC", "DJI", "IXIC", "RUT", "KS11", "KQ11"]],
+        "source": "FMP/Yahoo",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+
+def measure(codec: CacheCodec, payload: dict, repeat: int):
+    encode_times, decode_times = [], []
+    encoded = codec.encode(payload)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encoded = codec.encode(payload)
+        encode_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        codec.decode(encoded)
+        decode_times.append(time.perf_counter() - started)
+    return statistics.median(encode_times) * 1e6, statistics.median(decode_times) * 1e6, len(encoded)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    random.seed(0)
+    payloads = {
+        "economic_series_5y": economic_series(),
+        "company_analysis": company_analysis(),
+        "small_response": small_response(),
+    }
+    serializers = [entry[0] for entry in SERIALIZERS.values() if entry[3]]
+    compressors = [entry[0] for entry in COMPRESSORS.values() if entry[3]]
+    print(f"압축 기준: {settings.CACHE_COMPRESSION_THRESHOLD} bytes, 반복 {repeat}회 (중앙값)")
+    print(f"사용 가능 직렬화: {', '.join(serializers)} / 압축: {', '.join(compressors)}")
+
+    for name, payload in payloads.items():
+        print(f"\n[{name}]")
+        print(f"{'codec':<18}{'encode(us)':>12}{'decode(us)':>12}{'bytes':>10}")
+        for serializer in serializers:
+            for compression in compressors:
+                codec = CacheCodec(serializer, compression)
+                encode_us, decode_us, size = measure(codec, payload, repeat)
+                print(f"{codec.name:<18}{encode_us:>12.1f}{decode_us:>12.1f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
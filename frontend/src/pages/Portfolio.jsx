@@ -33,22 +33,30 @@ function Portfolio() {
     }
   }
 
-  const fetchStockPrices = async (items) => {
-    if (!items || items.length === 0) return
-    try {
-      const symbols = items.map(item => item.symbol.match(/^\d+$/) ? `${item.symbol}.KS` : item.symbol)
-      const priceMapRaw = await apiService.getPortfolioPrices(symbols)
-      const priceMap = {}
+  const toFullSymbol = (symbol) => symbol.match(/^\d+$/) ? `${symbol}.KS` : symbol
+
+  const applyStockPrices = (items, priceMapRaw, merge = false) => {
+    setStockPrices(prev => {
+      const priceMap = merge ? { ...prev } : {}
       items.forEach(item => {
-        const fullSymbol = item.symbol.match(/^\d+$/) ? `${item.symbol}.KS` : item.symbol
-        const priceData = priceMapRaw[fullSymbol] || priceMapRaw[item.symbol]
+        const priceData = priceMapRaw[toFullSymbol(item.symbol)] || priceMapRaw[item.symbol]
+        if (merge && !priceData) return
         priceMap[item.symbol] = {
           price: priceData?.price || item.average_price,
           change: priceData?.change || 0,
           changePercent: priceData?.changePercent || 0
         }
       })
-      setStockPrices(priceMap)
+      return priceMap
+    })
+  }
+
+  const fetchStockPrices = async (items) => {
+    if (!items || items.length === 0) return
+    try {
+      const symbols = items.map(item => toFullSymbol(item.symbol))
+      const priceMapRaw = await apiService.getPortfolioPrices(symbols)
+      applyStockPrices(items, priceMapRaw)
     } catch (err) {
       console.error('Price fetch error:', err)
     }
@@ -117,9 +125,21 @@ function Portfolio() {
   }, [])
 
   useEffect(() => {
-    if (portfolioItems.length > 0) {
-      const timer = setInterval(() => fetchStockPrices(portfolioItems), 60000)
-      return () => clearInterval(timer)
+    if (portfolioItems.length === 0) return
+    let timer = null
+    const startPolling = () => {
+      if (!timer) timer = setInterval(() => fetchStockPrices(portfolioItems), 60000)
+    }
+    // 서버 푸시 스트림 우선, 연결할 수 없으면 60초 폴링으로 대체
+    const source = apiService.openPortfolioPriceStream(
+      portfolioItems.map(item => toFullSymbol(item.symbol)),
+      (quotes) => applyStockPrices(portfolioItems, quotes, true),
+      () => startPolling()
+    )
+    if (!source) startPolling()
+    return () => {
+      if (source) source.close()
+      if (timer) clearInterval(timer)
     }
   }, [portfolioItems])
 
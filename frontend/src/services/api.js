@@ -214,6 +214,29 @@ export const getPortfolioPrices = async (symbols) => {
   }
 }
 
+// 포트폴리오 실시간 시세 스트림 (SSE) - 변경된 종목만 onQuotes로 전달
+export const openPortfolioPriceStream = (symbols, onQuotes, onError) => {
+  if (typeof EventSource === 'undefined') return null
+  const symbolStr = encodeURIComponent(symbols.join(','))
+  // EventSource는 Authorization 헤더를 보낼 수 없어 토큰을 쿼리로 전달
+  const token = encodeURIComponent(localStorage.getItem('access_token') || '')
+  const source = new EventSource(`${API_BASE_URL}/portfolio/stream?symbols=${symbolStr}&access_token=${token}`)
+  const handle = (event) => {
+    try {
+      onQuotes(JSON.parse(event.data))
+    } catch (error) {
+      console.error('[API] 시세 스트림 파싱 오류:', error)
+    }
+  }
+  source.addEventListener('snapshot', handle)
+  source.addEventListener('quotes', handle)
+  source.onerror = (error) => {
+    // 연결이 완전히 닫힌 경우에만 호출자에게 알림 (일시적 끊김은 브라우저가 재연결)
+    if (source.readyState === EventSource.CLOSED && onError) onError(error)
+  }
+  return source
+}
+
 // 경제 지표 API
 export const getEconomicCalendar = async (startDate = null, endDate = null) => {
   try {
@@ -453,6 +476,7 @@ const apiService = {
   addPortfolioItem,
   deletePortfolioItem,
   getPortfolioPrices,
+  openPortfolioPriceStream,
   getEconomicCalendar,
   getEconomicHighlights,
   getTreasuryRates,